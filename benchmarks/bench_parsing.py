@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+상세 페이지 파서 백엔드/부분 파싱 마이크로 벤치마크
+저장된 HTML 픽스처로 파서 조합별 속도를 재고, 추출된 details가 기준(html.parser 전체 파싱)과 같은지 확인합니다.
+
+실행: python -m benchmarks.bench_parsing [--iterations N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+Path('data_temp').mkdir(exist_ok=True)
+
+from scrapers.final_scraper import FinalScraper
+from utils.html_parsing import make_soup, DETAIL_PAGE_STRAINER
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+def load_detail_fixtures():
+    """상세 페이지 픽스처를 로드합니다."""
+    return {path.name: path.read_bytes() for path in sorted(FIXTURES_DIR.glob("detail_*.html"))}
+
+def available_parsers():
+    """사용 가능한 파서 백엔드 목록"""
+    parsers = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        parsers.append('lxml')
+    except ImportError:
+        pass
+    return parsers
+
+def run_case(scraper: FinalScraper, pages: dict, parser: str, strained: bool, iterations: int):
+    """한 가지 파서 조합으로 모든 픽스처를 반복 파싱/추출합니다."""
+    parse_only = DETAIL_PAGE_STRAINER if strained else None
+    details = {}
+
+    start = time.process_time()
+    for _ in range(iterations):
+        for name, content in pages.items():
+            soup = make_soup(content, parser, parse_only)
+            details[name] = scraper.extract_metric_details(soup)
+    elapsed = time.process_time() - start
+
+    return elapsed / (iterations * len(pages)), details
+
+def main():
+    parser = argparse.ArgumentParser(description='상세 페이지 파서 벤치마크')
+    parser.add_argument('--iterations', type=int, default=50, help='픽스처당 반복 횟수 (기본값: 50)')
+    args = parser.parse_args()
+
+    pages = load_detail_fixtures()
+    if not pages:
+        print(f"❌ 픽스처가 없습니다: {FIXTURES_DIR}")
+        sys.exit(1)
+
+    scraper = FinalScraper(use_cache=False)
+    baseline_time, baseline_details = run_case(scraper, pages, 'html.parser', False, args.iterations)
+
+    print(f"📊 상세 페이지 {len(pages)}개 x {args.iterations}회")
+    print(f"{'파서':<14}{'부분 파싱':<10}{'ms/페이지':>12}{'속도':>10}  details 일치")
+
+    mismatched = False
+    for parser_name in available_parsers():
+        for strained in (False, True):
+            if parser_name == 'html.parser' and not strained:
+                per_page, details = baseline_time, baseline_details
+            else:
+                per_page, details = run_case(scraper, pages, parser_name, strained, args.iterations)
+
+            identical = details == baseline_details
+            mismatched = mismatched or not identical
+            print(f"{parser_name:<14}{'예' if strained else '아니오':<10}{per_page * 1000:>12.2f}"
+                  f"{baseline_time / per_page:>9.1f}x  {'✅' if identical else '❌'}")
+
+    if mismatched:
+        print("❌ 일부 조합에서 추출 결과가 기준과 다릅니다.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
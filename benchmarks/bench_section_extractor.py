@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+섹션 내용 추출기 벤치마크
+한 번 순회하는 FinalScraper.extract_section_content를 이전의 find_all 반복 방식과 비교합니다.
+픽스처의 모든 metric-box에서 두 결과가 바이트 단위로 같은지 확인하고, 페이지당 CPU 시간을 측정합니다.
+
+실행: python -m benchmarks.bench_section_extractor [--iterations N]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+Path('data_temp').mkdir(exist_ok=True)
+
+from scrapers.final_scraper import FinalScraper
+from utils.html_parsing import make_soup, DETAIL_PAGE_STRAINER
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+def legacy_extract_section_content(section) -> dict:
+    """이전 구현 (비교 기준): 카테고리별 find_all + 요소마다 중첩 find_all"""
+    content = {
+        'paragraphs': [],
+        'lists': [],
+        'headings': [],
+        'other_elements': [],
+        'raw_text': ''
+    }
+
+    for h in section.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+        text = h.get_text(strip=True)
+        if text:
+            content['headings'].append({'tag': h.name, 'text': text})
+
+    for p in section.find_all('p'):
+        text = p.get_text(strip=True)
+        if text:
+            content['paragraphs'].append(text)
+
+    for lst in section.find_all(['ul', 'ol']):
+        list_items = []
+        for li in lst.find_all('li'):
+            item_text = li.get_text(strip=True)
+            if item_text:
+                list_items.append(item_text)
+        if list_items:
+            content['lists'].append({'type': lst.name, 'items': list_items})
+
+    for elem in section.find_all(['div', 'span']):
+        if not elem.find_all() and elem.get_text(strip=True):
+            text = elem.get_text(strip=True)
+            if text not in content['raw_text']:
+                content['other_elements'].append({'tag': elem.name, 'text': text, 'class': elem.get('class', [])})
+
+    content['raw_text'] = section.get_text(separator=' ', strip=True)
+    return content
+
+def load_sections():
+    """픽스처별로 추출 대상 섹션(metric-box의 section, 없으면 box)을 모읍니다."""
+    pages = {}
+    for path in sorted(FIXTURES_DIR.glob("detail_*.html")):
+        soup = make_soup(path.read_bytes(), parse_only=DETAIL_PAGE_STRAINER)
+        content_area = soup.find(class_='content-area')
+        boxes = content_area.find_all('div', class_='metric-box') if content_area else []
+        pages[path.name] = [box.find('section') or box for box in boxes]
+    return pages
+
+def measure(extract, pages: dict, iterations: int) -> float:
+    """페이지당 평균 CPU 시간(초)을 측정합니다."""
+    start = time.process_time()
+    for _ in range(iterations):
+        for sections in pages.values():
+            for section in sections:
+                extract(section)
+    return (time.process_time() - start) / (iterations * len(pages))
+
+def main():
+    parser = argparse.ArgumentParser(description='섹션 내용 추출기 벤치마크')
+    parser.add_argument('--iterations', type=int, default=200, help='반복 횟수 (기본값: 200)')
+    args = parser.parse_args()
+
+    pages = load_sections()
+    if not pages:
+        print(f"❌ 픽스처가 없습니다: {FIXTURES_DIR}")
+        sys.exit(1)
+
+    scraper = FinalScraper(use_cache=False)
+
+    # 바이트 단위 동일성 확인
+    mismatches = []
+    for name, sections in pages.items():
+        for index, section in enumerate(sections):
+            expected = json.dumps(legacy_extract_section_content(section), ensure_ascii=False)
+            actual = json.dumps(scraper.extract_section_content(section), ensure_ascii=False)
+            if expected != actual:
+                mismatches.append(f"{name}#{index}")
+
+    legacy_time = measure(legacy_extract_section_content, pages, args.iterations)
+    single_pass_time = measure(scraper.extract_section_content, pages, args.iterations)
+
+    print(f"📊 상세 페이지 {len(pages)}개 x {args.iterations}회")
+    print(f"  이전 방식 (find_all 반복): {legacy_time * 1000:.3f} ms/페이지")
+    print(f"  단일 순회 방식:            {single_pass_time * 1000:.3f} ms/페이지")
+    print(f"  CPU 감소: {(1 - single_pass_time / legacy_time) * 100:.1f}% ({legacy_time / single_pass_time:.1f}x)")
+
+    if mismatches:
+        print(f"❌ 결과가 다른 섹션: {', '.join(mismatches)}")
+        sys.exit(1)
+    print("✅ 모든 섹션의 추출 결과가 바이트 단위로 동일합니다.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+IRIS+ 목록/상세 추출과 업로드 벤치마크 모음
+저장된 픽스처와 로컬 픽스처 서버(업로드는 PostgREST 스텁)로 각 단계의 처리량(pages/sec), 페이지당 CPU 시간, 최대 RSS를 재고
+커밋 간 비교할 수 있도록 JSON으로 저장합니다. 케이스마다 새 프로세스에서 실행해 RSS가 섞이지 않게 합니다.
+
+실행: python -m benchmarks.bench_suite [--cases ...] [--output FILE] [--compare BASELINE.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+Path('data_temp').mkdir(exist_ok=True)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+RESULTS_DIR = Path(__file__).parent / "results"
+
+CASES = ['listing_extract', 'detail_extract', 'detail_analyze', 'end_to_end', 'upload']
+
+def cpu_seconds() -> float:
+    """현재 프로세스와 종료된 자식 프로세스의 CPU 시간 합"""
+    usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return sum(u.ru_utime + u.ru_stime for u in usage)
+
+def setup_listing_extract(options: dict) -> Callable[[], int]:
+    from scrapers.iris_scraper import IRISScraper
+    from utils.html_parsing import make_soup
+
+    scraper = IRISScraper(use_cache=False)
+    content = (FIXTURES_DIR / "listing_page.html").read_bytes()
+
+    def run() -> int:
+        for _ in range(options['iterations']):
+            scraper.extract_metrics_from_page(make_soup(content, scraper.parser))
+        return options['iterations']
+    return run
+
+def setup_detail_extract(options: dict) -> Callable[[], int]:
+    from scrapers.final_scraper import FinalScraper
+    from utils.html_parsing import make_soup, DETAIL_PAGE_STRAINER
+
+    scraper = FinalScraper(use_cache=False)
+    pages = [path.read_bytes() for path in sorted(FIXTURES_DIR.glob("detail_*.html"))]
+
+    def run() -> int:
+        for _ in range(options['iterations']):
+            for content in pages:
+                scraper.extract_metric_details(make_soup(content, scraper.parser, DETAIL_PAGE_STRAINER))
+        return options['iterations'] * len(pages)
+    return run
+
+def setup_detail_analyze(options: dict) -> Callable[[], int]:
+    from scrapers.detail_analyzer import DetailAnalyzer
+    from utils.html_parsing import make_soup, DETAIL_PAGE_STRAINER
+
+    analyzer = DetailAnalyzer(use_cache=False)
+    pages = [path.read_bytes() for path in sorted(FIXTURES_DIR.glob("detail_*.html"))]
+    metric_info = {'title': 'fixture', 'data_id': 'FX0000', 'detail_url': 'fixture'}
+
+    def run() -> int:
+        for _ in range(options['iterations']):
+            for content in pages:
+                analyzer.analyze_content_area(make_soup(content, analyzer.parser, DETAIL_PAGE_STRAINER), metric_info)
+        return options['iterations'] * len(pages)
+    return run
+
+def setup_end_to_end(options: dict) -> Callable[[], int]:
+    from benchmarks.fixture_server import FixtureServer
+    from scrapers.final_scraper import FinalScraper
+    from utils.rate_limiter import rate_limiters, HostRateLimiter
+    from utils.scrape_journal import ScrapeJournal
+
+    # 서버는 자식 프로세스가 끝날 때 함께 종료됨
+    server = FixtureServer(latency=options['latency'], error_rate=options['error_rate'], seed=options['seed']).start()
+    # 로컬 서버이므로 요청 간격은 --delay로 직접 지정
+    host = server.base_url.split('//', 1)[1]
+    rate_limiters.limiters[host] = HostRateLimiter(options['delay'], burst=max(1, options['concurrency']))
+
+    base_data = {'metrics': [
+        {'title': f'Fixture Metric {i}', 'data_id': f'FX{i:04d}', 'relative_path': f'/metric/5.3b/fx{i:04d}/',
+         'detail_url': f"{server.base_url}/metric/5.3b/fx{i:04d}/"}
+        for i in range(options['metrics'])
+    ]}
+    scraper = FinalScraper(use_cache=False)
+    journal = ScrapeJournal(f"{tempfile.mkdtemp()}/journal.jsonl")
+
+    def run() -> int:
+        mode = options['mode']
+        if mode == 'async':
+            scraper.process_all_metrics_async(base_data, concurrency=options['concurrency'], journal=journal)
+        elif mode == 'pipeline':
+            scraper.process_all_metrics_pipelined(base_data, fetch_workers=options['concurrency'], journal=journal)
+        else:
+            scraper.process_all_metrics(base_data, journal=journal)
+        return options['metrics']
+    return run
+
+def setup_upload(options: dict) -> Callable[[], int]:
+    import os
+    from benchmarks.postgrest_stub import PostgrestStub
+
+    stub = PostgrestStub(latency=options['latency'], error_rate=options['error_rate'], seed=options['seed']).start()
+    os.environ.update({'SUPABASE_URL': stub.base_url, 'SUPABASE_SERVICE_ROLE_KEY': 'bench'})
+    from utils.supabase_uploader import SupabaseUploader
+
+    # 섹션 크기가 제각각인 변환 결과를 흉내 낸 행 (수백 바이트 ~ 수십 KB)
+    paragraph = 'Fixture paragraph text for payload sizing. ' * 20
+    rows = [
+        {'data_id': f'FX{i:04d}', 'title_en': f'Fixture Metric {i}',
+         'definition': {'en': {'title': 'Definition', 'content': {'paragraphs': [paragraph] * (i % 40)}}}}
+        for i in range(options['metrics'])
+    ]
+    uploader = SupabaseUploader()
+
+    def run() -> int:
+        return uploader.post_rows('iris_metrics', rows, on_conflict='data_id', concurrency=options['concurrency'])
+    return run
+
+BENCHMARKS = {
+    'listing_extract': setup_listing_extract,
+    'detail_extract': setup_detail_extract,
+    'detail_analyze': setup_detail_analyze,
+    'end_to_end': setup_end_to_end,
+    'upload': setup_upload
+}
+
+def run_case_in_child(case: str, options: dict, results):
+    """자식 프로세스에서 케이스 하나를 실행하고 측정값을 돌려줍니다."""
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    # 임포트와 준비 과정은 측정에서 제외
+    run = BENCHMARKS[case](options)
+    cpu_start, wall_start = cpu_seconds(), time.perf_counter()
+    pages = run()
+    wall, cpu = time.perf_counter() - wall_start, cpu_seconds() - cpu_start
+
+    results.put({
+        'pages': pages,
+        'wall_seconds': round(wall, 4),
+        'cpu_seconds': round(cpu, 4),
+        'pages_per_sec': round(pages / wall, 2) if wall else None,
+        'cpu_ms_per_page': round(cpu * 1000 / pages, 3) if pages else None,
+        # Linux에서 ru_maxrss 단위는 KB
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    })
+
+def run_case(case: str, options: dict) -> dict:
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=run_case_in_child, args=(case, options, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+def environment() -> dict:
+    """결과 비교에 필요한 실행 환경 정보"""
+    import bs4
+    from utils.html_parsing import DEFAULT_PARSER
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'beautifulsoup4': bs4.__version__,
+        'parser': DEFAULT_PARSER
+    }
+
+def print_comparison(results: dict, baseline: dict):
+    """기준 결과 대비 변화율을 출력합니다."""
+    print(f"\n📊 기준 결과와 비교 ({baseline['environment'].get('commit')} → {results['environment'].get('commit')})")
+    print(f"{'케이스':<18}{'pages/sec':<28}{'CPU ms/page':<28}{'peak RSS MB':<28}")
+    for case, current in results['cases'].items():
+        previous = baseline['cases'].get(case)
+        if not previous:
+            continue
+        cells = []
+        for key in ('pages_per_sec', 'cpu_ms_per_page', 'peak_rss_mb'):
+            before, after = previous.get(key), current.get(key)
+            change = f"{(after - before) / before * 100:+.1f}%" if before and after is not None else "-"
+            cells.append(f"{before} → {after} ({change})")
+        print(f"{case:<18}" + ''.join(f"{cell:<28}" for cell in cells))
+
+def main():
+    parser = argparse.ArgumentParser(description='IRIS+ 스크래퍼 벤치마크 모음')
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=CASES, help='실행할 케이스')
+    parser.add_argument('--iterations', type=int, default=50, help='추출 케이스의 픽스처 반복 횟수 (기본값: 50)')
+    parser.add_argument('--metrics', type=int, default=100, help='end_to_end/upload 케이스의 메트릭 수 (기본값: 100)')
+    parser.add_argument('--mode', choices=['sync', 'async', 'pipeline'], default='sync',
+                        help='end_to_end 처리 모드 (기본값: sync)')
+    parser.add_argument('--concurrency', type=int, default=5, help='async/pipeline/upload 동시 요청 수 (기본값: 5)')
+    parser.add_argument('--latency', type=float, default=0.02, help='픽스처/스텁 서버 응답 지연(초) (기본값: 0.02)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='픽스처/스텁 서버 오류 응답 비율 (기본값: 0)')
+    parser.add_argument('--delay', type=float, default=0.001, help='픽스처 서버 요청 간격(초) (기본값: 0.001)')
+    parser.add_argument('--seed', type=int, default=0, help='오류 주입 난수 시드')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본값: benchmarks/results/bench_<commit>.json)')
+    parser.add_argument('--compare', help='비교할 기준 결과 JSON')
+    args = parser.parse_args()
+
+    options = {key: getattr(args, key) for key in
+               ('iterations', 'metrics', 'mode', 'concurrency', 'latency', 'error_rate', 'delay', 'seed')}
+    results = {'environment': environment(), 'options': options, 'cases': {}}
+
+    print(f"{'케이스':<18}{'pages':>8}{'pages/sec':>12}{'CPU ms/page':>14}{'peak RSS MB':>14}")
+    for case in args.cases:
+        result = run_case(case, options)
+        results['cases'][case] = result
+        print(f"{case:<18}{result['pages']:>8}{result['pages_per_sec']:>12}"
+              f"{result['cpu_ms_per_page']:>14}{result['peak_rss_mb']:>14}")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_{results['environment']['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"📁 결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print_comparison(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+저장된 IRIS+ 픽스처를 제공하는 로컬 HTTP 서버
+목록(/metrics/?page=N)과 상세(/metric/5.3b/<code>/) 페이지를 지연 시간과 오류 주입 설정에 따라 응답합니다.
+끝 슬래시가 없는 상세 경로는 슬래시 경로로 301 리다이렉트합니다.
+fail_first를 주면 경로마다 처음 N번의 요청을 오류로 응답해 재시도 동작을 확인할 수 있습니다.
+응답마다 본문 해시로 만든 ETag를 붙이고, If-None-Match가 같으면 304로 응답합니다.
+
+실행: python -m benchmarks.fixture_server [--port 8765] [--latency 0.05] [--error-rate 0.02]
+"""
+
+import argparse
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+class FixtureServer:
+    """픽스처 HTTP 서버 (백그라운드 스레드에서 실행)"""
+
+    def __init__(self, port: int = 0, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 500, seed: int = 0, fail_first: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        # 경로마다 처음 fail_first번의 요청은 항상 오류로 응답 (재시도 동작 확인용)
+        self.fail_first = fail_first
+        self.path_requests = {}
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+        self.not_modified_count = 0
+
+        self.listing = (FIXTURES_DIR / "listing_page.html").read_bytes()
+        self.details = [path.read_bytes() for path in sorted(FIXTURES_DIR.glob("detail_*.html"))]
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self.build_handler())
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def pick_response(self, path: str):
+        """경로에 맞는 (상태 코드, 본문)을 고릅니다."""
+        with self.lock:
+            self.request_count += 1
+            self.path_requests[path] = self.path_requests.get(path, 0) + 1
+            inject_error = (self.path_requests[path] <= self.fail_first or
+                            self.error_rate and self.random.random() < self.error_rate)
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if inject_error:
+                self.error_count += 1
+
+        if delay:
+            time.sleep(delay)
+        if inject_error:
+            return self.error_status, b"injected error"
+
+        if path.startswith('/metrics/'):
+            return 200, self.listing
+        if path.startswith('/metric/'):
+            # 같은 코드는 항상 같은 상세 픽스처를 받도록 경로 해시로 선택
+            return 200, self.details[zlib.crc32(path.encode('utf-8')) % len(self.details)]
+        return 404, b"not found"
+
+    def build_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive 연결 재사용이 실제와 같도록 HTTP/1.1로 응답
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path.startswith('/metric/') and not path.endswith('/'):
+                    # 실제 사이트처럼 끝 슬래시가 없는 상세 경로는 슬래시 경로로 리다이렉트
+                    self.send_response(301)
+                    self.send_header('Location', f"{path}/")
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                status, body = server.pick_response(path)
+                etag = f'"{zlib.crc32(body):08x}"'
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    # 조건부 요청의 본문이 그대로면 본문 없이 304로 응답
+                    with server.lock:
+                        server.not_modified_count += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                if status == 200:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'FixtureServer':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'FixtureServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='IRIS+ 픽스처 HTTP 서버')
+    parser.add_argument('--port', type=int, default=8765, help='포트 (기본값: 8765)')
+    parser.add_argument('--latency', type=float, default=0.0, help='응답 지연 시간(초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='지연 시간에 더할 최대 무작위 값(초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='오류 응답 비율 (0~1)')
+    parser.add_argument('--error-status', type=int, default=500, help='주입할 오류 상태 코드 (기본값: 500)')
+    parser.add_argument('--fail-first', type=int, default=0, help='경로마다 처음 N번의 요청은 오류로 응답')
+    args = parser.parse_args()
+
+    server = FixtureServer(args.port, args.latency, args.jitter, args.error_rate, args.error_status,
+                           fail_first=args.fail_first)
+    print(f"🧪 픽스처 서버 실행 중: {server.base_url} (Ctrl+C로 종료)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
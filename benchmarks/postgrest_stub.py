@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+업로더 테스트용 로컬 PostgREST 호환 스텁 서버
+SupabaseUploader가 쓰는 REST 동작(/rest/v1/<table>의 삽입, on_conflict upsert, in. 삭제, 검증용 rpc 함수,
+키셋 페이지 조회, count=exact)을 메모리 테이블로 흉내 내고, 본문 크기 제한(413)과 오류(429/5xx) 주입을 지원합니다.
+
+실행: python -m benchmarks.postgrest_stub [--port 54321] [--max-body-kb 512] [--error-rate 0.05]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# 테이블별 기본 키 (supabase_schema.sql 기준)
+PRIMARY_KEYS = {
+    'iris_metrics': ('data_id',),
+    'iris_metric_impact_categories': ('data_id', 'impact_category'),
+    'iris_metric_sdg_goals': ('data_id', 'sdg_goal')
+}
+
+# iris_metrics 행이 지워지면 함께 지워지는 테이블 (ON DELETE CASCADE)
+CASCADE_TABLES = ('iris_metric_impact_categories', 'iris_metric_sdg_goals')
+
+def parse_in_list(value: str) -> List[str]:
+    """in.("a","b",c) 형식의 값 목록을 풉니다."""
+    inner = value[len('in.('):-1]
+    return [quoted.replace('\\"', '"') if quoted else bare
+            for quoted, bare in re.findall(r'"((?:[^"\\]|\\.)*)"|([^,]+)', inner)]
+
+class PostgrestStub:
+    """메모리 테이블을 쓰는 PostgREST 호환 HTTP 서버 (백그라운드 스레드에서 실행)"""
+
+    def __init__(self, port: int = 0, latency: float = 0.0, max_body_bytes: Optional[int] = None,
+                 error_rate: float = 0.0, error_statuses: Tuple[int, ...] = (503, 429), seed: int = 0):
+        self.latency = latency
+        self.max_body_bytes = max_body_bytes
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tables: Dict[str, Dict[tuple, Dict]] = {table: {} for table in PRIMARY_KEYS}
+        self.stats = {'requests': 0, 'errors': 0, 'too_large': 0, 'rows_written': 0, 'rows_deleted': 0,
+                      'bytes_received': 0}
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self.build_handler())
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def row_key(self, table: str, row: Dict) -> tuple:
+        return tuple(row.get(column) for column in PRIMARY_KEYS[table])
+
+    def inject_error(self) -> Optional[int]:
+        """설정된 비율로 주입할 오류 상태 코드를 고릅니다."""
+        with self.lock:
+            self.stats['requests'] += 1
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return self.random.choice(self.error_statuses)
+        return None
+
+    def matches(self, row: Dict, filters: Dict[str, str]) -> bool:
+        """eq./gt./in./not.in. 필터 조건을 확인합니다."""
+        for column, condition in filters.items():
+            value = row.get(column)
+            if condition.startswith('in.('):
+                if value not in parse_in_list(condition):
+                    return False
+            elif condition.startswith('not.in.('):
+                # PostgREST처럼 값 목록은 컬럼 타입으로 비교 (숫자 컬럼도 문자열 목록과 비교)
+                if value is None or str(value) in parse_in_list(condition[len('not.'):]):
+                    return False
+            elif condition.startswith('eq.'):
+                if value != condition[3:]:
+                    return False
+            elif condition.startswith('gt.'):
+                if value is None or value <= condition[3:]:
+                    return False
+        return True
+
+    def insert(self, table: str, rows: List[Dict], upsert: bool) -> int:
+        """행을 삽입합니다. 충돌 시 upsert가 아니면 전체를 취소하고 409를 돌려줍니다."""
+        with self.lock:
+            data = self.tables[table]
+            if not upsert and any(self.row_key(table, row) in data for row in rows):
+                return 409
+            for row in rows:
+                key = self.row_key(table, row)
+                data[key] = {**data.get(key, {}), **row} if upsert else row
+            self.stats['rows_written'] += len(rows)
+        return 201
+
+    def delete(self, table: str, filters: Dict[str, str]) -> int:
+        with self.lock:
+            data = self.tables[table]
+            removed = [key for key, row in data.items() if self.matches(row, filters)]
+            removed_ids = {data[key].get('data_id') for key in removed}
+            for key in removed:
+                del data[key]
+            if table == 'iris_metrics':
+                for child in CASCADE_TABLES:
+                    child_rows = self.tables[child]
+                    for key in [key for key, row in child_rows.items() if row.get('data_id') in removed_ids]:
+                        del child_rows[key]
+            self.stats['rows_deleted'] += len(removed)
+        return len(removed)
+
+    def select(self, table: str, query: Dict[str, str]) -> Tuple[List[Dict], int]:
+        """select/order/limit/offset과 필터를 적용한 (행, 전체 행 수)"""
+        filters = {k: v for k, v in query.items() if k not in ('select', 'order', 'limit', 'offset')}
+        with self.lock:
+            rows = [row for row in self.tables[table].values() if self.matches(row, filters)]
+        total = len(rows)
+
+        if 'order' in query:
+            column, _, direction = query['order'].partition('.')
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=direction == 'desc')
+        offset = int(query.get('offset', 0))
+        rows = rows[offset:offset + int(query['limit'])] if 'limit' in query else rows[offset:]
+
+        columns = query.get('select', '*')
+        if columns != '*':
+            rows = [{column: row.get(column) for column in columns.split(',')} for row in rows]
+        return rows, total
+
+    def rpc(self, name: str, args: Dict) -> Optional[List[Dict]]:
+        """config/supabase_schema.sql의 검증용 함수를 흉내 냅니다. (없는 함수면 None)"""
+        prefix = args.get('bucket_prefix', '')
+        with self.lock:
+            rows = [(hashlib.md5(row['data_id'].encode('utf-8')).hexdigest(), row['data_id'], row.get('content_hash'))
+                    for row in self.tables['iris_metrics'].values()]
+        rows = sorted(row for row in rows if row[0].startswith(prefix))
+
+        if name == 'iris_metrics_bucket_rows':
+            return [{'data_id': data_id, 'content_hash': content_hash} for _, data_id, content_hash in rows]
+        if name == 'iris_metrics_checksums':
+            length = args.get('prefix_length', 1)
+            buckets: Dict[str, List[str]] = {}
+            for digest, data_id, content_hash in sorted(rows, key=lambda row: row[1]):
+                buckets.setdefault(digest[:length], []).append(f"{data_id}:{content_hash or ''}")
+            return [{'bucket': bucket, 'row_count': len(items),
+                     'checksum': hashlib.md5(','.join(items).encode('utf-8')).hexdigest()}
+                    for bucket, items in sorted(buckets.items())]
+        return None
+
+    def build_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def reply(self, status: int, body: bytes = b'', headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def route(self) -> Tuple[Optional[str], Dict[str, str]]:
+                url = urlparse(self.path)
+                table = url.path.rsplit('/', 1)[-1]
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                return (table if table in PRIMARY_KEYS else None), query
+
+            def read_body(self) -> bytes:
+                length = int(self.headers.get('Content-Length') or 0)
+                return self.rfile.read(length) if length else b''
+
+            def start(self) -> Optional[int]:
+                """지연과 오류 주입을 적용합니다. 오류면 상태 코드를 반환합니다."""
+                if server.latency:
+                    time.sleep(server.latency)
+                return server.inject_error()
+
+            def do_POST(self):
+                body = self.read_body()
+                table, query = self.route()
+                with server.lock:
+                    server.stats['bytes_received'] += len(body)
+                path = urlparse(self.path).path
+                if '/rpc/' in path:
+                    error = self.start()
+                    if error:
+                        return self.reply(error, b'{"message": "injected error"}')
+                    result = server.rpc(path.rsplit('/', 1)[-1], json.loads(body or b'{}'))
+                    if result is None:
+                        return self.reply(404, b'{"code": "PGRST202", "message": "function not found"}')
+                    return self.reply(200, json.dumps(result).encode('utf-8'))
+                if table is None:
+                    return self.reply(404, b'{"message": "relation does not exist"}')
+                if server.max_body_bytes and len(body) > server.max_body_bytes:
+                    with server.lock:
+                        server.stats['too_large'] += 1
+                    return self.reply(413, b'{"message": "payload too large"}')
+                error = self.start()
+                if error:
+                    return self.reply(error, b'{"message": "injected error"}', {'Retry-After': '0'})
+
+                rows = json.loads(body)
+                rows = rows if isinstance(rows, list) else [rows]
+                # 기본 키가 빠진 행이 하나라도 있으면 PostgREST처럼 배치 전체를 거절 (NOT NULL 위반)
+                if any(row.get(column) is None for row in rows for column in PRIMARY_KEYS[table]):
+                    return self.reply(400, b'{"code": "23502", "message": "null value violates not-null constraint"}')
+                upsert = 'merge-duplicates' in (self.headers.get('Prefer') or '') and 'on_conflict' in query
+                status = server.insert(table, rows, upsert)
+                self.reply(status, b'' if status == 201 else b'{"message": "duplicate key"}')
+
+            def do_DELETE(self):
+                self.read_body()
+                table, query = self.route()
+                if table is None:
+                    return self.reply(404)
+                error = self.start()
+                if error:
+                    return self.reply(error, b'{"message": "injected error"}')
+                server.delete(table, query)
+                self.reply(204)
+
+            def do_GET(self):
+                table, query = self.route()
+                if table is None:
+                    return self.reply(404, b'{"message": "relation does not exist"}')
+                error = self.start()
+                if error:
+                    return self.reply(error, b'{"message": "injected error"}')
+                rows, total = server.select(table, query)
+                end = max(len(rows) - 1, 0)
+                self.reply(200, json.dumps(rows).encode('utf-8'), {'Content-Range': f"0-{end}/{total}"})
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'PostgrestStub':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'PostgrestStub':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 PostgREST 호환 스텁 서버')
+    parser.add_argument('--port', type=int, default=54321, help='포트 (기본값: 54321)')
+    parser.add_argument('--latency', type=float, default=0.0, help='응답 지연 시간(초)')
+    parser.add_argument('--max-body-kb', type=int, default=None, help='이보다 큰 요청 본문은 413으로 거절')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='오류 응답 비율 (0~1)')
+    parser.add_argument('--error-status', type=int, nargs='+', default=[503, 429], help='주입할 오류 상태 코드')
+    args = parser.parse_args()
+
+    stub = PostgrestStub(args.port, args.latency, args.max_body_kb * 1024 if args.max_body_kb else None,
+                         args.error_rate, tuple(args.error_status))
+    print(f"🧪 PostgREST 스텁 실행 중: {stub.base_url}/rest/v1 (SUPABASE_URL={stub.base_url}, Ctrl+C로 종료)")
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+-- 마이그레이션 001: Impact Category / SDG 목표 팩트 테이블
+-- 이미 supabase_schema.sql로 만든 데이터베이스에 적용합니다. (새로 만드는 경우 supabase_schema.sql에 포함됨)
+-- 여러 번 실행해도 안전합니다.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS iris_metric_impact_categories (
+    data_id TEXT NOT NULL REFERENCES iris_metrics(data_id) ON DELETE CASCADE,
+    impact_category TEXT NOT NULL,
+    PRIMARY KEY (data_id, impact_category)
+);
+
+CREATE TABLE IF NOT EXISTS iris_metric_sdg_goals (
+    data_id TEXT NOT NULL REFERENCES iris_metrics(data_id) ON DELETE CASCADE,
+    sdg_goal TEXT NOT NULL,
+    PRIMARY KEY (data_id, sdg_goal)
+);
+
+-- 기본 키는 data_id 기준 조회용, 아래 인덱스는 값 기준 조회용
+CREATE INDEX IF NOT EXISTS idx_iris_metric_impact_categories_category
+    ON iris_metric_impact_categories(impact_category, data_id);
+CREATE INDEX IF NOT EXISTS idx_iris_metric_sdg_goals_goal
+    ON iris_metric_sdg_goals(sdg_goal, data_id);
+
+-- 기존 JSONB 데이터로 팩트 행 채우기 (이후에는 업로더가 변환 결과의 팩트 테이블을 올림)
+INSERT INTO iris_metric_impact_categories (data_id, impact_category)
+SELECT DISTINCT data_id, category
+FROM iris_metrics,
+     jsonb_array_elements_text(jsonb_path_query_array(impact_categories, '$.en.content.headings[*].text')) AS category
+WHERE impact_categories IS NOT NULL
+ON CONFLICT DO NOTHING;
+
+INSERT INTO iris_metric_sdg_goals (data_id, sdg_goal)
+SELECT DISTINCT data_id, goal
+FROM iris_metrics,
+     jsonb_array_elements_text(jsonb_path_query_array(sdg_goals, '$.en.content.headings[*].text')) AS goal
+WHERE sdg_goals IS NOT NULL
+ON CONFLICT DO NOTHING;
+
+-- 요약 뷰를 팩트 테이블 조인으로 교체 (컬럼 구성은 그대로)
+DROP VIEW IF EXISTS impact_categories_summary;
+CREATE VIEW impact_categories_summary AS
+SELECT
+    ROW_NUMBER() OVER (ORDER BY COUNT(*) DESC) as rank,
+    c.impact_category as category_en,
+    COUNT(*) as metric_count,
+    ARRAY_AGG(DISTINCT m.metric_type) as metric_types,
+    ARRAY_AGG(m.data_id ORDER BY m.title_en) as sample_metrics
+FROM iris_metric_impact_categories c
+JOIN iris_metrics m ON m.data_id = c.data_id
+GROUP BY c.impact_category
+ORDER BY metric_count DESC;
+
+DROP VIEW IF EXISTS sdg_goals_summary;
+CREATE VIEW sdg_goals_summary AS
+SELECT
+    g.sdg_goal as sdg_en,
+    COUNT(*) as metric_count,
+    ARRAY_AGG(m.data_id ORDER BY m.title_en) as sample_metrics
+FROM iris_metric_sdg_goals g
+JOIN iris_metrics m ON m.data_id = g.data_id
+GROUP BY g.sdg_goal
+ORDER BY metric_count DESC;
+
+COMMIT;
@@ -0,0 +1,6 @@
+-- 마이그레이션 002: iris_metrics 행 내용 해시
+-- 업로더가 서버의 (data_id, content_hash)와 비교해 새로 생기거나 바뀐 행만 upsert하고
+-- 사라진 행만 삭제합니다. 해시가 없는 기존 행은 첫 동기화 때 한 번 다시 기록됩니다.
+-- 여러 번 실행해도 안전합니다.
+
+ALTER TABLE iris_metrics ADD COLUMN IF NOT EXISTS content_hash TEXT;
@@ -0,0 +1,30 @@
+-- 마이그레이션 003: 업로드 검증용 구간 체크섬 함수
+-- 업로더의 verify_upload가 테이블을 내려받지 않고 구간별 해시만 비교하도록 합니다.
+-- (002_metric_content_hash.sql 이후에 실행, 여러 번 실행해도 안전합니다.)
+
+-- md5(data_id) 앞 prefix_length자리로 나눈 구간마다 행 수와 (data_id, content_hash) 목록의 md5를 반환
+-- 업로더는 같은 값을 로컬에서 계산해 비교하고, 다른 구간만 한 자리씩 더 나눠 내려감 (머클 트리 방식)
+CREATE OR REPLACE FUNCTION iris_metrics_checksums(bucket_prefix TEXT DEFAULT '', prefix_length INTEGER DEFAULT 1)
+RETURNS TABLE (bucket TEXT, row_count BIGINT, checksum TEXT)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        left(md5(m.data_id), prefix_length),
+        COUNT(*),
+        md5(string_agg(m.data_id || ':' || COALESCE(m.content_hash, ''), ',' ORDER BY m.data_id COLLATE "C"))
+    FROM iris_metrics m
+    WHERE left(md5(m.data_id), length(bucket_prefix)) = bucket_prefix
+    GROUP BY 1
+    ORDER BY 1;
+$$;
+
+-- 차이가 좁혀진 구간의 (data_id, content_hash) 행
+CREATE OR REPLACE FUNCTION iris_metrics_bucket_rows(bucket_prefix TEXT)
+RETURNS TABLE (data_id TEXT, content_hash TEXT)
+LANGUAGE sql STABLE
+AS $$
+    SELECT m.data_id, m.content_hash
+    FROM iris_metrics m
+    WHERE left(md5(m.data_id), length(bucket_prefix)) = bucket_prefix
+    ORDER BY m.data_id COLLATE "C";
+$$;
@@ -25,8 +25,14 @@ LOGS_DIR.mkdir(exist_ok=True)
 SCRAPING_CONFIG = {
     "delay_between_requests": 1.0,  # 요청 간 딜레이 (초)
     "max_retries": 3,  # 최대 재시도 횟수
-    "timeout": 30,  # 요청 타임아웃 (초)
-    "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    "retry_backoff": 1.0,  # 재시도 지수 백오프 계수 (초)
+    "timeout": 30,  # 요청 읽기 타임아웃 (초)
+    "connect_timeout": 10,  # 연결 타임아웃 (초)
+    "pool_connections": 10,  # 유지할 호스트별 연결 풀 수
+    "pool_maxsize": 10,  # 호스트당 유지할 최대 연결 수
+    "max_listing_pages": 100,  # 전체 페이지 수를 알 수 없을 때 순차 수집할 최대 목록 페이지 수
+    "slim_payload": False,  # 상세 섹션에서 raw_text와 중복/빈 값을 빼고 저장 (슬림 모드)
+    "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
 # Supabase 설정
@@ -38,6 +44,15 @@ SUPABASE_CONFIG = {
     "backup_bucket": env_config["SUPABASE_BACKUP_BUCKET"]
 }
 
+# Supabase 업로드 설정
+UPLOAD_CONFIG = {
+    "batch_target_bytes": 1024 * 1024,  # 배치 요청 본문 목표 크기 (바이트)
+    "max_batch_rows": 500,  # 배치당 최대 행 수
+    "concurrency": 4,  # 동시에 보내는 배치 요청 수
+    "max_retries": 4,  # 413/429/5xx 배치의 최대 재시도(반으로 나눠 재전송) 횟수
+    "retry_backoff": 1.0  # 재시도 지수 백오프 계수 (초)
+}
+
 # 데이터베이스 설정
 DATABASE_CONFIG = {
     "url": env_config["DATABASE_URL"]
@@ -71,18 +86,23 @@ BACKUP_CONFIG = {
 }
 
 # 지원하는 스크래퍼 타입
+# inputs/outputs: 스크래퍼가 읽고 쓰는 파일 (run_all이 이를 기준으로 실행 순서 DAG를 만듦)
 SUPPORTED_SCRAPERS = {
     "iris": {
         "name": "IRIS+ Metrics",
         "module": "scrapers.iris_scraper",
         "class": "IRISScraper",
-        "description": "IRIS+ 임팩트 투자 메트릭 데이터 수집"
+        "description": "IRIS+ 임팩트 투자 메트릭 데이터 수집",
+        "inputs": [],
+        "outputs": ["data/iris_metrics.json"]
     },
     "iris_detail": {
         "name": "IRIS+ Detail Analysis",
         "module": "scrapers.detail_analyzer", 
         "class": "DetailAnalyzer",
-        "description": "IRIS+ 메트릭 상세 정보 분석"
+        "description": "IRIS+ 메트릭 상세 정보 분석",
+        "inputs": ["data/iris_metrics.json"],
+        "outputs": ["data_temp/detail_analysis.json"]
     }
 }
 
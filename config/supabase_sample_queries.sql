@@ -1,31 +1,22 @@
 -- IRIS+ 메트릭 데이터 샘플 쿼리들
 -- 생성일: 2025-09-19 03:36:39
 
--- 1. 모든 Impact Categories 조회
-SELECT 
-    jsonb_array_elements_text(
-        jsonb_path_query_array(impact_categories, '$.en.content.headings[*].text')
-    ) as category_name,
-    COUNT(*) as metric_count
-FROM iris_metrics 
-WHERE impact_categories IS NOT NULL
-GROUP BY category_name
+-- 1. 모든 Impact Categories 조회 (팩트 테이블 인덱스 사용)
+SELECT impact_category as category_name, COUNT(*) as metric_count
+FROM iris_metric_impact_categories
+GROUP BY impact_category
 ORDER BY metric_count DESC;
 
 -- 2. 특정 카테고리 메트릭 조회 (예: Water)
-SELECT title_en, data_id, metric_type
-FROM iris_metrics 
-WHERE impact_categories @> '{"en": {"content": {"headings": [{"text": "Water"}]}}}';
+SELECT m.title_en, m.data_id, m.metric_type
+FROM iris_metric_impact_categories c
+JOIN iris_metrics m ON m.data_id = c.data_id
+WHERE c.impact_category = 'Water';
 
 -- 3. SDG 목표별 메트릭 통계
-SELECT 
-    jsonb_array_elements_text(
-        jsonb_path_query_array(sdg_goals, '$.en.content.headings[*].text')
-    ) as sdg_name,
-    COUNT(*) as metric_count
-FROM iris_metrics 
-WHERE sdg_goals IS NOT NULL
-GROUP BY sdg_name
+SELECT sdg_goal as sdg_name, COUNT(*) as metric_count
+FROM iris_metric_sdg_goals
+GROUP BY sdg_goal
 ORDER BY metric_count DESC;
 
 -- 4. 메트릭 타입별 분포
@@ -40,17 +31,19 @@ FROM iris_metrics
 WHERE definition->>'en' ILIKE '%water%'
 LIMIT 10;
 
--- 6. 사용 가이드라인에서 검색
+-- 6. 사용 가이드라인에서 검색 (슬림 모드로 raw_text가 없어도 모든 문자열에서 검색)
 SELECT title_en, data_id
 FROM iris_metrics 
-WHERE usage_guidance->'en'->'content'->>'raw_text' ILIKE '%measurement%'
+WHERE jsonb_path_exists(usage_guidance, '$.en.content.** ? (@.type() == "string" && @ like_regex "measurement" flag "i")')
 LIMIT 10;
 
 -- 7. 복합 조건 검색 (Water 카테고리 + Clean Water SDG)
-SELECT title_en, data_id, metric_type
-FROM iris_metrics 
-WHERE impact_categories @> '{"en": {"content": {"headings": [{"text": "Water"}]}}}' 
-  AND sdg_goals @> '{"en": {"content": {"headings": [{"text": "Clean Water and Sanitation"}]}}}';
+SELECT m.title_en, m.data_id, m.metric_type
+FROM iris_metric_impact_categories c
+JOIN iris_metric_sdg_goals g ON g.data_id = c.data_id
+JOIN iris_metrics m ON m.data_id = c.data_id
+WHERE c.impact_category = 'Water'
+  AND g.sdg_goal = 'Clean Water and Sanitation';
 
 -- 8. 최근 업데이트된 메트릭들
 SELECT title_en, data_id, updated_at
@@ -30,6 +30,7 @@ CREATE TABLE iris_metrics (
     translated_at TIMESTAMP,
     success BOOLEAN DEFAULT true,
     version TEXT DEFAULT 'v5.3b',
+    content_hash TEXT, -- 변환 결과 행의 sha256 (업로더가 바뀐 행만 upsert하는 데 사용)
     
     -- 타임스탬프
     created_at TIMESTAMP DEFAULT NOW(),
@@ -47,6 +48,24 @@ CREATE INDEX idx_iris_metrics_impact_categories ON iris_metrics USING GIN (impac
 CREATE INDEX idx_iris_metrics_sdg_goals ON iris_metrics USING GIN (sdg_goals);
 CREATE INDEX idx_iris_metrics_usage_guidance ON iris_metrics USING GIN (usage_guidance);
 
+-- 팩트 테이블 (변환 시점에 headings[*].text를 풀어 둔 정규화 행)
+-- 카테고리/SDG 조회를 JSONB 전체 스캔 대신 B-tree 인덱스 조인으로 처리
+CREATE TABLE iris_metric_impact_categories (
+    data_id TEXT NOT NULL REFERENCES iris_metrics(data_id) ON DELETE CASCADE,
+    impact_category TEXT NOT NULL,
+    PRIMARY KEY (data_id, impact_category)
+);
+
+CREATE TABLE iris_metric_sdg_goals (
+    data_id TEXT NOT NULL REFERENCES iris_metrics(data_id) ON DELETE CASCADE,
+    sdg_goal TEXT NOT NULL,
+    PRIMARY KEY (data_id, sdg_goal)
+);
+
+-- 기본 키는 data_id 기준 조회용, 아래 인덱스는 값 기준 조회용
+CREATE INDEX idx_iris_metric_impact_categories_category ON iris_metric_impact_categories(impact_category, data_id);
+CREATE INDEX idx_iris_metric_sdg_goals_goal ON iris_metric_sdg_goals(sdg_goal, data_id);
+
 -- 업데이트 트리거 (updated_at 자동 갱신)
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -67,25 +86,24 @@ CREATE TRIGGER update_iris_metrics_updated_at
 CREATE VIEW impact_categories_summary AS
 SELECT 
     ROW_NUMBER() OVER (ORDER BY COUNT(*) DESC) as rank,
-    jsonb_array_elements_text(jsonb_path_query_array(impact_categories, '$.en.content.headings[*].text')) as category_en,
-    -- 추후 한국어 번역 추가 시: jsonb_array_elements_text(jsonb_path_query_array(impact_categories, '$.ko.content.headings[*].text')) as category_ko,
+    c.impact_category as category_en,
     COUNT(*) as metric_count,
-    ARRAY_AGG(DISTINCT metric_type) as metric_types,
-    ARRAY_AGG(data_id ORDER BY title_en) as sample_metrics
-FROM iris_metrics 
-WHERE impact_categories IS NOT NULL
-GROUP BY category_en
+    ARRAY_AGG(DISTINCT m.metric_type) as metric_types,
+    ARRAY_AGG(m.data_id ORDER BY m.title_en) as sample_metrics
+FROM iris_metric_impact_categories c
+JOIN iris_metrics m ON m.data_id = c.data_id
+GROUP BY c.impact_category
 ORDER BY metric_count DESC;
 
 -- 2. SDG 목표 요약 뷰
 CREATE VIEW sdg_goals_summary AS
 SELECT 
-    jsonb_array_elements_text(jsonb_path_query_array(sdg_goals, '$.en.content.headings[*].text')) as sdg_en,
+    g.sdg_goal as sdg_en,
     COUNT(*) as metric_count,
-    ARRAY_AGG(data_id ORDER BY title_en) as sample_metrics
-FROM iris_metrics 
-WHERE sdg_goals IS NOT NULL
-GROUP BY sdg_en
+    ARRAY_AGG(m.data_id ORDER BY m.title_en) as sample_metrics
+FROM iris_metric_sdg_goals g
+JOIN iris_metrics m ON m.data_id = g.data_id
+GROUP BY g.sdg_goal
 ORDER BY metric_count DESC;
 
 -- 3. 메트릭 검색 뷰 (다국어 지원)
@@ -104,20 +122,50 @@ SELECT
     created_at
 FROM iris_metrics;
 
+-- 4. 업로드 검증용 구간 체크섬
+-- md5(data_id) 앞 prefix_length자리로 나눈 구간마다 행 수와 (data_id, content_hash) 목록의 md5를 반환
+-- 업로더는 같은 값을 로컬에서 계산해 비교하고, 다른 구간만 한 자리씩 더 나눠 내려감 (머클 트리 방식)
+CREATE OR REPLACE FUNCTION iris_metrics_checksums(bucket_prefix TEXT DEFAULT '', prefix_length INTEGER DEFAULT 1)
+RETURNS TABLE (bucket TEXT, row_count BIGINT, checksum TEXT)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        left(md5(m.data_id), prefix_length),
+        COUNT(*),
+        md5(string_agg(m.data_id || ':' || COALESCE(m.content_hash, ''), ',' ORDER BY m.data_id COLLATE "C"))
+    FROM iris_metrics m
+    WHERE left(md5(m.data_id), length(bucket_prefix)) = bucket_prefix
+    GROUP BY 1
+    ORDER BY 1;
+$$;
+
+-- 차이가 좁혀진 구간의 (data_id, content_hash) 행
+CREATE OR REPLACE FUNCTION iris_metrics_bucket_rows(bucket_prefix TEXT)
+RETURNS TABLE (data_id TEXT, content_hash TEXT)
+LANGUAGE sql STABLE
+AS $$
+    SELECT m.data_id, m.content_hash
+    FROM iris_metrics m
+    WHERE left(md5(m.data_id), length(bucket_prefix)) = bucket_prefix
+    ORDER BY m.data_id COLLATE "C";
+$$;
+
 -- 샘플 쿼리들
 
 -- Impact Category별 메트릭 조회 (영문)
 /*
-SELECT title_en, data_id, metric_type
-FROM iris_metrics 
-WHERE impact_categories @> '{"en": {"content": {"headings": [{"text": "Water"}]}}}';
+SELECT m.title_en, m.data_id, m.metric_type
+FROM iris_metric_impact_categories c
+JOIN iris_metrics m ON m.data_id = c.data_id
+WHERE c.impact_category = 'Water';
 */
 
 -- 특정 SDG 관련 메트릭 조회
 /*
-SELECT title_en, data_id
-FROM iris_metrics 
-WHERE sdg_goals @> '{"en": {"content": {"headings": [{"text": "Clean Water and Sanitation"}]}}}';
+SELECT m.title_en, m.data_id
+FROM iris_metric_sdg_goals g
+JOIN iris_metrics m ON m.data_id = g.data_id
+WHERE g.sdg_goal = 'Clean Water and Sanitation';
 */
 
 -- 메트릭 타입별 통계
@@ -5,6 +5,7 @@ import argparse
 import sys
 from pathlib import Path
 from utils.scraper_manager import ScraperManager
+from utils.telemetry import telemetry
 
 def main():
     parser = argparse.ArgumentParser(description='데이터 스크래핑 도구')
@@ -16,6 +17,8 @@ def main():
                        help='모든 스크래퍼 실행')
     parser.add_argument('--info', '-i', 
                        help='특정 스크래퍼 정보 표시')
+    parser.add_argument('--workers', '-w', type=int, default=4,
+                       help='--all 실행 시 동시에 실행할 최대 스크래퍼 수 (기본값: 4)')
     
     args = parser.parse_args()
     
@@ -41,13 +44,15 @@ def main():
     if args.all:
         print("🔄 모든 스크래퍼 실행")
         scrapers = manager.get_available_scrapers()
-        results = manager.run_all(scrapers)
+        results = manager.run_all(scrapers, max_workers=args.workers)
         print(f"✅ {len(results)}개 스크래퍼 실행 완료")
+        telemetry.export()
         return
     
     if args.scraper:
         print(f"🚀 {args.scraper} 스크래퍼 실행")
         result = manager.run_scraper(args.scraper)
+        telemetry.export()
         if result:
             print("✅ 스크래핑 완료")
         else:
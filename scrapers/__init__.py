@@ -1 +0,0 @@
-q
\ No newline at end of file
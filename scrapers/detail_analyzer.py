@@ -5,11 +5,18 @@ IRIS+ 메트릭 상세 페이지 분석 도구
 """
 
 import json
+import argparse
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import time
 import logging
 from typing import List, Dict, Optional
+from utils.rate_limiter import rate_limiters
+from utils.telemetry import telemetry
+from utils.http_client import create_session
+from utils.http_cache import install_cache, throttled_get
+from utils.page_archive import PageArchive, install_archive, install_replay
+from utils.html_parsing import make_soup, DEFAULT_PARSER, DETAIL_PAGE_STRAINER
 
 # 로깅 설정
 logging.basicConfig(
@@ -23,11 +30,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class DetailAnalyzer:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+    def __init__(self, use_cache: bool = True, cache_ttl: Optional[float] = None, parser: Optional[str] = None,
+                 archive: Optional[PageArchive] = None, from_archive: bool = False):
+        # 연결 풀/타임아웃/재시도가 설정된 공유 HTTP 클라이언트 세션
+        self.session = create_session('iris', name='iris_detail')
+        # 원본 HTML 아카이브: from_archive이면 네트워크 대신 아카이브에서 읽고, 아니면 받은 페이지를 기록
+        self.from_archive = from_archive
+        self.archive = archive
+        if from_archive:
+            self.archive = install_replay(self.session, archive)
+        else:
+            if use_cache:
+                install_cache(self.session, ttl=cache_ttl)
+            if archive is not None:
+                install_archive(self.session, archive)
+        # HTML 파서 백엔드 (기본값: lxml이 설치되어 있으면 lxml)
+        self.parser = parser or DEFAULT_PARSER
         
     def load_metrics_data(self, filename: str = "data/iris_metrics.json") -> List[Dict]:
         """JSON 파일에서 메트릭 데이터를 로드합니다."""
@@ -39,15 +57,25 @@ class DetailAnalyzer:
             logger.error(f"JSON 파일 로드 실패: {e}")
             return []
     
-    def get_page_content(self, url: str) -> Optional[BeautifulSoup]:
-        """웹페이지 내용을 가져옵니다."""
+    def get_page_content(self, url: str, parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
+        """웹페이지 내용을 가져옵니다. (parse_only가 있으면 해당 서브트리만 파싱)"""
         try:
-            response = self.session.get(url)
+            if self.from_archive:
+                response = self.session.get(url)
+            else:
+                response = throttled_get(self.session, url)
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
         except requests.RequestException as e:
+            if e.response is None:
+                rate_limiters.record(url, None, 0.0)
+                telemetry.record_request('iris_detail', url, None)
             logger.error(f"페이지 요청 실패 {url}: {e}")
             return None
+        
+        started = time.perf_counter()
+        soup = make_soup(response.content, self.parser, parse_only)
+        telemetry.record_parse('iris_detail', url, time.perf_counter() - started)
+        return soup
     
     def analyze_content_area(self, soup: BeautifulSoup, metric_info: Dict) -> Dict:
         """content-area 내용을 분석합니다."""
@@ -139,7 +167,7 @@ class DetailAnalyzer:
             logger.info(f"[{i}/{len(last_metrics)}] 분석 중: {metric['title']} ({metric['data_id']})")
             
             # 상세 페이지 가져오기
-            soup = self.get_page_content(metric['detail_url'])
+            soup = self.get_page_content(metric['detail_url'], parse_only=DETAIL_PAGE_STRAINER)
             if soup is None:
                 logger.warning(f"페이지 로드 실패: {metric['detail_url']}")
                 continue
@@ -149,9 +177,6 @@ class DetailAnalyzer:
             results.append(analysis)
             
             logger.info(f"분석 완료: {'성공' if analysis['content_found'] else '실패'}")
-            
-            # 서버 부하 방지
-            time.sleep(1)
         
         logger.info(f"전체 분석 완료: {len(results)}개 결과")
         return results
@@ -212,9 +237,28 @@ class DetailAnalyzer:
         
         print("\n" + "="*80)
 
+    def run(self, n: int = 30, filename: str = "data_temp/detail_analysis.json", **kwargs) -> Dict:
+        """ScraperManager용 실행 진입점 (BaseScraper.run과 같은 형태)
+        마지막 n개 메트릭을 분석해 저장하고, 분석 결과가 없으면 빈 결과를 반환합니다."""
+        results = self.analyze_last_n_metrics(n)
+        if not results:
+            return {}
+
+        saved = self.save_analysis_results(results, filename)
+        if not saved:
+            return {}
+        return {'analyses': results, 'output': saved}
+
 def main():
     """메인 실행 함수"""
-    analyzer = DetailAnalyzer()
+    parser = argparse.ArgumentParser(description='IRIS+ 메트릭 상세 페이지 분석')
+    parser.add_argument('--from-archive', action='store_true',
+                       help='네트워크 대신 원본 HTML 아카이브에서 페이지를 읽어 분석')
+    parser.add_argument('--archive-file', default='data_temp/raw_pages.warc.gz',
+                       help='원본 HTML 아카이브 경로 (기본값: data_temp/raw_pages.warc.gz)')
+    args = parser.parse_args()
+    
+    analyzer = DetailAnalyzer(archive=PageArchive(args.archive_file), from_archive=args.from_archive)
     
     # 마지막 30개 메트릭 분석
     results = analyzer.analyze_last_n_metrics(30)
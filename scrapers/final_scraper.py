@@ -4,12 +4,28 @@ metric-box 구조를 기반으로 한 최종 IRIS+ 메트릭 스크래퍼
 """
 
 import json
+import os
+import queue
+import asyncio
+import threading
 import requests
-from bs4 import BeautifulSoup
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer, NavigableString, Tag
 import time
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+from utils.rate_limiter import rate_limiters
+from utils.telemetry import telemetry, aiohttp_trace_config, record_aiohttp_response
+from utils.http_client import create_session, get_timeouts, build_retry, adapter_options
+from utils.http_cache import install_cache, throttled_get
+from utils.page_archive import PageArchive, install_archive, install_replay
+from utils.html_parsing import make_soup, detail_content_hash, DEFAULT_PARSER, DETAIL_PAGE_STRAINER
+from utils.scrape_journal import ScrapeJournal, metric_key
+from utils.work_queue import WorkQueue, default_worker_id
+from utils.payload_slimming import slim_sections
+from config.settings import SCRAPING_CONFIG
 
 # 로깅 설정
 logging.basicConfig(
@@ -22,12 +38,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+LIST_TAGS = {'ul', 'ol'}
+LEAF_TAGS = {'div', 'span'}
+
+def is_text_string(node, text_types) -> bool:
+    """get_text가 포함하는 문자열 노드인지 확인합니다."""
+    if not isinstance(node, NavigableString):
+        return False
+    if text_types is None:
+        return True
+    if isinstance(text_types, type):
+        return type(node) is text_types
+    return type(node) in text_types
+
 class FinalScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+    # 추출 로직(extract_metric_details)이 바뀌면 올려서 이전 content_hash와 일치하지 않게 함
+    EXTRACTION_VERSION = '1'
+    
+    def __init__(self, use_cache: bool = True, cache_ttl: Optional[float] = None, parser: Optional[str] = None,
+                 archive: Optional[PageArchive] = None, from_archive: bool = False, slim: Optional[bool] = None):
+        # 연결 풀/타임아웃/재시도가 설정된 공유 HTTP 클라이언트 세션
+        self.session = create_session('iris', name='iris_final')
+        # 원본 HTML 아카이브: from_archive이면 네트워크 대신 아카이브에서 읽고, 아니면 받은 페이지를 기록
+        self.from_archive = from_archive
+        self.archive = archive
+        if from_archive:
+            self.archive = install_replay(self.session, archive)
+        else:
+            if use_cache:
+                install_cache(self.session, ttl=cache_ttl)
+            if archive is not None:
+                install_archive(self.session, archive)
+        # HTML 파서 백엔드 (기본값: lxml이 설치되어 있으면 lxml)
+        self.parser = parser or DEFAULT_PARSER
+        # 이전 수집 결과 (content_hash가 같으면 파싱 없이 details 재사용)
+        self.previous_details: Dict[str, Dict] = {}
+        # 슬림 모드: 섹션 내용에서 raw_text와 중복/빈 값을 제거 (기본값은 설정의 slim_payload)
+        self.slim = SCRAPING_CONFIG['slim_payload'] if slim is None else slim
         
     def load_base_metrics(self, filename: str = "data/iris_metrics.json") -> Dict:
         """기존 메트릭 데이터를 로드합니다."""
@@ -38,18 +86,33 @@ class FinalScraper:
             logger.error(f"기존 JSON 파일 로드 실패: {e}")
             return {}
     
-    def get_page_content(self, url: str) -> Optional[BeautifulSoup]:
-        """웹페이지 내용을 가져옵니다."""
+    def fetch_page(self, url: str) -> Optional[bytes]:
+        """웹페이지 원본 HTML을 가져옵니다."""
         try:
-            response = self.session.get(url, timeout=30)
+            if self.from_archive:
+                response = self.session.get(url)
+                response.raise_for_status()
+                return response.content
+            
+            response = throttled_get(self.session, url)
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            return response.content
         except requests.RequestException as e:
+            if e.response is None:
+                rate_limiters.record(url, None, 0.0)
+                telemetry.record_request('iris_final', url, None)
             logger.error(f"페이지 요청 실패 {url}: {e}")
             return None
     
+    def get_page_content(self, url: str, parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
+        """웹페이지 내용을 가져옵니다. (parse_only가 있으면 해당 서브트리만 파싱)"""
+        content = self.fetch_page(url)
+        if content is None:
+            return None
+        return make_soup(content, self.parser, parse_only)
+    
     def extract_section_content(self, section) -> Dict:
-        """section 태그에서 내용을 추출합니다."""
+        """section 태그에서 내용을 추출합니다. (트리를 한 번만 순회)"""
         content = {
             'paragraphs': [],
             'lists': [],
@@ -59,54 +122,97 @@ class FinalScraper:
         }
         
         try:
-            # 모든 제목 요소 추출 (h1-h6)
-            headings = section.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-            for h in headings:
-                text = h.get_text(strip=True)
+            # get_text와 같은 기준의 문자열 타입 (주석, script 등 제외)
+            text_types = section.interesting_string_types
+            # 섹션 전체의 텍스트 조각 (strip 후 비어 있지 않은 것만, 문서 순서)
+            strings = []
+            headings, paragraphs, lists, leaves = [], [], [], []
+            open_lists = []
+            
+            # (노드, 종료 여부, 시작 위치, 슬롯) 스택으로 전위 순서를 유지하며 한 번에 순회
+            stack = [(child, False, 0, None) for child in reversed(section.contents)]
+            while stack:
+                node, exiting, start, slot = stack.pop()
+                
+                if exiting:
+                    # 하위 텍스트가 모두 모였으므로 get_text(strip=True)와 같은 값을 채움
+                    if node.name in LIST_TAGS:
+                        open_lists.pop()
+                        continue
+                    
+                    text = ''.join(strings[start:])
+                    if node.name == 'li':
+                        for cell in slot:
+                            cell[0] = text
+                    elif node.name in LEAF_TAGS:
+                        if text:
+                            leaves.append({
+                                'tag': node.name,
+                                'text': text,
+                                'class': node.get('class', [])
+                            })
+                    else:
+                        slot[-1] = text
+                    continue
+                
+                if not isinstance(node, Tag):
+                    if is_text_string(node, text_types):
+                        text = node.strip()
+                        if text:
+                            strings.append(text)
+                    continue
+                
+                # 전위 순서(find_all 순서)대로 결과 자리를 미리 확보
+                slot = None
+                tracked = True
+                if node.name in HEADING_TAGS:
+                    slot = [node.name, None]
+                    headings.append(slot)
+                elif node.name == 'p':
+                    slot = [None]
+                    paragraphs.append(slot)
+                elif node.name in LIST_TAGS:
+                    list_entry = {'type': node.name, 'cells': []}
+                    lists.append(list_entry)
+                    open_lists.append(list_entry)
+                elif node.name == 'li':
+                    # 중첩 리스트의 항목은 바깥 리스트에도 포함됨 (find_all('li')와 동일)
+                    slot = []
+                    for list_entry in open_lists:
+                        cell = [None]
+                        list_entry['cells'].append(cell)
+                        slot.append(cell)
+                elif node.name in LEAF_TAGS:
+                    # 자식 요소 없이 직접 텍스트만 있는 div/span만 수집
+                    tracked = not any(isinstance(child, Tag) for child in node.contents)
+                else:
+                    tracked = False
+                
+                if tracked:
+                    stack.append((node, True, len(strings), slot))
+                stack.extend((child, False, 0, None) for child in reversed(node.contents))
+            
+            for tag, text in headings:
                 if text:
                     content['headings'].append({
-                        'tag': h.name,
+                        'tag': tag,
                         'text': text
                     })
             
-            # 모든 단락 추출
-            paragraphs = section.find_all('p')
-            for p in paragraphs:
-                text = p.get_text(strip=True)
-                if text:
-                    content['paragraphs'].append(text)
+            content['paragraphs'] = [text for (text,) in paragraphs if text]
             
-            # 모든 리스트 추출
-            lists = section.find_all(['ul', 'ol'])
-            for lst in lists:
-                list_items = []
-                for li in lst.find_all('li'):
-                    item_text = li.get_text(strip=True)
-                    if item_text:
-                        list_items.append(item_text)
-                
+            for list_entry in lists:
+                list_items = [cell[0] for cell in list_entry['cells'] if cell[0]]
                 if list_items:
                     content['lists'].append({
-                        'type': lst.name,
+                        'type': list_entry['type'],
                         'items': list_items
                     })
             
-            # 기타 중요한 요소들 (div, span 등에서 직접 텍스트)
-            other_elements = section.find_all(['div', 'span'])
-            for elem in other_elements:
-                # 자식 요소가 없고 직접 텍스트만 있는 경우
-                if not elem.find_all() and elem.get_text(strip=True):
-                    text = elem.get_text(strip=True)
-                    # 이미 다른 곳에서 수집되지 않은 텍스트만 추가
-                    if text not in content['raw_text']:
-                        content['other_elements'].append({
-                            'tag': elem.name,
-                            'text': text,
-                            'class': elem.get('class', [])
-                        })
+            content['other_elements'] = leaves
             
             # 전체 텍스트 (백업용)
-            content['raw_text'] = section.get_text(separator=' ', strip=True)
+            content['raw_text'] = ' '.join(strings)
             
         except Exception as e:
             logger.error(f"섹션 내용 추출 중 오류: {e}")
@@ -216,46 +322,167 @@ class FinalScraper:
         
         return details
     
+    def build_failed_metric(self, metric: Dict, error: str) -> Dict:
+        """처리 실패한 메트릭 레코드를 만듭니다."""
+        return {
+            **metric,
+            'details': {
+                'success': False,
+                'error': error,
+                'scraped_at': datetime.now().isoformat()
+            }
+        }
+    
+    def build_metric_from_soup(self, metric: Dict, soup: BeautifulSoup) -> Dict:
+        """파싱된 상세 페이지에서 메트릭 레코드를 만듭니다."""
+        details = self.extract_metric_details(soup)
+        if self.slim:
+            details = slim_sections(details)
+        details['success'] = True
+        details['scraped_at'] = datetime.now().isoformat()
+        
+        return {
+            **metric,
+            'details': details
+        }
+    
+    def set_previous_details(self, previous_data: Dict) -> int:
+        """이전 수집 결과에서 content_hash가 있는 성공 레코드를 재사용 후보로 등록합니다."""
+        self.previous_details = {
+            metric_key(metric): metric['details']
+            for metric in previous_data.get('metrics', [])
+            if metric.get('details', {}).get('success') and metric['details'].get('content_hash')
+        }
+        logger.info(f"content_hash 재사용 후보 {len(self.previous_details)}개 등록")
+        return len(self.previous_details)
+    
+    def page_content_hash(self, content: bytes) -> Optional[str]:
+        """추출에 쓰이는 영역의 해시 (추출 로직 버전 포함)"""
+        return detail_content_hash(content, salt=self.EXTRACTION_VERSION.encode())
+    
+    def reuse_unchanged(self, metric: Dict, content_hash: Optional[str]) -> Optional[Dict]:
+        """이전 결과와 content_hash가 같으면 이전 details를 재사용한 레코드를 반환합니다."""
+        previous = self.previous_details.get(metric_key(metric))
+        if not content_hash or not previous or previous.get('content_hash') != content_hash:
+            return None
+        
+        details = slim_sections(previous) if self.slim else previous
+        return {
+            **metric,
+            'details': {**details, 'unchanged': True, 'scraped_at': datetime.now().isoformat()}
+        }
+    
+    def parse_metric_page(self, metric: Dict, content: bytes) -> Dict:
+        """가져온 상세 페이지 HTML을 파싱해 메트릭 레코드를 만듭니다. (내용이 그대로면 파싱 생략)"""
+        content_hash = self.page_content_hash(content)
+        reused = self.reuse_unchanged(metric, content_hash)
+        if reused:
+            return reused
+        
+        started = time.perf_counter()
+        try:
+            soup = make_soup(content, self.parser, DETAIL_PAGE_STRAINER)
+            record = self.build_metric_from_soup(metric, soup)
+            if content_hash:
+                record['details']['content_hash'] = content_hash
+            record['details']['unchanged'] = False
+            return record
+        except Exception as e:
+            logger.error(f"메트릭 {metric['data_id']} 처리 실패: {e}")
+            return self.build_failed_metric(metric, str(e))
+        finally:
+            telemetry.record_parse('iris_final', metric['detail_url'], time.perf_counter() - started)
+    
     def process_single_metric(self, metric: Dict) -> Dict:
         """단일 메트릭의 상세 정보를 처리합니다."""
         try:
             # 상세 페이지 가져오기
-            soup = self.get_page_content(metric['detail_url'])
-            if soup is None:
-                return {
-                    **metric,
-                    'details': {
-                        'success': False,
-                        'error': 'Page load failed',
-                        'scraped_at': datetime.now().isoformat()
-                    }
-                }
+            content = self.fetch_page(metric['detail_url'])
+            if content is None:
+                return self.build_failed_metric(metric, 'Page load failed')
             
             # 상세 정보 추출
-            details = self.extract_metric_details(soup)
-            details['success'] = True
-            details['scraped_at'] = datetime.now().isoformat()
-            
-            return {
-                **metric,
-                'details': details
-            }
+            return self.parse_metric_page(metric, content)
             
         except Exception as e:
             logger.error(f"메트릭 {metric['data_id']} 처리 실패: {e}")
-            return {
-                **metric,
-                'details': {
-                    'success': False,
-                    'error': str(e),
-                    'scraped_at': datetime.now().isoformat()
-                }
-            }
+            return self.build_failed_metric(metric, str(e))
+    
+    async def process_single_metric_async(self, http: aiohttp.ClientSession, semaphore: asyncio.Semaphore, metric: Dict) -> Dict:
+        """단일 메트릭의 상세 정보를 비동기로 처리합니다."""
+        url = metric['detail_url']
+        if self.from_archive:
+            content = self.fetch_page(url)
+            if content is None:
+                return self.build_failed_metric(metric, 'Page load failed')
+            return self.parse_metric_page(metric, content)
+        
+        try:
+            # 동시 요청 수 제한 안에서 상세 페이지 가져오기
+            async with semaphore:
+                content = await self.fetch_page_async(http, url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"페이지 요청 실패 {metric['detail_url']}: {e}")
+            return self.build_failed_metric(metric, 'Page load failed')
+        
+        return self.parse_metric_page(metric, content)
     
-    def process_all_metrics(self, base_data: Dict, batch_size: int = 50) -> Dict:
+    async def fetch_page_async(self, http: aiohttp.ClientSession, url: str) -> bytes:
+        """웹페이지 원본 HTML을 비동기로 가져옵니다.
+        연결 오류와 5xx는 동기 세션과 같은 재시도 정책(횟수, 지수 백오프)으로 다시 시도합니다."""
+        retry = adapter_options(self.session).get('max_retries') or build_retry()
+        attempt = 0
+        while True:
+            await rate_limiters.wait_async(url)
+            started = time.monotonic()
+            try:
+                async with http.get(url) as response:
+                    content = await response.read()
+                    record_aiohttp_response('iris_final', response, len(content))
+                    rate_limiters.record(url, response.status, time.monotonic() - started,
+                                         response.headers.get('Retry-After'))
+                    if response.status not in retry.status_forcelist or attempt >= retry.total:
+                        response.raise_for_status()
+                        if self.archive is not None:
+                            self.archive.write(url, response.status, response.headers, content)
+                        return content
+                    reason = f"응답 {response.status}"
+            except aiohttp.ClientResponseError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                rate_limiters.record(url, None, 0.0)
+                if attempt >= retry.total:
+                    raise
+                reason = f"연결 오류 {e!r}"
+            
+            attempt += 1
+            # urllib3와 같이 첫 재시도는 바로, 이후에는 backoff_factor * 2^(n-1)초 대기
+            delay = retry.backoff_factor * (2 ** (attempt - 1)) if attempt > 1 else 0.0
+            logger.warning(f"{url} {reason} - {delay:.1f}초 후 재시도 ({attempt}/{retry.total})")
+            await asyncio.sleep(delay)
+    
+    def replay_journal(self, metrics: List[Dict], journal: ScrapeJournal, resume: bool) -> set:
+        """저널을 열고, resume이면 이미 성공한 메트릭을 복원해 그 인덱스를 반환합니다."""
+        done = set()
+        if resume:
+            records = journal.load()
+            for i, metric in enumerate(metrics):
+                record = records.get(metric_key(metric))
+                if record and record.get('details', {}).get('success', False):
+                    metrics[i] = record
+                    done.add(i)
+            logger.info(f"저널에서 {len(done)}개 메트릭 복원 - 나머지부터 이어서 처리")
+        
+        journal.open(resume=resume)
+        return done
+    
+    def process_all_metrics(self, base_data: Dict, batch_size: int = 50,
+                            journal: Optional[ScrapeJournal] = None, resume: bool = False) -> Dict:
         """모든 메트릭을 배치 단위로 처리합니다."""
         metrics = base_data['metrics']
         total_metrics = len(metrics)
+        journal = journal or ScrapeJournal()
+        done = self.replay_journal(metrics, journal, resume)
         
         logger.info(f"전체 {total_metrics}개 메트릭 처리 시작")
         
@@ -267,6 +494,9 @@ class FinalScraper:
             logger.info(f"배치 {batch_num}/{total_batches} 처리 중 ({start_idx+1}-{end_idx})")
             
             for i in range(start_idx, end_idx):
+                if i in done:
+                    continue
+                
                 current_progress = i - start_idx + 1
                 batch_total = end_idx - start_idx
                 
@@ -274,26 +504,301 @@ class FinalScraper:
                 
                 # 메트릭 처리
                 metrics[i] = self.process_single_metric(metrics[i])
+                journal.append(metrics[i])
                 
                 success = metrics[i]['details']['success']
                 logger.info(f"처리 {'성공' if success else '실패'}")
+            
+            # 배치 경계에서 저널을 디스크에 확정
+            journal.sync()
+            logger.info(f"배치 {batch_num} 완료 - 저널 기록됨")
+        
+        journal.close()
+        return base_data
+    
+    def process_all_metrics_async(self, base_data: Dict, concurrency: int = 5, batch_size: int = 50,
+                                  journal: Optional[ScrapeJournal] = None, resume: bool = False) -> Dict:
+        """모든 메트릭을 동시 요청 수를 제한한 비동기 방식으로 처리합니다."""
+        return asyncio.run(self._process_all_metrics_async(base_data, concurrency, batch_size, journal, resume))
+    
+    async def _process_all_metrics_async(self, base_data: Dict, concurrency: int, batch_size: int,
+                                         journal: Optional[ScrapeJournal], resume: bool) -> Dict:
+        metrics = base_data['metrics']
+        total_metrics = len(metrics)
+        journal = journal or ScrapeJournal()
+        done = self.replay_journal(metrics, journal, resume)
+        pending = [i for i in range(total_metrics) if i not in done]
+        
+        logger.info(f"전체 {total_metrics}개 메트릭 비동기 처리 시작 (동시 요청 {concurrency}개)")
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        connect_timeout, read_timeout = get_timeouts('iris')
+        timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        headers = {'User-Agent': self.session.headers['User-Agent']}
+        
+        trace_configs = [aiohttp_trace_config('iris_final')]
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers,
+                                         trace_configs=trace_configs) as http:
+            async def run(index: int):
+                return index, await self.process_single_metric_async(http, semaphore, metrics[index])
+            
+            tasks = [asyncio.create_task(run(i)) for i in pending]
+            completed = 0
+            
+            for future in asyncio.as_completed(tasks):
+                # 완료 순서와 상관없이 원래 위치에 결과를 기록해 순서를 유지
+                index, result = await future
+                metrics[index] = result
+                journal.append(result)
+                completed += 1
                 
-                # 서버 부하 방지
-                time.sleep(1.5)
+                success = result['details']['success']
+                logger.info(f"[{completed}/{len(pending)}] {result['title']} ({result['data_id']}) 처리 {'성공' if success else '실패'}")
+                
+                # 배치 경계에서 저널을 디스크에 확정
+                if completed % batch_size == 0:
+                    journal.sync()
+                    logger.info(f"{completed}개 처리 완료 - 저널 기록됨")
+        
+        journal.close()
+        return base_data
+    
+    def process_all_metrics_pipelined(self, base_data: Dict, fetch_workers: int = 4, parse_workers: Optional[int] = None,
+                                      queue_size: int = 32, batch_size: int = 50,
+                                      journal: Optional[ScrapeJournal] = None, resume: bool = False) -> Dict:
+        """수집(스레드)과 파싱(프로세스 풀)을 분리한 2단계 파이프라인으로 모든 메트릭을 처리합니다."""
+        metrics = base_data['metrics']
+        journal = journal or ScrapeJournal()
+        done = self.replay_journal(metrics, journal, resume)
+        pending = [i for i in range(len(metrics)) if i not in done]
+        parse_workers = parse_workers or os.cpu_count() or 1
+        
+        logger.info(f"전체 {len(pending)}개 메트릭 파이프라인 처리 시작 (수집 {fetch_workers}개 / 파싱 {parse_workers}개)")
+        
+        # 수집 단계 → 파싱 단계 사이의 유한 큐 (원본 HTML이 메모리에 쌓이지 않도록 제한)
+        html_queue = queue.Queue(maxsize=queue_size)
+        finished = object()
+        
+        def fetch(index: int):
+            content = None
+            try:
+                content = self.fetch_page(metrics[index]['detail_url'])
+            finally:
+                # 예외가 나도 파싱 단계가 해당 메트릭을 실패로 기록하도록 항상 전달
+                html_queue.put((index, content))
+        
+        def run_fetchers():
+            try:
+                with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_executor:
+                    fetch_executor.map(fetch, pending)
+            finally:
+                html_queue.put(finished)
+        
+        completed = 0
+        
+        def collect(index: int, result: Dict):
+            nonlocal completed
+            # 완료 순서와 상관없이 원래 위치에 결과를 기록해 순서를 유지
+            metrics[index] = result
+            journal.append(result)
+            completed += 1
             
-            # 중간 저장
-            temp_filename = f"data_temp/final_metrics_temp_{batch_num}.json"
-            with open(temp_filename, 'w', encoding='utf-8') as f:
-                json.dump(base_data, f, ensure_ascii=False, indent=2)
+            success = result['details']['success']
+            logger.info(f"[{completed}/{len(pending)}] {result['title']} ({result['data_id']}) 처리 {'성공' if success else '실패'}")
             
-            logger.info(f"배치 {batch_num} 완료 - 중간 저장됨")
+            if completed % batch_size == 0:
+                journal.sync()
+                logger.info(f"{completed}개 처리 완료 - 저널 기록됨")
+        
+        def collect_parsed(index: int, parsed):
+            # 파싱 시간은 워커 프로세스에서 재서 함께 돌려받음
+            result, seconds = parsed
+            telemetry.record_parse('iris_final', metrics[index]['detail_url'], seconds)
+            collect(index, result)
+        
+        fetcher = threading.Thread(target=run_fetchers, daemon=True)
+        fetcher.start()
+        
+        with ProcessPoolExecutor(max_workers=parse_workers, initializer=init_parse_worker,
+                                 initargs=(self.parser, self.slim)) as parse_executor:
+            in_flight = {}
+            while True:
+                item = html_queue.get()
+                if item is finished:
+                    break
+                
+                index, content = item
+                if content is None:
+                    collect(index, self.build_failed_metric(metrics[index], 'Page load failed'))
+                    continue
+                
+                # 내용이 그대로인 페이지는 파싱 프로세스로 보내지 않음
+                reused = self.reuse_unchanged(metrics[index], self.page_content_hash(content))
+                if reused:
+                    collect(index, reused)
+                    continue
+                
+                in_flight[parse_executor.submit(parse_in_worker, metrics[index], content)] = index
+                
+                # 파싱 대기 작업 수도 큐 크기로 제한
+                if len(in_flight) >= queue_size:
+                    finished_futures, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished_futures:
+                        collect_parsed(in_flight.pop(future), future.result())
             
-            # 배치 간 휴식
-            if end_idx < total_metrics:
-                logger.info("다음 배치를 위해 3초 대기...")
-                time.sleep(3)
+            for future in list(in_flight):
+                collect_parsed(in_flight.pop(future), future.result())
         
+        fetcher.join()
+        journal.close()
         return base_data
+    
+    def process_metrics(self, base_data: Dict, mode: str = 'sync', batch_size: int = 50, resume: bool = False,
+                        concurrency: int = 5, fetch_workers: int = 4, parse_workers: Optional[int] = None,
+                        queue_size: int = 32) -> Dict:
+        """선택한 처리 모드(sync, async, pipeline)로 모든 메트릭을 처리합니다."""
+        if mode == 'async':
+            return self.process_all_metrics_async(base_data, concurrency=concurrency, batch_size=batch_size, resume=resume)
+        if mode == 'pipeline':
+            return self.process_all_metrics_pipelined(base_data, fetch_workers=fetch_workers, parse_workers=parse_workers,
+                                                      queue_size=queue_size, batch_size=batch_size, resume=resume)
+        return self.process_all_metrics(base_data, batch_size=batch_size, resume=resume)
+    
+    def process_queue(self, work_queue: WorkQueue, worker_id: Optional[str] = None, claim_size: int = 10,
+                      poll_interval: float = 5.0) -> int:
+        """작업 큐에서 메트릭을 임대해 처리하고 결과를 기록합니다. (처리할 작업이 없으면 종료)"""
+        worker_id = worker_id or default_worker_id()
+        processed = 0
+        
+        logger.info(f"워커 {worker_id} 시작")
+        
+        while True:
+            jobs = work_queue.claim(worker_id, limit=claim_size)
+            if not jobs:
+                # 다른 워커가 임대 중인 작업이 남아 있으면 만료 후 재할당될 수 있으므로 대기
+                if not work_queue.has_open_jobs():
+                    break
+                time.sleep(poll_interval)
+                continue
+            
+            for idx, metric in jobs:
+                result = self.process_single_metric(metric)
+                work_queue.complete(idx, result, worker_id)
+                processed += 1
+                
+                success = result['details']['success']
+                logger.info(f"[{worker_id}] {metric['title']} ({metric['data_id']}) 처리 {'성공' if success else '실패'}")
+        
+        logger.info(f"워커 {worker_id} 종료 - {processed}개 처리, 큐 상태: {work_queue.stats()}")
+        return processed
+    
+    def plan_incremental_update(self, fresh_metrics: List[Dict], previous_data: Dict, max_age_days: int = 90) -> Dict:
+        """새 목록과 이전 수집 결과를 비교해 다시 수집할 메트릭을 고릅니다."""
+        previous = {m['data_id']: m for m in previous_data.get('metrics', []) if m.get('data_id')}
+        fresh_ids = {m['data_id'] for m in fresh_metrics if m.get('data_id')}
+        cutoff = datetime.now() - timedelta(days=max_age_days)
+        
+        plan = {
+            'fetch_indices': [],
+            'new': [],
+            'changed': [],
+            'missing': [],
+            'failed': [],
+            'stale': [],
+            'unchanged': [],
+            'removed': [data_id for data_id in previous if data_id not in fresh_ids]
+        }
+        
+        for i, metric in enumerate(fresh_metrics):
+            data_id = metric.get('data_id')
+            old = previous.get(data_id)
+            details = old.get('details') if old else None
+            
+            if old is None:
+                reason = 'new'
+            elif old.get('relative_path') != metric.get('relative_path'):
+                reason = 'changed'
+            elif not details:
+                reason = 'missing'
+            elif not details.get('success', False):
+                reason = 'failed'
+            else:
+                try:
+                    scraped_at = datetime.fromisoformat(details.get('scraped_at', ''))
+                except (TypeError, ValueError):
+                    scraped_at = None
+                reason = 'stale' if scraped_at is None or scraped_at < cutoff else 'unchanged'
+            
+            plan[reason].append(data_id)
+            if reason != 'unchanged':
+                plan['fetch_indices'].append(i)
+        
+        return plan
+    
+    def process_incremental(self, base_data: Dict, previous_data: Dict, max_age_days: int = 90,
+                            reuse_details: bool = True, **process_options) -> Dict:
+        """변경되었거나 새로운 메트릭만 다시 수집하고 나머지는 이전 결과를 그대로 사용합니다."""
+        metrics = base_data['metrics']
+        plan = self.plan_incremental_update(metrics, previous_data, max_age_days)
+        
+        # 변경 없는 메트릭은 이전 details를 그대로 이어받음
+        previous = {m['data_id']: m for m in previous_data.get('metrics', []) if m.get('data_id')}
+        unchanged_ids = set(plan['unchanged'])
+        for i, metric in enumerate(metrics):
+            if metric.get('data_id') in unchanged_ids:
+                details = previous[metric['data_id']]['details']
+                if self.slim:
+                    details = slim_sections(details)
+                metrics[i] = {**metric, 'details': {**details, 'unchanged': True}}
+        
+        logger.info(f"증분 수집: 재수집 {len(plan['fetch_indices'])}개 / 유지 {len(unchanged_ids)}개 / 삭제 {len(plan['removed'])}개")
+        
+        # 재수집 대상만 따로 처리한 뒤 원래 위치에 다시 넣음
+        subset = {'metrics': [metrics[i] for i in plan['fetch_indices']]}
+        if subset['metrics']:
+            # 다시 가져온 페이지도 내용이 그대로면 파싱 없이 이전 details 재사용
+            if reuse_details:
+                self.set_previous_details(previous_data)
+            self.process_metrics(subset, **process_options)
+        
+        for i, metric in zip(plan['fetch_indices'], subset['metrics']):
+            metrics[i] = metric
+        
+        plan['content_unchanged'] = [m['data_id'] for m in subset['metrics'] if m.get('details', {}).get('unchanged')]
+        return plan
+    
+    def save_change_report(self, plan: Dict, filename: str = "data/iris_change_report.json") -> str:
+        """증분 수집 변경 보고서를 저장합니다."""
+        report = {
+            "generated_at": datetime.now().isoformat(),
+            "summary": {
+                key: len(value) for key, value in plan.items() if key != 'fetch_indices'
+            },
+            "refetched": len(plan['fetch_indices']),
+            **{key: value for key, value in plan.items() if key not in ('fetch_indices', 'unchanged')}
+        }
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        
+        logger.info(f"변경 보고서 저장: {filename}")
+        return filename
+
+# 파싱 프로세스마다 하나씩 두는 스크래퍼 (initializer에서 생성)
+_worker_scraper: Optional[FinalScraper] = None
+
+def init_parse_worker(parser: str, slim: bool = False):
+    """파싱 프로세스를 초기화합니다."""
+    global _worker_scraper
+    _worker_scraper = FinalScraper(use_cache=False, parser=parser, slim=slim)
+
+def parse_in_worker(metric: Dict, content: bytes) -> Tuple[Dict, float]:
+    """파싱 프로세스에서 상세 페이지를 파싱합니다. (결과와 파싱 시간 반환)"""
+    started = time.perf_counter()
+    result = _worker_scraper.parse_metric_page(metric, content)
+    return result, time.perf_counter() - started
 
 def main():
     """테스트용 메인 함수 - 처음 5개만 처리"""
@@ -316,7 +821,6 @@ def main():
         test_metrics[i] = scraper.process_single_metric(metric)
         success = test_metrics[i]['details']['success']
         logger.info(f"처리 {'성공' if success else '실패'}")
-        time.sleep(1)
     
     # 결과 저장
     base_data['metrics'] = test_metrics + base_data['metrics'][5:]
@@ -335,7 +839,7 @@ def main():
             
             details = sample['details']
             for key, value in details.items():
-                if key in ['success', 'scraped_at', 'error']:
+                if key in ['success', 'scraped_at', 'error', 'content_hash', 'unchanged']:
                     continue
                 if isinstance(value, dict) and 'content' in value:
                     content = value['content']
@@ -5,12 +5,21 @@ https://iris.thegiin.org/metrics/ 에서 메트릭 목록을 수집합니다.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import json
+import re
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, parse_qs
+from utils.rate_limiter import rate_limiters
+from utils.telemetry import telemetry
+from utils.http_client import create_session
+from utils.http_cache import install_cache, throttled_get
+from utils.page_archive import PageArchive, install_archive, install_replay
+from utils.html_parsing import make_soup, DEFAULT_PARSER
+from config.settings import SCRAPING_CONFIG
 
 # 로깅 설정
 logging.basicConfig(
@@ -24,22 +33,43 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class IRISScraper:
-    def __init__(self, base_url: str = "https://iris.thegiin.org"):
+    def __init__(self, base_url: str = "https://iris.thegiin.org", use_cache: bool = True, cache_ttl: Optional[float] = None,
+                 parser: Optional[str] = None, archive: Optional[PageArchive] = None, from_archive: bool = False):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        # 연결 풀/타임아웃/재시도가 설정된 공유 HTTP 클라이언트 세션
+        self.session = create_session('iris', name='iris')
+        # 원본 HTML 아카이브: from_archive이면 네트워크 대신 아카이브에서 읽고, 아니면 받은 페이지를 기록
+        self.from_archive = from_archive
+        self.archive = archive
+        if from_archive:
+            self.archive = install_replay(self.session, archive)
+        else:
+            if use_cache:
+                install_cache(self.session, ttl=cache_ttl)
+            if archive is not None:
+                install_archive(self.session, archive)
+        # HTML 파서 백엔드 (기본값: lxml이 설치되어 있으면 lxml)
+        self.parser = parser or DEFAULT_PARSER
         
-    def get_page_content(self, url: str) -> Optional[BeautifulSoup]:
-        """웹페이지 내용을 가져옵니다."""
+    def get_page_content(self, url: str, parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
+        """웹페이지 내용을 가져옵니다. (parse_only가 있으면 해당 서브트리만 파싱)"""
         try:
-            response = self.session.get(url)
+            if self.from_archive:
+                response = self.session.get(url)
+            else:
+                response = throttled_get(self.session, url)
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
         except requests.RequestException as e:
+            if e.response is None:
+                rate_limiters.record(url, None, 0.0)
+                telemetry.record_request('iris', url, None)
             logger.error(f"페이지 요청 실패 {url}: {e}")
             return None
+        
+        started = time.perf_counter()
+        soup = make_soup(response.content, self.parser, parse_only)
+        telemetry.record_parse('iris', url, time.perf_counter() - started)
+        return soup
     
     def extract_metrics_from_page(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
         """페이지에서 메트릭 정보를 추출합니다."""
@@ -85,28 +115,118 @@ class IRISScraper:
         
         return metrics
     
-    def scrape_all_pages(self, total_pages: int = 63) -> List[Dict[str, str]]:
-        """모든 페이지에서 메트릭을 스크래핑합니다."""
+    def detect_total_pages(self, soup: BeautifulSoup) -> Optional[int]:
+        """첫 페이지의 페이지네이션 링크에서 전체 페이지 수를 읽습니다. (페이지네이션 영역이 없으면 None)"""
+        # 본문의 다른 ?page= 링크(필터, 정렬 등)를 페이지 수로 오인하지 않도록 페이지네이션 영역만 확인
+        pagination = (soup.find(class_=re.compile('pagination')) or
+                      soup.find('nav', attrs={'aria-label': re.compile('pagination', re.I)}))
+        if pagination is None:
+            return None
+        page_numbers = []
+        
+        for link in pagination.find_all('a', href=True):
+            pages = parse_qs(urlparse(link['href']).query).get('page', [])
+            if pages and pages[0].isdigit():
+                page_numbers.append(int(pages[0]))
+        
+        return max(page_numbers) if page_numbers else None
+    
+    def scrape_page(self, page_num: int) -> Optional[List[Dict[str, str]]]:
+        """단일 목록 페이지의 메트릭을 수집합니다. (실패 시 None)"""
+        url = f"{self.base_url}/metrics/?page={page_num}"
+        soup = self.get_page_content(url)
+        if soup is None:
+            logger.error(f"페이지 {page_num} 스킵")
+            return None
+        
+        page_metrics = self.extract_metrics_from_page(soup)
+        logger.info(f"페이지 {page_num}에서 {len(page_metrics)}개 메트릭 수집")
+        return page_metrics
+    
+    @staticmethod
+    def listing_key(metric: Dict[str, str]) -> str:
+        """목록에서 메트릭을 구분하는 키 (data_id가 없으면 상대 경로)"""
+        return metric['data_id'] or metric['relative_path']
+    
+    def merge_page_metrics(self, pages: List[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+        """페이지 순서대로 합치면서 data_id 기준으로 중복을 제거합니다."""
         all_metrics = []
+        seen = set()
+        duplicates = 0
         
-        logger.info(f"총 {total_pages}페이지 스크래핑 시작...")
+        for page_metrics in pages:
+            for metric in page_metrics:
+                # 수집 중 페이지가 밀리면 같은 메트릭이 두 페이지에 나올 수 있음
+                key = self.listing_key(metric)
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                all_metrics.append(metric)
         
-        for page_num in range(1, total_pages + 1):
-            url = f"{self.base_url}/metrics/?page={page_num}"
-            logger.info(f"페이지 {page_num}/{total_pages} 처리 중: {url}")
-            
-            soup = self.get_page_content(url)
-            if soup is None:
-                logger.error(f"페이지 {page_num} 스킵")
-                continue
-            
-            page_metrics = self.extract_metrics_from_page(soup)
-            all_metrics.extend(page_metrics)
-            
-            logger.info(f"페이지 {page_num}에서 {len(page_metrics)}개 메트릭 수집")
-            
-            # 서버 부하 방지를 위한 딜레이
-            time.sleep(1)
+        if duplicates:
+            logger.info(f"중복 메트릭 {duplicates}개 제거")
+        return all_metrics
+    
+    def scrape_pages(self, page_numbers: List[int], max_workers: int = 4, page_retries: int = 2) -> Dict[int, List[Dict[str, str]]]:
+        """여러 목록 페이지를 동시에 수집하고, 실패한 페이지는 page_retries번까지 다시 수집합니다.
+        끝내 가져오지 못한 페이지가 있으면 페이지 번호와 함께 RuntimeError를 발생시킵니다."""
+        pages = {}
+        missing = list(page_numbers)
+        for attempt in range(page_retries + 1):
+            if attempt:
+                logger.warning(f"실패한 페이지 {len(missing)}개 재수집 ({attempt}/{page_retries}): {missing}")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for page_num, page_metrics in zip(missing, executor.map(self.scrape_page, missing)):
+                    if page_metrics is not None:
+                        pages[page_num] = page_metrics
+            missing = [page_num for page_num in missing if page_num not in pages]
+            if not missing:
+                return pages
+
+        # 일부 페이지가 빠진 목록을 저장하면 증분 수집/동기화에서 빠진 메트릭이 삭제된 것으로 처리됨
+        logger.error(f"재시도 후에도 가져오지 못한 페이지: {missing}")
+        raise RuntimeError(f"목록 페이지 {len(missing)}개를 가져오지 못했습니다: {missing}")
+
+    def scrape_all_pages(self, total_pages: Optional[int] = None, max_workers: int = 4,
+                         page_retries: int = 2) -> List[Dict[str, str]]:
+        """모든 페이지에서 메트릭을 스크래핑합니다. (total_pages가 없으면 첫 페이지에서 자동 감지)
+        실패한 페이지는 page_retries번까지 다시 수집하고, 그래도 빠진 페이지가 있으면 RuntimeError를 발생시킵니다."""
+        first_url = f"{self.base_url}/metrics/?page=1"
+        first_soup = self.get_page_content(first_url)
+        if first_soup is None:
+            logger.error("첫 페이지를 가져올 수 없어 스크래핑을 중단합니다.")
+            return []
+        
+        pages = [self.extract_metrics_from_page(first_soup)]
+        logger.info(f"페이지 1에서 {len(pages[0])}개 메트릭 수집")
+        
+        if total_pages is None:
+            total_pages = self.detect_total_pages(first_soup)
+        
+        if total_pages is None:
+            # 페이지 수를 알 수 없으면 새 메트릭이 없는 페이지가 나올 때까지 순서대로 진행
+            max_pages = SCRAPING_CONFIG['max_listing_pages']
+            logger.warning(f"페이지네이션에서 전체 페이지 수를 찾지 못했습니다. 새 메트릭이 없을 때까지 "
+                           f"최대 {max_pages}페이지 순차 수집합니다.")
+            seen = {self.listing_key(metric) for metric in pages[0]}
+            for page_num in range(2, max_pages + 1):
+                page_metrics = self.scrape_pages([page_num], 1, page_retries)[page_num]
+                new_keys = {self.listing_key(metric) for metric in page_metrics} - seen
+                if not new_keys:
+                    # 빈 페이지이거나, 범위를 넘은 번호에 마지막 페이지를 다시 주는 페이지네이터
+                    logger.info(f"페이지 {page_num}에 새 메트릭이 없어 순차 수집을 마칩니다.")
+                    break
+                seen |= new_keys
+                pages.append(page_metrics)
+            else:
+                logger.warning(f"최대 목록 페이지 수({max_pages})에 도달해 순차 수집을 멈춥니다.")
+        else:
+            logger.info(f"총 {total_pages}페이지 스크래핑 시작 (동시 {max_workers}개)...")
+            results = self.scrape_pages(list(range(2, total_pages + 1)), max_workers, page_retries)
+            pages.extend(results[page_num] for page_num in sorted(results))
+        
+        all_metrics = self.merge_page_metrics(pages)
         
         logger.info(f"스크래핑 완료: 총 {len(all_metrics)}개 메트릭 수집")
         return all_metrics
@@ -135,12 +255,30 @@ class IRISScraper:
             logger.error(f"JSON 저장 실패: {e}")
             return None
 
+    def run(self, filename: str = "data/iris_metrics.json", **kwargs) -> Dict:
+        """ScraperManager용 실행 진입점 (BaseScraper.run과 같은 형태)
+        전체 목록을 수집해 저장하고, 수집하거나 저장하지 못하면 빈 결과를 반환합니다."""
+        # 일부 페이지가 빠지면 RuntimeError가 그대로 올라가 ScraperManager에서 실패로 처리됨
+        metrics = self.scrape_all_pages(**kwargs)
+        if not metrics:
+            logger.error("메트릭 데이터를 수집하지 못했습니다.")
+            return {}
+
+        saved = self.save_to_json(metrics, filename)
+        if not saved:
+            return {}
+        return {'metrics': metrics, 'output': saved}
+
 def main():
     """메인 실행 함수"""
     scraper = IRISScraper()
     
     # 모든 페이지 스크래핑
-    metrics = scraper.scrape_all_pages(total_pages=63)
+    try:
+        metrics = scraper.scrape_all_pages()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return
     
     if metrics:
         # JSON 파일로 저장
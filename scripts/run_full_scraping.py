@@ -3,19 +3,142 @@
 전체 750개 메트릭 최종 수집 실행 스크립트
 """
 
-from final_scraper import FinalScraper
-import json
+import argparse
+from pathlib import Path
+from scrapers.final_scraper import FinalScraper
+from scrapers.iris_scraper import IRISScraper
+from utils.scrape_journal import write_json_atomic
+from utils.page_archive import PageArchive
+from utils.work_queue import WorkQueue
+from utils.telemetry import telemetry
 
 def main():
     """전체 메트릭 수집 실행"""
-    scraper = FinalScraper()
+    parser = argparse.ArgumentParser(description='전체 IRIS+ 메트릭 상세 정보 수집')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                       help='비동기 모드로 상세 페이지를 동시에 수집')
+    parser.add_argument('--concurrency', type=int, default=5,
+                       help='비동기 모드의 최대 동시 요청 수 (기본값: 5)')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='수집 스레드와 파싱 프로세스 풀을 분리한 파이프라인 모드')
+    parser.add_argument('--fetch-workers', type=int, default=4,
+                       help='파이프라인 모드의 수집 스레드 수 (기본값: 4)')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                       help='파이프라인 모드의 파싱 프로세스 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--queue-size', type=int, default=32,
+                       help='파이프라인 모드에서 파싱을 기다리는 최대 페이지 수 (기본값: 32)')
+    parser.add_argument('--batch-size', type=int, default=50,
+                       help='저널을 디스크에 확정하는 메트릭 수 단위 (기본값: 50)')
+    parser.add_argument('--resume', action='store_true',
+                       help='저널(data_temp/final_metrics_journal.jsonl)을 재생해 이미 성공한 메트릭은 건너뜀')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='디스크 응답 캐시(data_temp/http_cache) 사용 안 함')
+    parser.add_argument('--cache-ttl', type=float, default=None,
+                       help='이 시간(초) 안에 저장된 캐시는 재검증 없이 사용')
+    parser.add_argument('--incremental', action='store_true',
+                       help='목록을 새로 수집해 신규/변경/실패/오래된 메트릭만 다시 수집')
+    parser.add_argument('--previous', default='data/iris_metrics_complete.json',
+                       help='비교할 이전 수집 결과 - 증분 모드 기준 및 content_hash 재사용에 사용 (기본값: data/iris_metrics_complete.json)')
+    parser.add_argument('--max-age-days', type=int, default=90,
+                       help='증분 모드에서 이 일수보다 오래된 상세 정보는 다시 수집 (기본값: 90)')
+    parser.add_argument('--force-extract', action='store_true',
+                       help='이전 결과와 content_hash가 같아도 details를 다시 추출')
+    parser.add_argument('--slim', action='store_true',
+                       help='슬림 모드: 섹션 내용에서 raw_text와 중복/빈 값을 빼고 저장 (기본값: 설정의 slim_payload)')
+    parser.add_argument('--archive-file', default='data_temp/raw_pages.warc.gz',
+                       help='원본 HTML 아카이브 경로 (기본값: data_temp/raw_pages.warc.gz)')
+    parser.add_argument('--no-archive', action='store_true',
+                       help='가져온 페이지를 원본 HTML 아카이브에 기록하지 않음')
+    parser.add_argument('--from-archive', action='store_true',
+                       help='네트워크 대신 원본 HTML 아카이브에서 페이지를 읽어 다시 추출')
+    parser.add_argument('--enqueue', action='store_true',
+                       help='작업 큐 모드: 메트릭 목록을 SQLite 작업 큐에 등록')
+    parser.add_argument('--worker', action='store_true',
+                       help='작업 큐 모드: 큐에서 작업을 임대해 처리하는 워커로 실행 (여러 개 동시 실행 가능)')
+    parser.add_argument('--merge', action='store_true',
+                       help='작업 큐 모드: 큐의 결과를 모아 최종 파일로 저장')
+    parser.add_argument('--queue-db', default='data_temp/scrape_queue.db',
+                       help='작업 큐 SQLite 파일 (기본값: data_temp/scrape_queue.db)')
+    parser.add_argument('--reset-queue', action='store_true',
+                       help='--enqueue 시 기존 작업과 결과를 모두 지움')
+    parser.add_argument('--lease-seconds', type=float, default=300,
+                       help='워커가 작업을 임대하는 시간(초), 지나면 다른 워커에 재할당 (기본값: 300)')
+    parser.add_argument('--max-attempts', type=int, default=3,
+                       help='작업당 최대 시도 횟수 (기본값: 3)')
+    parser.add_argument('--worker-id', default=None,
+                       help='워커 ID (기본값: 호스트명:PID)')
+    args = parser.parse_args()
+    
+    mode = 'pipeline' if args.pipeline else 'async' if args.use_async else 'sync'
+    process_options = {
+        'mode': mode,
+        'batch_size': args.batch_size,
+        'resume': args.resume,
+        'concurrency': args.concurrency,
+        'fetch_workers': args.fetch_workers,
+        'parse_workers': args.parse_workers,
+        'queue_size': args.queue_size
+    }
+    
+    archive = None if args.no_archive and not args.from_archive else PageArchive(args.archive_file)
+    scraper_options = {
+        'use_cache': not args.no_cache,
+        'cache_ttl': args.cache_ttl,
+        'archive': archive,
+        'from_archive': args.from_archive
+    }
+    scraper = FinalScraper(**scraper_options, slim=True if args.slim else None)
+    
+    if args.enqueue or args.worker or args.merge:
+        work_queue = WorkQueue(args.queue_db, lease_seconds=args.lease_seconds, max_attempts=args.max_attempts)
+        
+        if args.enqueue:
+            base_data = scraper.load_base_metrics()
+            if not base_data:
+                print("❌ 기존 메트릭 데이터를 로드할 수 없습니다.")
+                return
+            added = work_queue.enqueue(base_data, reset=args.reset_queue)
+            print(f"📥 작업 큐에 {added}개 메트릭 등록: {args.queue_db}")
+        
+        if args.worker:
+            processed = scraper.process_queue(work_queue, worker_id=args.worker_id)
+            print(f"👷 워커 종료: {processed}개 처리")
+            telemetry.export()
+        
+        print(f"📊 큐 상태: {work_queue.stats()}")
+        if not args.merge:
+            work_queue.close()
+            return
+        
+        final_data = work_queue.merge()
+        work_queue.close()
+        total_metrics = len(final_data['metrics'])
+        save_and_report(final_data, total_metrics, archive)
+        return
     
     # 기존 데이터 로드
     print("🚀 전체 750개 IRIS+ 메트릭 상세 정보 수집 시작")
     print("⏱️  예상 소요 시간: 약 20-25분")
-    print("💾 배치별 중간 저장으로 안전하게 처리됩니다.")
+    print("💾 메트릭별 저널 기록으로 중단되어도 --resume으로 이어서 처리할 수 있습니다.")
+    if args.from_archive:
+        print(f"📦 아카이브 재추출 모드: {args.archive_file} ({len(archive)}개 페이지)")
     print()
     
+    if args.incremental:
+        # 최신 목록을 새로 수집해 기준 데이터로 사용
+        print("🔍 증분 모드: 메트릭 목록 새로 수집 중...")
+        list_scraper = IRISScraper(**scraper_options)
+        try:
+            fresh_metrics = list_scraper.scrape_all_pages()
+        except RuntimeError as e:
+            # 일부 페이지가 빠진 목록으로 진행하면 빠진 메트릭이 삭제된 것으로 처리되므로 중단
+            print(f"❌ {e}")
+            return
+        if not fresh_metrics:
+            print("❌ 메트릭 목록을 수집하지 못했습니다.")
+            return
+        list_scraper.save_to_json(fresh_metrics)
+    
     base_data = scraper.load_base_metrics()
     
     if not base_data:
@@ -26,18 +149,41 @@ def main():
     print(f"📊 처리할 메트릭: {total_metrics}개")
     
     # 전체 처리
-    final_data = scraper.process_all_metrics(base_data, batch_size=50)
+    if args.incremental:
+        previous_data = scraper.load_base_metrics(args.previous)
+        plan = scraper.process_incremental(base_data, previous_data, max_age_days=args.max_age_days,
+                                           reuse_details=not args.force_extract, **process_options)
+        final_data = base_data
+        report_filename = scraper.save_change_report(plan)
+        print(f"📝 변경 보고서: {report_filename}")
+        print(f"   신규 {len(plan['new'])}개, 변경 {len(plan['changed'])}개, 누락 {len(plan['missing'])}개, "
+              f"실패 {len(plan['failed'])}개, 오래됨 {len(plan['stale'])}개, 유지 {len(plan['unchanged'])}개, 삭제 {len(plan['removed'])}개")
+        print(f"   재수집했지만 내용이 같아 추출을 생략한 메트릭: {len(plan['content_unchanged'])}개")
+    else:
+        # 이전 결과와 내용이 같은 페이지는 파싱 없이 details 재사용
+        if not args.force_extract and Path(args.previous).exists():
+            scraper.set_previous_details(scraper.load_base_metrics(args.previous))
+        if mode == 'async':
+            print(f"⚡ 비동기 모드: 최대 {args.concurrency}개 동시 요청")
+        elif mode == 'pipeline':
+            print(f"⚡ 파이프라인 모드: 수집 스레드 {args.fetch_workers}개, 파싱 프로세스 {args.parse_workers or '코어 수만큼'}")
+        final_data = scraper.process_metrics(base_data, **process_options)
     
-    # 최종 저장
+    save_and_report(final_data, total_metrics, archive)
+
+def save_and_report(final_data, total_metrics, archive=None):
+    """최종 결과를 저장하고 통계를 출력합니다."""
+    # 최종 저장 (임시 파일 + 이름 변경으로 원자적 저장)
     final_filename = "data/iris_metrics_complete.json"
-    with open(final_filename, 'w', encoding='utf-8') as f:
-        json.dump(final_data, f, ensure_ascii=False, indent=2)
+    write_json_atomic(final_data, final_filename)
+    if archive is not None:
+        archive.close()
     
     # 결과 통계
     successful = sum(1 for m in final_data['metrics'] if m.get('details', {}).get('success', False))
     
     print(f"\n🎉 전체 수집 완료!")
-    print(f"📁 최종 파일: {final_filename}")
+    print(f"📁 최종 파일: {final_filename} ({Path(final_filename).stat().st_size / 1024 / 1024:.1f}MB)")
     print(f"📊 성공률: {successful}/{total_metrics}개 ({successful/total_metrics*100:.1f}%)")
     
     # 섹션별 통계
@@ -46,7 +192,7 @@ def main():
         if metric.get('details', {}).get('success', False):
             details = metric['details']
             for key in details:
-                if key not in ['success', 'scraped_at', 'error']:
+                if key not in ['success', 'scraped_at', 'error', 'content_hash', 'unchanged']:
                     if key not in section_stats:
                         section_stats[key] = 0
                     section_stats[key] += 1
@@ -54,6 +200,8 @@ def main():
     print(f"\n📋 섹션별 수집 통계:")
     for section, count in sorted(section_stats.items()):
         print(f"  {section}: {count}개")
+    
+    telemetry.export()
 
 if __name__ == "__main__":
     main()
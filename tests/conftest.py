@@ -0,0 +1,25 @@
+"""
+pytest 공통 설정
+저장소 루트를 import 경로와 작업 디렉터리로 맞추고(모듈들이 data_temp/ 상대 경로에 로그를 씀),
+로컬 픽스처 서버 호스트의 요청 간격을 없애는 픽스처를 제공합니다.
+"""
+import os
+import sys
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+from utils.rate_limiter import HostRateLimiter, rate_limiters  # noqa: E402
+
+@pytest.fixture
+def fast_rate_limit(monkeypatch):
+    """주어진 서버 호스트의 속도 제한기를 간격 없는 제한기로 바꾸는 함수를 반환합니다."""
+    def apply(base_url: str):
+        monkeypatch.setitem(rate_limiters.limiters, urlparse(base_url).netloc,
+                            HostRateLimiter(0.0, burst=1000))
+    return apply
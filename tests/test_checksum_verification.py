@@ -0,0 +1,71 @@
+"""구간 체크섬 검증 테스트 (로컬 PostgREST 스텁의 검증 함수 사용)"""
+import pytest
+
+from benchmarks.postgrest_stub import PostgrestStub
+from utils.convert_to_supabase import row_content_hash
+from utils.supabase_uploader import SupabaseUploader, bucket_checksum
+
+def make_metrics(count: int, version: str = 'v1'):
+    metrics = [{'data_id': f"PI{i:05d}", 'title': f"Metric {i} {version}"} for i in range(count)]
+    for metric in metrics:
+        metric['content_hash'] = row_content_hash(metric)
+    return metrics
+
+@pytest.fixture
+def stub():
+    with PostgrestStub() as stub:
+        yield stub
+
+@pytest.fixture
+def uploader(monkeypatch, stub):
+    monkeypatch.setenv('SUPABASE_URL', stub.base_url)
+    monkeypatch.setenv('SUPABASE_SERVICE_ROLE_KEY', 'test')
+    return SupabaseUploader()
+
+def load_remote(stub: PostgrestStub, metrics):
+    stub.tables['iris_metrics'] = {(m['data_id'],): dict(m) for m in metrics}
+
+def test_matching_data_is_verified_with_one_request(stub, uploader):
+    metrics = make_metrics(500)
+    load_remote(stub, metrics)
+
+    assert uploader.verify_checksums(metrics) == {'missing': [], 'extra': [], 'mismatched': [], 'requests': 1}
+    assert uploader.verify_upload(len(metrics), metrics)
+
+def test_drill_down_finds_each_differing_row(stub, uploader):
+    local = make_metrics(3000)
+    remote = [dict(m) for m in local if m['data_id'] != 'PI01234'] + make_metrics(3001)[3000:]
+    changed = make_metrics(2001, version='v2')[2000]
+    remote = [changed if m['data_id'] == changed['data_id'] else m for m in remote]
+    load_remote(stub, remote)
+
+    result = uploader.verify_checksums(local, leaf_rows=16)
+
+    assert (result['missing'], result['extra'], result['mismatched']) == (['PI01234'], ['PI03000'], ['PI02000'])
+    # 다른 구간만 내려가므로 행 수보다 훨씬 적은 요청으로 끝남
+    assert result['requests'] < 20
+    assert not uploader.verify_upload(len(local), local)
+
+def test_extra_rows_are_allowed_when_keeping_missing(stub, uploader):
+    local = make_metrics(100)
+    load_remote(stub, make_metrics(101))
+
+    assert not uploader.verify_upload(len(local), local)
+    assert uploader.verify_upload(len(local), local, allow_extra=True)
+
+def test_local_bucket_checksum_matches_server(stub):
+    metrics = make_metrics(50) + [{'data_id': 'PIé01', 'content_hash': None}, {'data_id': 'PIZ01', 'content_hash': 'x'}]
+    load_remote(stub, metrics)
+    remote = {row['bucket']: row for row in stub.rpc('iris_metrics_checksums', {'bucket_prefix': '', 'prefix_length': 0})}
+
+    rows = [(m['data_id'], m['content_hash'] or '') for m in metrics]
+    assert remote[''] == {'bucket': '', 'row_count': len(metrics), 'checksum': bucket_checksum(rows)}
+
+def test_falls_back_to_row_count_without_checksum_functions(stub, uploader, monkeypatch):
+    metrics = make_metrics(30)
+    load_remote(stub, make_metrics(30, version='v2'))
+    monkeypatch.setattr(stub, 'rpc', lambda name, args: None)
+
+    assert uploader.verify_checksums(metrics) is None
+    # 내용은 달라도 행 수만 비교
+    assert uploader.verify_upload(len(metrics), metrics)
@@ -0,0 +1,65 @@
+"""상세 페이지 content_hash로 파싱을 건너뛰는 재수집 테스트 (로컬 픽스처 서버 사용)"""
+import pytest
+
+import scrapers.final_scraper as final_scraper
+from benchmarks.fixture_server import FIXTURES_DIR, FixtureServer
+from scrapers.final_scraper import FinalScraper
+from utils.html_parsing import detail_content_hash
+
+def make_metrics(base_url: str, count: int):
+    return [{'title': f"Metric {i}", 'data_id': f"PI{i:04d}",
+             'detail_url': f"{base_url}/metric/5.3b/pi{i:04d}/"} for i in range(count)]
+
+@pytest.fixture
+def server(fast_rate_limit):
+    with FixtureServer() as server:
+        fast_rate_limit(server.base_url)
+        yield server
+
+def scrape(scraper: FinalScraper, metrics):
+    return [scraper.process_single_metric(dict(metric)) for metric in metrics]
+
+def test_unchanged_pages_reuse_previous_details_without_parsing(server, monkeypatch):
+    metrics = make_metrics(server.base_url, 4)
+    first = scrape(FinalScraper(use_cache=False), metrics)
+    assert all(m['details']['content_hash'] and m['details']['unchanged'] is False for m in first)
+
+    scraper = FinalScraper(use_cache=False)
+    assert scraper.set_previous_details({'metrics': first}) == len(metrics)
+    def no_parse(*args, **kwargs):
+        raise AssertionError("내용이 같은 페이지를 다시 파싱함")
+    monkeypatch.setattr(final_scraper, 'make_soup', no_parse)
+    second = scrape(scraper, metrics)
+
+    strip = lambda details: {k: v for k, v in details.items() if k not in ('scraped_at', 'unchanged')}
+    assert all(m['details']['unchanged'] for m in second)
+    assert [strip(m['details']) for m in second] == [strip(m['details']) for m in first]
+
+def test_changed_hash_or_extraction_version_reparses(server, monkeypatch):
+    metrics = make_metrics(server.base_url, 2)
+    first = scrape(FinalScraper(use_cache=False), metrics)
+    first[0]['details']['content_hash'] = 'stale'
+
+    scraper = FinalScraper(use_cache=False)
+    scraper.set_previous_details({'metrics': first})
+    assert [m['details']['unchanged'] for m in scrape(scraper, metrics)] == [False, True]
+
+    # 추출 로직 버전이 바뀌면 해시가 달라져 모두 다시 파싱
+    monkeypatch.setattr(FinalScraper, 'EXTRACTION_VERSION', '2')
+    reparsed = scrape(scraper, metrics)
+    assert [m['details']['unchanged'] for m in reparsed] == [False, False]
+    assert reparsed[1]['details']['content_hash'] != first[1]['details']['content_hash']
+
+def test_hash_covers_only_extracted_regions():
+    page = (FIXTURES_DIR / "detail_pi1653.html").read_bytes()
+    content_hash = detail_content_hash(page)
+
+    outside = page.replace(b'</body>', b'<script>var build = 42;</script></body>')
+    reflowed = page.replace(b'\n        <h1>', b'\r\n\t<h1>')
+    edited = page.replace(b'Client Individuals: Total(PI1653)', b'Client Individuals: Count(PI1653)')
+
+    assert reflowed != page and edited != page
+    assert detail_content_hash(outside) == content_hash
+    assert detail_content_hash(reflowed) == content_hash
+    assert detail_content_hash(edited) != content_hash
+    assert detail_content_hash(b'<html><body>no content</body></html>') is None
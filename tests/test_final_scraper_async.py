@@ -0,0 +1,50 @@
+"""FinalScraper 비동기 수집 모드 테스트 (로컬 픽스처 서버 사용)"""
+from benchmarks.fixture_server import FixtureServer
+from config.settings import SCRAPING_CONFIG
+from scrapers.final_scraper import FinalScraper
+from utils.scrape_journal import ScrapeJournal
+
+def make_metrics(base_url: str, count: int):
+    return [{'title': f"Metric {i}", 'data_id': f"PI{i:04d}",
+             'detail_url': f"{base_url}/metric/5.3b/pi{i:04d}/"} for i in range(count)]
+
+def test_async_results_keep_input_order(tmp_path, fast_rate_limit):
+    # 응답 지연을 무작위로 줘서 완료 순서가 입력 순서와 달라지게 함
+    with FixtureServer(jitter=0.05, seed=1) as server:
+        fast_rate_limit(server.base_url)
+        metrics = make_metrics(server.base_url, 16)
+        scraper = FinalScraper(use_cache=False)
+        result = scraper.process_all_metrics_async({'metrics': [dict(m) for m in metrics]}, concurrency=8,
+                                                   journal=ScrapeJournal(str(tmp_path / "journal.jsonl")))
+        expected = scraper.process_single_metric(dict(metrics[0]))
+
+    assert [m['data_id'] for m in result['metrics']] == [m['data_id'] for m in metrics]
+    assert all(m['details']['success'] for m in result['metrics'])
+    # 동기 처리와 같은 details 형태
+    assert set(result['metrics'][0]['details']) == set(expected['details'])
+
+def test_async_retries_server_errors(tmp_path, monkeypatch, fast_rate_limit):
+    monkeypatch.setitem(SCRAPING_CONFIG, 'retry_backoff', 0.0)
+    with FixtureServer(fail_first=2) as server:
+        fast_rate_limit(server.base_url)
+        metrics = make_metrics(server.base_url, 6)
+        scraper = FinalScraper(use_cache=False)
+        result = scraper.process_all_metrics_async({'metrics': metrics}, concurrency=3,
+                                                   journal=ScrapeJournal(str(tmp_path / "journal.jsonl")))
+
+    assert all(m['details']['success'] for m in result['metrics'])
+    assert server.error_count == 2 * len(metrics)
+    assert server.request_count == 3 * len(metrics)
+
+def test_async_gives_up_after_max_retries(tmp_path, monkeypatch, fast_rate_limit):
+    monkeypatch.setitem(SCRAPING_CONFIG, 'retry_backoff', 0.0)
+    with FixtureServer(fail_first=100) as server:
+        fast_rate_limit(server.base_url)
+        metrics = make_metrics(server.base_url, 2)
+        scraper = FinalScraper(use_cache=False)
+        max_retries = scraper.session.get_adapter(server.base_url).max_retries.total
+        result = scraper.process_all_metrics_async({'metrics': metrics}, concurrency=2,
+                                                   journal=ScrapeJournal(str(tmp_path / "journal.jsonl")))
+
+    assert [m['details']['error'] for m in result['metrics']] == ['Page load failed'] * 2
+    assert server.request_count == len(metrics) * (max_retries + 1)
@@ -0,0 +1,69 @@
+"""HTTPCache/CachingAdapter 재검증 테스트 (로컬 픽스처 서버 사용)"""
+import time
+from urllib.parse import urlparse
+
+from benchmarks.fixture_server import FixtureServer
+from utils.http_cache import HTTPCache, install_cache, served_from_cache, throttled_get
+from utils.http_client import create_session
+from utils.rate_limiter import HostRateLimiter, rate_limiters
+
+def cached_session(tmp_path, ttl=None):
+    session = create_session()
+    cache = install_cache(session, HTTPCache(str(tmp_path / "cache")), ttl=ttl)
+    return session, cache
+
+def test_stale_entry_is_revalidated_with_etag(tmp_path):
+    session, cache = cached_session(tmp_path)
+    with FixtureServer() as server:
+        url = f"{server.base_url}/metrics/?page=1"
+        first = session.get(url)
+        stored_at = cache.stored_at(url)
+        second = session.get(url)
+
+    assert 'X-Cache' not in first.headers
+    assert second.headers['X-Cache'] == 'REVALIDATED'
+    assert second.status_code == 200 and second.content == first.content
+    assert server.request_count == 2 and server.not_modified_count == 1
+    # 304로 저장 시각이 갱신되어 TTL이 다시 시작됨
+    assert cache.stored_at(url) >= stored_at
+
+def test_fresh_entry_is_served_without_request_or_rate_limit_wait(tmp_path, monkeypatch):
+    session, cache = cached_session(tmp_path, ttl=60)
+    with FixtureServer() as server:
+        url = f"{server.base_url}/metrics/?page=1"
+        session.get(url)
+        # 네트워크 요청이면 한참 기다려야 하는 제한기
+        limiter = HostRateLimiter(30.0)
+        limiter.reserve()
+        monkeypatch.setitem(rate_limiters.limiters, urlparse(url).netloc, limiter)
+
+        started = time.monotonic()
+        cached = throttled_get(session, url)
+        elapsed = time.monotonic() - started
+
+    assert served_from_cache(session, url)
+    assert not served_from_cache(session, f"{server.base_url}/metrics/?page=2")
+    assert cached.headers['X-Cache'] == 'HIT'
+    assert server.request_count == 1
+    assert elapsed < 1.0
+
+def test_expired_entry_falls_back_to_revalidation(tmp_path, fast_rate_limit):
+    session, cache = cached_session(tmp_path, ttl=0)
+    with FixtureServer() as server:
+        fast_rate_limit(server.base_url)
+        url = f"{server.base_url}/metric/5.3b/PI1234/"
+        throttled_get(session, url)
+        revalidated = throttled_get(session, url)
+
+    assert revalidated.headers['X-Cache'] == 'REVALIDATED'
+    assert server.not_modified_count == 1
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = HTTPCache(str(tmp_path / "cache"), max_bytes=2500)
+    for name in ('a', 'b', 'c'):
+        cache.put(f"http://cache.test/{name}", 200, {'ETag': name}, b'x' * 1000)
+        time.sleep(0.01)
+
+    assert cache.get("http://cache.test/a") is None
+    assert cache.get("http://cache.test/c")['body'] == b'x' * 1000
+    assert cache.total_bytes <= 2500
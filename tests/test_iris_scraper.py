@@ -0,0 +1,65 @@
+"""IRISScraper 목록 페이지 수집 테스트 (페이지 HTML을 직접 만들어 사용)"""
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from bs4 import BeautifulSoup
+
+from config.settings import SCRAPING_CONFIG
+from scrapers.iris_scraper import IRISScraper
+
+PER_PAGE = 3
+
+def listing_soup(page_num: int, pagination: str = '') -> BeautifulSoup:
+    links = ''.join(f'<a href="/metric/pi{n}/">Metric {n} <span class="id" data-id="PI{n}">(PI{n})</span></a>'
+                    for n in range((page_num - 1) * PER_PAGE, page_num * PER_PAGE))
+    return BeautifulSoup(f'<div class="catalog-list">{links}</div>{pagination}', 'html.parser')
+
+def page_number(url: str) -> int:
+    return int(parse_qs(urlparse(url).query)['page'][0])
+
+@pytest.fixture
+def scraper():
+    scraper = IRISScraper(base_url='http://listing.test', use_cache=False)
+    scraper.requested = []
+    return scraper
+
+def serve(scraper: IRISScraper, page_for):
+    """get_page_content를 페이지 번호 → soup 함수로 바꿉니다."""
+    def get_page_content(url, parse_only=None):
+        scraper.requested.append(page_number(url))
+        return page_for(page_number(url))
+    scraper.get_page_content = get_page_content
+
+def test_unknown_page_count_stops_when_clamped_page_repeats(scraper):
+    # 범위를 넘는 ?page=N에 마지막 페이지를 다시 주는 페이지네이터
+    serve(scraper, lambda page: listing_soup(min(page, 4)))
+    metrics = scraper.scrape_all_pages()
+
+    assert len(metrics) == 4 * PER_PAGE
+    assert scraper.requested == [1, 2, 3, 4, 5]
+
+def test_unknown_page_count_stops_on_empty_page(scraper):
+    serve(scraper, lambda page: listing_soup(page) if page <= 2 else BeautifulSoup('<div class="catalog-list"></div>', 'html.parser'))
+    assert len(scraper.scrape_all_pages()) == 2 * PER_PAGE
+    assert scraper.requested == [1, 2, 3]
+
+def test_unknown_page_count_is_capped(scraper, monkeypatch):
+    monkeypatch.setitem(SCRAPING_CONFIG, 'max_listing_pages', 5)
+    serve(scraper, listing_soup)
+    assert len(scraper.scrape_all_pages()) == 5 * PER_PAGE
+    assert scraper.requested == [1, 2, 3, 4, 5]
+
+def test_failed_pages_are_retried_then_reported(scraper):
+    pagination = '<ul class="pagination"><a href="?page=2">2</a><a href="?page=4">4</a></ul>'
+    serve(scraper, lambda page: None if page == 3 and scraper.requested.count(3) == 1 else listing_soup(page, pagination))
+    assert len(scraper.scrape_all_pages()) == 4 * PER_PAGE
+
+    serve(scraper, lambda page: None if page == 3 else listing_soup(page, pagination))
+    with pytest.raises(RuntimeError, match=r'\[3\]'):
+        scraper.scrape_all_pages(page_retries=1)
+
+def test_page_count_is_read_only_from_pagination(scraper):
+    outside = '<a href="/metrics/?page=99&sort=name">sort</a>'
+    assert scraper.detect_total_pages(BeautifulSoup(outside, 'html.parser')) is None
+    pagination = outside + '<nav class="pagination"><a href="?page=2">2</a><a href="?page=7">7</a></nav>'
+    assert scraper.detect_total_pages(BeautifulSoup(pagination, 'html.parser')) == 7
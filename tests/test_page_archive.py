@@ -0,0 +1,52 @@
+"""PageArchive 기록/재생 테스트"""
+import multiprocessing
+
+from utils.page_archive import PageArchive
+
+def test_interleaved_writers_keep_offsets_valid(tmp_path):
+    path = str(tmp_path / "pages.warc.gz")
+    first, second = PageArchive(path), PageArchive(path)
+
+    first.write('http://example.test/a', 200, {}, b'page a')
+    second.write('http://example.test/b', 200, {}, b'page b')
+    first.write('http://example.test/c', 200, {}, b'page c')
+    first.close()
+    second.close()
+
+    # 두 인스턴스가 남긴 인덱스를 새로 읽어도, 인덱스 없이 재구성해도 모든 레코드를 읽을 수 있어야 함
+    for archive in (PageArchive(path), PageArchive(path, index_filename=str(tmp_path / "rebuilt.idx"))):
+        assert [archive.read_body(f"http://example.test/{name}") for name in 'abc'] == [b'page a', b'page b', b'page c']
+
+def test_redirected_record_is_found_by_request_and_final_url(tmp_path):
+    path = str(tmp_path / "pages.warc.gz")
+    archive = PageArchive(path)
+    archive.write('http://example.test/m', 200, {'Content-Type': 'text/html'}, b'body',
+                  final_url='http://example.test/m/')
+    archive.close()
+
+    reloaded = PageArchive(path)
+    assert reloaded.read_body('http://example.test/m') == b'body'
+    assert reloaded.read_body('http://example.test/m/') == b'body'
+    assert reloaded.read('http://example.test/m')['headers']['Content-Type'] == 'text/html'
+
+def write_pages(path: str, worker: str, count: int):
+    archive = PageArchive(path)
+    for i in range(count):
+        archive.write(f"http://example.test/{worker}/{i}", 200, {}, f"{worker} page {i}".encode() * 50)
+    archive.close()
+
+def test_worker_processes_share_one_archive(tmp_path):
+    # run_full_scraping.py --worker 프로세스들은 같은 아카이브 파일에 동시에 기록함
+    path = str(tmp_path / "pages.warc.gz")
+    workers = [multiprocessing.Process(target=write_pages, args=(path, worker, 40)) for worker in ('w1', 'w2', 'w3')]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    assert all(process.exitcode == 0 for process in workers)
+
+    archive = PageArchive(path)
+    assert len(archive) == 120
+    for worker in ('w1', 'w2', 'w3'):
+        for i in range(40):
+            assert archive.read_body(f"http://example.test/{worker}/{i}") == f"{worker} page {i}".encode() * 50
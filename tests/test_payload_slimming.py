@@ -0,0 +1,75 @@
+"""슬림 페이로드 테스트 (로컬 픽스처 서버에서 수집한 상세 섹션 사용)"""
+import re
+
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from scrapers.final_scraper import FinalScraper
+from utils.payload_slimming import payload_bytes, section_text, slim_section_content, slim_sections, stage_report
+
+@pytest.fixture(scope='module')
+def scraped():
+    """픽스처 서버의 상세 페이지 세 종류를 슬림 모드 없이 수집한 결과"""
+    with FixtureServer() as server:
+        scraper = FinalScraper(use_cache=False)
+        metrics = [{'title': f"Metric {code}", 'data_id': code.upper(),
+                    'detail_url': f"{server.base_url}/metric/5.3b/{code}/"} for code in ('pi1653', 'oi8060', 'od4108')]
+        return {'metrics': [scraper.process_single_metric(metric) for metric in metrics]}
+
+def section_contents(data):
+    """데이터 안의 모든 섹션 내용을 순서대로 반환합니다."""
+    if isinstance(data, list):
+        return [content for item in data for content in section_contents(item)]
+    if not isinstance(data, dict):
+        return []
+    if isinstance(data.get('content'), dict):
+        return [data['content']]
+    return [content for value in data.values() for content in section_contents(value)]
+
+def words(text: str) -> set:
+    # raw_text는 요소 사이에 공백 없이 붙어 있을 수 있어 단어 단위로 비교
+    return set(re.findall(r'\w+', text))
+
+def test_slim_section_drops_raw_text_duplicates_and_empty_values():
+    content = {
+        'headings': [{'level': 'h3', 'text': 'Usage'}],
+        'paragraphs': ['First.', 'Second.', 'First.'],
+        'lists': [{'type': 'ul', 'items': ['a', 'b']}, {'type': 'ol', 'items': []}],
+        'other_elements': [{'tag': 'div', 'text': 'Second.'}, {'tag': 'span', 'text': 'Extra', 'class': ''}],
+        'raw_text': 'Usage First. Second. a b Extra',
+        'note': 'kept',
+        'empty': []
+    }
+    assert slim_section_content(content) == {
+        'headings': [{'level': 'h3', 'text': 'Usage'}],
+        'paragraphs': ['First.', 'Second.'],
+        'lists': [{'type': 'ul', 'items': ['a', 'b']}],
+        'other_elements': [{'tag': 'span', 'text': 'Extra'}],
+        'note': 'kept'
+    }
+
+def test_slim_sections_keep_every_word_and_shrink_payload(scraped):
+    slim = slim_sections(scraped)
+    full_contents, slim_contents = section_contents(scraped), section_contents(slim)
+
+    assert full_contents and len(full_contents) == len(slim_contents)
+    for full, slimmed in zip(full_contents, slim_contents):
+        assert 'raw_text' not in slimmed
+        assert words(section_text(slimmed)) == words(section_text(full))
+    assert payload_bytes(slim) < payload_bytes(scraped)
+    # 이미 슬림한 데이터는 그대로
+    assert slim_sections(slim) == slim
+
+def test_slim_scraper_matches_slimmed_full_scrape(scraped):
+    with FixtureServer() as server:
+        metric = {'title': 'Metric pi1653', 'data_id': 'PI1653', 'detail_url': f"{server.base_url}/metric/5.3b/pi1653/"}
+        slim = FinalScraper(use_cache=False, slim=True).process_single_metric(metric)
+
+    strip = lambda details: {k: v for k, v in details.items() if k != 'scraped_at'}
+    assert strip(slim['details']) == strip(slim_sections(scraped['metrics'][0]['details']))
+
+def test_stage_report_shows_savings_at_every_stage(scraped):
+    report = stage_report(scraped)
+    assert set(report) == {'scraped', 'converted', 'upload'}
+    for row in report.values():
+        assert row['saved_bytes'] == row['before_bytes'] - row['after_bytes'] > 0
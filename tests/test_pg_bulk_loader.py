@@ -0,0 +1,109 @@
+"""PostgresBulkLoader COPY + 병합 테스트 (DATABASE_URL이 설정된 경우에만 실행)
+테스트마다 임시 스키마를 만들고 search_path로 지정해 기존 테이블은 건드리지 않습니다."""
+import os
+import uuid
+from urllib.parse import quote
+
+import pytest
+
+psycopg = pytest.importorskip('psycopg')
+
+from utils.pg_bulk_loader import PostgresBulkLoader  # noqa: E402
+
+DATABASE_URL = os.getenv('DATABASE_URL')
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason='DATABASE_URL이 설정되지 않음')
+
+SCHEMA_SQL = """
+CREATE TABLE iris_metrics (
+    id SERIAL PRIMARY KEY,
+    data_id VARCHAR(20) UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    content_hash VARCHAR(64),
+    sections JSONB
+);
+CREATE TABLE iris_metric_sdg_goals (
+    data_id VARCHAR(20) NOT NULL REFERENCES iris_metrics(data_id) ON DELETE CASCADE,
+    sdg_goal INTEGER NOT NULL,
+    PRIMARY KEY (data_id, sdg_goal)
+);
+CREATE TABLE sdg_goals (
+    id SERIAL PRIMARY KEY,
+    goal_number INTEGER UNIQUE NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE TABLE sdg_indicators (
+    id SERIAL PRIMARY KEY,
+    indicator_id VARCHAR(50) UNIQUE NOT NULL,
+    goal_id INTEGER REFERENCES sdg_goals(id),
+    title TEXT NOT NULL
+);
+"""
+
+@pytest.fixture
+def database_url():
+    """임시 스키마를 search_path로 쓰는 접속 URL (테스트가 끝나면 스키마 삭제)"""
+    schema = f"test_copy_{uuid.uuid4().hex[:8]}"
+    with psycopg.connect(DATABASE_URL, autocommit=True) as connection:
+        connection.execute(f'CREATE SCHEMA "{schema}"')
+        connection.execute(f'SET search_path TO "{schema}"')
+        connection.execute(SCHEMA_SQL)
+    separator = '&' if '?' in DATABASE_URL else '?'
+    yield f"{DATABASE_URL}{separator}options={quote(f'-csearch_path={schema}')}"
+    with psycopg.connect(DATABASE_URL, autocommit=True) as connection:
+        connection.execute(f'DROP SCHEMA "{schema}" CASCADE')
+
+def fetch(database_url: str, query: str):
+    with psycopg.connect(database_url) as connection:
+        return connection.execute(query).fetchall()
+
+def metric(data_id: str, title: str, sections=None):
+    return {'data_id': data_id, 'title': title, 'content_hash': f"hash-{title}", 'sections': sections}
+
+def test_merge_updates_inserts_and_deletes(database_url):
+    loader = PostgresBulkLoader(database_url)
+    loader.load_table('iris_metrics', [metric('PI1', 'a'), metric('PI2', 'b'), metric('PI3', 'c')])
+    ids_before = dict(fetch(database_url, "SELECT data_id, id FROM iris_metrics"))
+
+    counts = loader.load_table('iris_metrics', [metric('PI1', 'a'), metric('PI2', 'b2', {'x': [1, 2]}),
+                                                metric('PI4', 'd')], delete_missing=True)
+
+    assert (counts['updated'], counts['inserted'], counts['deleted'], counts['staged']) == (1, 1, 1, 3)
+    rows = fetch(database_url, "SELECT data_id, title, sections FROM iris_metrics ORDER BY data_id")
+    assert rows == [('PI1', 'a', None), ('PI2', 'b2', {'x': [1, 2]}), ('PI4', 'd', None)]
+    # 내용이 같은 행은 건드리지 않고, 바뀐 행도 serial id는 그대로
+    ids_after = dict(fetch(database_url, "SELECT data_id, id FROM iris_metrics"))
+    assert ids_after['PI1'] == ids_before['PI1'] and ids_after['PI2'] == ids_before['PI2']
+
+def test_merge_keeps_missing_rows_and_last_duplicate(database_url):
+    loader = PostgresBulkLoader(database_url)
+    loader.load_table('iris_metrics', [metric('PI1', 'a'), metric('PI2', 'b')])
+
+    counts = loader.load_table('iris_metrics', [metric('PI1', 'old'), metric('PI1', 'new')])
+
+    assert (counts['updated'], counts['inserted'], counts['deleted']) == (1, 0, 0)
+    assert fetch(database_url, "SELECT data_id, title FROM iris_metrics ORDER BY data_id") == [('PI1', 'new'), ('PI2', 'b')]
+
+def test_failed_table_rolls_back_whole_load(database_url):
+    loader = PostgresBulkLoader(database_url)
+    loader.load_table('iris_metrics', [metric('PI1', 'a')])
+
+    with pytest.raises(psycopg.errors.ForeignKeyViolation):
+        loader.load_tables([('iris_metrics', [metric('PI1', 'changed')]),
+                            ('iris_metric_sdg_goals', [{'data_id': 'PI9', 'sdg_goal': 1}])])
+
+    assert fetch(database_url, "SELECT title FROM iris_metrics") == [('a',)]
+
+def test_goal_numbers_resolve_to_goal_ids(database_url):
+    with psycopg.connect(database_url) as connection:
+        # serial id와 목표 번호가 어긋나도록 삽입 순서를 섞음
+        connection.execute("INSERT INTO sdg_goals (goal_number, title) VALUES (3, 'c'), (1, 'a')")
+
+    PostgresBulkLoader(database_url).load_table('sdg_indicators', [
+        {'indicator_id': '1.1.1', 'goal_number': 1, 'title': 'x'},
+        {'indicator_id': '3.1.1', 'goal_number': 3, 'title': 'y'},
+        {'indicator_id': '9.1.1', 'goal_number': 9, 'title': 'z'}
+    ])
+
+    rows = fetch(database_url, "SELECT i.indicator_id, g.goal_number FROM sdg_indicators i "
+                               "LEFT JOIN sdg_goals g ON g.id = i.goal_id ORDER BY 1")
+    assert rows == [('1.1.1', 1), ('3.1.1', 3), ('9.1.1', None)]
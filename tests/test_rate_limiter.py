@@ -0,0 +1,76 @@
+"""HostRateLimiter 토큰 버킷 백오프/회복 테스트 (가짜 시계 사용)"""
+import pytest
+
+import utils.rate_limiter as rate_limiter
+from benchmarks.fixture_server import FixtureServer
+from utils.http_client import create_session
+from utils.rate_limiter import HostRateLimiter, RateLimiterRegistry, parse_retry_after
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', clock)
+    return clock
+
+def test_bucket_spaces_requests_after_burst(clock):
+    limiter = HostRateLimiter(0.5, burst=2)
+    assert [limiter.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+    clock.now += 1.0
+    # 1초 동안 토큰 2개가 채워져 밀린 예약만큼 갚음
+    assert limiter.reserve() == pytest.approx(0.5)
+
+def test_throttle_halves_rate_and_blocks_for_retry_after(clock):
+    limiter = HostRateLimiter(1.0)
+    limiter.record(429, 0.1, retry_after='5')
+
+    assert limiter.current_delay == pytest.approx(2.0)
+    # 차단 구간 5초 + 줄어든 속도로 토큰 하나를 채우는 2초
+    assert limiter.reserve() == pytest.approx(7.0)
+
+    limiter.record(503, 0.1)
+    limiter.record(None, 0.1)
+    assert limiter.current_delay == pytest.approx(2.0 / 0.5 / 0.75)
+
+def test_fast_successes_recover_rate_up_to_limit(clock):
+    limiter = HostRateLimiter(1.0, increase_after=2, max_speedup=1.2)
+    limiter.record(200, 0.1)
+    limiter.record(500, 0.1)
+    limiter.record(200, 0.1)
+    assert limiter.rate == pytest.approx(0.75)
+
+    for _ in range(40):
+        limiter.record(200, 0.1)
+    assert limiter.rate == pytest.approx(1.2)
+
+@pytest.mark.parametrize('status,elapsed,recovered', [
+    (304, 0.1, True),
+    (200, 5.0, False),
+    (404, 0.1, False),
+])
+def test_only_fast_success_or_not_modified_extends_streak(clock, status, elapsed, recovered):
+    limiter = HostRateLimiter(1.0, increase_after=2)
+    limiter.record(200, 0.1)
+    limiter.record(status, elapsed)
+    assert (limiter.rate > 1.0) is recovered
+
+def test_retry_after_accepts_http_dates():
+    assert parse_retry_after('12') == 12.0
+    assert parse_retry_after('Thu, 01 Jan 1970 00:00:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
+
+def test_registry_backs_off_only_the_throttled_host():
+    registry = RateLimiterRegistry(default_delay=0.01)
+    with FixtureServer(error_rate=1.0, error_status=503) as server:
+        response = create_session().get(f"{server.base_url}/metrics/?page=1")
+        registry.record_response(response.url, response)
+
+    assert response.status_code == 503
+    assert registry.get(server.base_url).rate < registry.get('http://other.test').rate
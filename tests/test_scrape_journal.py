@@ -0,0 +1,57 @@
+"""ScrapeJournal 재개 테스트 (비정상 종료 후 --resume, 로컬 픽스처 서버 사용)"""
+import json
+
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from scrapers.final_scraper import FinalScraper
+from utils.scrape_journal import ScrapeJournal
+
+def make_metrics(base_url: str, count: int):
+    return [{'title': f"Metric {i}", 'data_id': f"PI{i:04d}",
+             'detail_url': f"{base_url}/metric/5.3b/pi{i:04d}/"} for i in range(count)]
+
+def crash_after(scraper: FinalScraper, metrics, journal: ScrapeJournal, done: int):
+    """앞의 done개를 처리한 뒤 다음 메트릭은 실패로, 그다음은 쓰다 만 줄로 남긴 저널을 만듭니다."""
+    scraper.process_all_metrics({'metrics': [dict(m) for m in metrics[:done]]}, journal=journal)
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(scraper.build_failed_metric(dict(metrics[done]), 'Page load failed')) + '\n')
+        f.write(json.dumps(dict(metrics[done + 1]))[:20])
+
+@pytest.mark.parametrize('mode', ['sync', 'async', 'pipeline'])
+def test_resume_skips_only_successful_journal_records(tmp_path, fast_rate_limit, mode):
+    journal = ScrapeJournal(str(tmp_path / "journal.jsonl"))
+    with FixtureServer() as server:
+        fast_rate_limit(server.base_url)
+        metrics = make_metrics(server.base_url, 6)
+        scraper = FinalScraper(use_cache=False)
+        crash_after(scraper, metrics, journal, 3)
+        first_run_requests = server.request_count
+
+        base_data = {'metrics': [dict(m) for m in metrics]}
+        if mode == 'sync':
+            result = scraper.process_all_metrics(base_data, batch_size=2, journal=journal, resume=True)
+        elif mode == 'async':
+            result = scraper.process_all_metrics_async(base_data, concurrency=2, journal=journal, resume=True)
+        else:
+            result = scraper.process_all_metrics_pipelined(base_data, fetch_workers=2, parse_workers=1,
+                                                           journal=journal, resume=True)
+
+    # 실패 기록과 잘린 줄의 메트릭, 저널에 없던 메트릭만 다시 가져옴
+    assert server.request_count - first_run_requests == 3
+    assert [m['data_id'] for m in result['metrics']] == [m['data_id'] for m in metrics]
+    assert all(m['details']['success'] for m in result['metrics'])
+    records = journal.load()
+    assert sorted(records) == [m['data_id'] for m in metrics]
+    assert all(record['details']['success'] for record in records.values())
+
+def test_fresh_run_truncates_previous_journal(tmp_path, fast_rate_limit):
+    journal = ScrapeJournal(str(tmp_path / "journal.jsonl"))
+    with FixtureServer() as server:
+        fast_rate_limit(server.base_url)
+        metrics = make_metrics(server.base_url, 4)
+        scraper = FinalScraper(use_cache=False)
+        crash_after(scraper, metrics, journal, 2)
+        scraper.process_all_metrics({'metrics': [dict(m) for m in metrics[:1]]}, journal=journal)
+
+    assert list(journal.load()) == ['PI0000']
@@ -0,0 +1,128 @@
+"""SupabaseUploader 배치 업로드/동기화 테스트 (로컬 PostgREST 스텁 사용)"""
+import pytest
+
+from benchmarks.postgrest_stub import PostgrestStub
+from config.settings import UPLOAD_CONFIG
+from utils.convert_to_supabase import row_content_hash
+from utils.supabase_uploader import SupabaseUploader
+from utils.upload_ledger import UploadLedger
+
+def make_metrics(count: int, version: str = 'v1'):
+    metrics = [{'data_id': f"PI{i:04d}", 'title': f"Metric {i} {version}", 'definition': 'x' * 150}
+               for i in range(count)]
+    for metric in metrics:
+        metric['content_hash'] = row_content_hash(metric)
+    return metrics
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setitem(UPLOAD_CONFIG, 'retry_backoff', 0.0)
+    monkeypatch.setitem(UPLOAD_CONFIG, 'max_retries', 8)
+
+def start_uploader(monkeypatch, stub: PostgrestStub) -> SupabaseUploader:
+    monkeypatch.setenv('SUPABASE_URL', stub.base_url)
+    monkeypatch.setenv('SUPABASE_SERVICE_ROLE_KEY', 'test')
+    return SupabaseUploader()
+
+def test_oversized_batches_are_split_until_they_fit(monkeypatch, no_backoff):
+    metrics = make_metrics(120)
+    with PostgrestStub(max_body_bytes=4 * 1024) as stub:
+        uploader = start_uploader(monkeypatch, stub)
+        uploaded = uploader.post_rows('iris_metrics', metrics, target_bytes=64 * 1024)
+
+    assert uploaded == len(metrics)
+    assert stub.stats['too_large'] > 0
+    assert sorted(key[0] for key in stub.tables['iris_metrics']) == [m['data_id'] for m in metrics]
+
+@pytest.mark.parametrize('statuses', [(429,), (500, 502, 503, 504)])
+def test_throttled_and_failed_batches_are_retried(monkeypatch, no_backoff, statuses):
+    metrics = make_metrics(200)
+    with PostgrestStub(error_rate=0.3, error_statuses=statuses, seed=7) as stub:
+        uploader = start_uploader(monkeypatch, stub)
+        uploaded = uploader.post_rows('iris_metrics', metrics, max_rows=25, on_conflict='data_id')
+
+    assert uploaded == len(metrics)
+    assert stub.stats['errors'] > 0
+    assert len(stub.tables['iris_metrics']) == len(metrics)
+
+def test_sync_upserts_changed_rows_and_deletes_missing(monkeypatch, tmp_path):
+    remote = make_metrics(10)
+    local = remote[:6] + make_metrics(8, version='v2')[6:8] + make_metrics(12)[10:12]
+    with PostgrestStub() as stub:
+        stub.tables['iris_metrics'] = {(row['data_id'],): dict(row) for row in remote}
+        uploader = start_uploader(monkeypatch, stub)
+        uploader.ledger = UploadLedger(str(tmp_path / "ledger.jsonl"), str(tmp_path / "dead_letter.jsonl"))
+        uploader.ledger.open()
+        result = uploader.sync_metrics([dict(m) for m in local])
+        uploader.ledger.close()
+        rows_written = stub.stats['rows_written']
+
+        # 동기화 직후 이어가기는 올릴 행이 없어야 함
+        uploader.ledger.open(resume=True)
+        resumed = uploader.resume_upload([dict(m) for m in local])
+        uploader.ledger.close()
+
+    assert result == {'new': 2, 'changed': 2, 'unchanged': 6, 'removed': 2, 'upserted': 4, 'deleted': 2,
+                      'fact_tables': {}}
+    assert rows_written == 4
+    assert stub.tables['iris_metrics'] == {(m['data_id'],): m for m in local}
+    assert resumed['pending'] == 0
+
+def category_rows(categories):
+    return [{'data_id': data_id, 'impact_category': category}
+            for data_id, values in categories.items() for category in values]
+
+def test_fact_rows_are_upserted_before_stale_rows_are_deleted(monkeypatch):
+    remote = {'PI0000': ['Water', 'Energy'], 'PI0001': ['Water'], 'PI0002': ['Land'], 'PI0009': ['Water']}
+    local = {'PI0000': ['Water', 'Climate'], 'PI0002': ['Land']}
+    table = 'iris_metric_impact_categories'
+    with PostgrestStub() as stub:
+        stub.tables[table] = {(row['data_id'], row['impact_category']): row for row in category_rows(remote)}
+        uploader = start_uploader(monkeypatch, stub)
+        result = uploader.upload_fact_tables({table: category_rows(local)}, ['PI0000', 'PI0001', 'PI0002'])
+
+    assert result == {table: {'uploaded': 3, 'failed': 0, 'stale_failed': 0}}
+    # 범위 밖의 PI0009는 그대로, PI0001은 카테고리가 모두 빠져 삭제
+    assert sorted(stub.tables[table]) == [('PI0000', 'Climate'), ('PI0000', 'Water'),
+                                          ('PI0002', 'Land'), ('PI0009', 'Water')]
+
+def test_metrics_with_failed_fact_rows_keep_their_old_rows(monkeypatch):
+    remote = {'PI0000': ['Water', 'Energy'], 'PI0002': ['Soil']}
+    table = 'iris_metric_impact_categories'
+    # PI0000의 두 번째 행은 키가 비어 있어 서버가 거절
+    local = category_rows({'PI0000': ['Climate', None], 'PI0002': ['Land']})
+    with PostgrestStub() as stub:
+        stub.tables[table] = {(row['data_id'], row['impact_category']): row for row in category_rows(remote)}
+        uploader = start_uploader(monkeypatch, stub)
+        result = uploader.upload_fact_tables({table: local}, ['PI0000', 'PI0002'])
+
+    assert result == {table: {'uploaded': 2, 'failed': 1, 'stale_failed': 1}}
+    assert sorted(stub.tables[table]) == [('PI0000', 'Climate'), ('PI0000', 'Energy'),
+                                          ('PI0000', 'Water'), ('PI0002', 'Land')]
+
+def test_failed_fact_upload_keeps_existing_rows_and_is_reported(monkeypatch, tmp_path):
+    monkeypatch.setitem(UPLOAD_CONFIG, 'retry_backoff', 0.0)
+    monkeypatch.setitem(UPLOAD_CONFIG, 'max_retries', 1)
+    remote = {'PI0000': ['Water', 'Energy']}
+    table = 'iris_metric_impact_categories'
+    with PostgrestStub(error_rate=1.0, error_statuses=(503,)) as stub:
+        stub.tables[table] = {(row['data_id'], row['impact_category']): row for row in category_rows(remote)}
+        uploader = start_uploader(monkeypatch, stub)
+        uploader.ledger = UploadLedger(str(tmp_path / "ledger.jsonl"), str(tmp_path / "dead_letter.jsonl"))
+        uploader.ledger.open()
+        result = uploader.upload_fact_tables({table: category_rows({'PI0000': ['Climate']})}, ['PI0000'])
+        uploader.ledger.close()
+        kept = sorted(stub.tables[table])
+        dead_letter = (tmp_path / "dead_letter.jsonl").read_text(encoding='utf-8')
+
+        # 서버가 회복되면 --resume이 실패한 메트릭의 행을 다시 올리고 예전 행을 정리
+        stub.error_rate = 0.0
+        uploader.ledger.open(resume=True)
+        resumed = uploader.resume_upload([], {table: category_rows({'PI0000': ['Climate']})})
+        uploader.ledger.close()
+
+    assert result == {table: {'uploaded': 0, 'failed': 1, 'stale_failed': 1}}
+    assert kept == [('PI0000', 'Energy'), ('PI0000', 'Water')]
+    assert '"PI0000|Climate"' in dead_letter
+    assert resumed[table] == 1
+    assert sorted(stub.tables[table]) == [('PI0000', 'Climate')]
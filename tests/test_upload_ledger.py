@@ -0,0 +1,98 @@
+"""UploadLedger 재개/dead-letter 테스트 (로컬 PostgREST 스텁 사용)"""
+import json
+
+import pytest
+
+from benchmarks.postgrest_stub import PostgrestStub
+from config.settings import UPLOAD_CONFIG
+from utils.convert_to_supabase import row_content_hash
+from utils.supabase_uploader import SupabaseUploader
+from utils.upload_ledger import UploadLedger
+
+def make_metrics(count: int, version: str = 'v1'):
+    metrics = [{'data_id': f"PI{i:04d}", 'title': f"Metric {i} {version}"} for i in range(count)]
+    for metric in metrics:
+        metric['content_hash'] = row_content_hash(metric)
+    return metrics
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = UploadLedger(str(tmp_path / "ledger.jsonl"), str(tmp_path / "dead_letter.jsonl"))
+    yield ledger
+    ledger.close()
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines() if line.strip()]
+
+def test_pending_tracks_last_result_and_content(ledger):
+    metrics = make_metrics(4)
+    ledger.open()
+    ledger.record('iris_metrics', metrics[:3], 201, '1/1')
+    ledger.record('iris_metrics', metrics[2:], 503, '2/2', 'unavailable')
+    ledger.close()
+
+    assert [m['data_id'] for m in ledger.pending('iris_metrics', metrics)] == ['PI0002', 'PI0003']
+    # 내용이 바뀐 행은 성공 기록이 있어도 다시 올림
+    changed = make_metrics(4, version='v2')
+    assert len(ledger.pending('iris_metrics', changed)) == 4
+    assert ledger.counts == {'ok': 3, 'failed': 2}
+
+def test_dead_letter_is_kept_only_when_resuming(ledger):
+    metrics = make_metrics(2)
+    ledger.open()
+    ledger.record('iris_metrics', metrics[:1], 400, '1/1', '{"message": "bad row"}')
+    ledger.close()
+    dead = read_jsonl(ledger.dead_letter_path)
+    assert [(entry['key'], entry['error'], entry['row']) for entry in dead] == \
+        [('PI0000', '{"message": "bad row"}', metrics[0])]
+
+    ledger.open(resume=True)
+    ledger.close()
+    assert len(read_jsonl(ledger.dead_letter_path)) == 1
+
+    ledger.open()
+    ledger.close()
+    assert read_jsonl(ledger.dead_letter_path) == []
+    # 원장은 새 실행에서도 지우지 않음
+    assert len(read_jsonl(ledger.path)) == 1
+
+def test_torn_last_line_is_skipped_and_terminated(ledger):
+    metrics = make_metrics(3)
+    ledger.open()
+    ledger.record('iris_metrics', metrics[:1], 201, '1/1')
+    ledger.close()
+    with open(ledger.path, 'a', encoding='utf-8') as f:
+        f.write('{"table": "iris_metrics", "key": "PI00')
+
+    ledger.open(resume=True)
+    ledger.record('iris_metrics', metrics[1:2], 201, '1/1')
+    ledger.close()
+
+    assert sorted(key for _, key in ledger.load()) == ['PI0000', 'PI0001']
+
+def test_resume_uploads_only_failed_rows(monkeypatch, ledger):
+    monkeypatch.setitem(UPLOAD_CONFIG, 'retry_backoff', 0.0)
+    metrics = make_metrics(20)
+    # 기본 키가 빠진 행은 서버가 배치째 거절하므로 그 행만 골라 실패 처리되어야 함
+    broken = [dict(m) for m in metrics]
+    broken[7]['data_id'] = None
+    with PostgrestStub() as stub:
+        monkeypatch.setenv('SUPABASE_URL', stub.base_url)
+        monkeypatch.setenv('SUPABASE_SERVICE_ROLE_KEY', 'test')
+        uploader = SupabaseUploader()
+        uploader.ledger = ledger
+        ledger.open()
+        uploaded = uploader.upload_batch(broken, batch_size=5, upsert=True)
+        ledger.close()
+        dead = read_jsonl(ledger.dead_letter_path)
+        written = stub.stats['rows_written']
+
+        ledger.open(resume=True)
+        resumed = uploader.resume_upload([dict(m) for m in metrics])
+        ledger.close()
+
+    assert uploaded == 19 and ledger.counts['failed'] == 1
+    assert [entry['row']['title'] for entry in dead] == ['Metric 7 v1']
+    assert resumed == {'pending': 1, 'skipped': 19, 'upserted': 1}
+    assert stub.stats['rows_written'] - written == 1
+    assert sorted(key[0] for key in stub.tables['iris_metrics']) == [m['data_id'] for m in metrics]
@@ -0,0 +1,78 @@
+"""WorkQueue 임대/만료/소유권 테스트"""
+import time
+
+import pytest
+
+from utils.work_queue import WorkQueue
+
+OK = {'details': {'success': True}}
+FAILED = {'details': {'success': False}}
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(count: int = 3, **options) -> WorkQueue:
+        work_queue = WorkQueue(str(tmp_path / "queue.db"), **options)
+        work_queue.enqueue({'metadata': {'source': 'test'},
+                            'metrics': [{'title': f"Metric {i}", 'data_id': f"PI{i}", 'detail_url': f"u{i}"}
+                                        for i in range(count)]})
+        queues.append(work_queue)
+        return work_queue
+
+    yield make
+    for work_queue in queues:
+        work_queue.close()
+
+def test_claimed_jobs_are_not_claimed_twice(make_queue):
+    work_queue = make_queue(count=3)
+    first = work_queue.claim('A', limit=2)
+    second = work_queue.claim('B', limit=2)
+
+    assert [idx for idx, _ in first] == [0, 1]
+    assert [idx for idx, _ in second] == [2]
+    assert work_queue.stats()['leased'] == 3
+
+def test_expired_lease_is_reassigned_and_old_owner_cannot_complete(make_queue):
+    work_queue = make_queue(count=1, lease_seconds=0.05)
+    [(idx, _)] = work_queue.claim('A')
+    time.sleep(0.1)
+    assert [job_idx for job_idx, _ in work_queue.claim('B')] == [idx]
+
+    # 임대를 잃은 워커의 결과는 버리고, 현재 임대한 워커의 결과만 기록
+    assert work_queue.complete(idx, FAILED, 'A') is False
+    assert work_queue.stats()['leased'] == 1
+    assert work_queue.complete(idx, OK, 'B') is True
+    assert work_queue.stats()['done'] == 1
+    # 이미 끝난 작업은 다시 덮어쓰지 않음
+    assert work_queue.complete(idx, FAILED, 'B') is False
+
+def test_failed_jobs_retry_until_max_attempts(make_queue):
+    work_queue = make_queue(count=1, max_attempts=2)
+    for _ in range(2):
+        [(idx, _)] = work_queue.claim('A')
+        work_queue.complete(idx, FAILED, 'A')
+
+    assert work_queue.stats()['failed'] == 1
+    assert work_queue.claim('A') == []
+    assert not work_queue.has_open_jobs()
+
+def test_expired_lease_on_last_attempt_becomes_failed(make_queue):
+    work_queue = make_queue(count=1, lease_seconds=0.05, max_attempts=1)
+    work_queue.claim('A')
+    time.sleep(0.1)
+
+    assert work_queue.claim('B') == []
+    assert work_queue.stats() == {'pending': 0, 'leased': 0, 'done': 0, 'failed': 1}
+    assert not work_queue.has_open_jobs()
+
+def test_merge_keeps_order_and_unfinished_metrics(make_queue):
+    work_queue = make_queue(count=3)
+    jobs = work_queue.claim('A', limit=3)
+    work_queue.complete(jobs[1][0], {**jobs[1][1], **OK}, 'A')
+
+    merged = work_queue.merge()
+    assert merged['metadata'] == {'source': 'test'}
+    assert [m['data_id'] for m in merged['metrics']] == ['PI0', 'PI1', 'PI2']
+    assert merged['metrics'][1]['details']['success'] is True
+    assert 'details' not in merged['metrics'][0]
@@ -9,17 +9,21 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 import requests
 from config.settings import SCRAPING_CONFIG, DATA_DIR, LOGS_DIR
+from utils.rate_limiter import rate_limiters
+from utils.telemetry import telemetry
+from utils.http_client import create_session
+from utils.http_cache import install_cache, throttled_get
 
 class BaseScraper(ABC):
     """모든 스크래퍼의 베이스 클래스"""
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, use_cache: bool = True):
         self.name = name
         self.setup_logging()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': SCRAPING_CONFIG['user_agent']
-        })
+        # 연결 풀/타임아웃/재시도가 설정된 공유 HTTP 클라이언트 세션
+        self.session = create_session(name=name.lower())
+        if use_cache:
+            install_cache(self.session)
     
     def setup_logging(self):
         """로깅 설정"""
@@ -35,27 +39,22 @@ class BaseScraper(ABC):
         self.logger = logging.getLogger(self.name)
     
     def make_request(self, url: str, **kwargs) -> Optional[requests.Response]:
-        """HTTP 요청을 안전하게 수행"""
-        for attempt in range(SCRAPING_CONFIG['max_retries']):
-            try:
-                response = self.session.get(
-                    url, 
-                    timeout=SCRAPING_CONFIG['timeout'],
-                    **kwargs
-                )
-                response.raise_for_status()
-                return response
-            except requests.RequestException as e:
-                self.logger.warning(f"요청 실패 (시도 {attempt + 1}/{SCRAPING_CONFIG['max_retries']}): {e}")
-                if attempt < SCRAPING_CONFIG['max_retries'] - 1:
-                    time.sleep(2 ** attempt)  # 지수 백오프
-                else:
-                    self.logger.error(f"최대 재시도 횟수 초과: {url}")
-                    return None
+        """HTTP 요청을 안전하게 수행 (재시도/백오프는 공유 HTTP 클라이언트의 정책을 따름)"""
+        try:
+            # 호스트별 속도 제한기가 요청 간격을 결정 (캐시가 바로 응답할 URL은 기다리지 않음)
+            response = throttled_get(self.session, url, **kwargs)
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            if e.response is None:
+                rate_limiters.record(url, None, 0.0)
+                telemetry.record_request(self.name.lower(), url, None)
+            self.logger.error(f"요청 실패 (최대 {SCRAPING_CONFIG['max_retries']}회 재시도 후): {url} - {e}")
+            return None
     
-    def delay(self):
-        """요청 간 딜레이"""
-        time.sleep(SCRAPING_CONFIG['delay_between_requests'])
+    def delay(self, url: str):
+        """요청 간 딜레이 (호스트별 속도 제한기 사용)"""
+        rate_limiters.wait(url)
     
     def save_to_json(self, data: Dict[str, Any], filename: str) -> Path:
         """데이터를 JSON 파일로 저장"""
@@ -0,0 +1,187 @@
+"""
+Supabase 형식으로 변환된 IRIS+ 메트릭의 컬럼형(Parquet/Arrow) 내보내기와 읽기
+평면 필드는 타입이 있는 컬럼, 상세 섹션은 struct/list 컬럼으로 저장하고
+metric_type 같은 반복되는 문자열은 딕셔너리 인코딩합니다.
+읽을 때는 파일을 메모리 매핑하고 필요한 컬럼만 가져오므로 JSON 전체를 다시 파싱하지 않습니다.
+
+예시:
+    table = read_metrics_table("data/iris_metrics.parquet", columns=['data_id', 'title_en'],
+                               filters={'metric_type': 'Quantitative'})
+"""
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+ARROW_EXTENSIONS = ('.arrow', '.feather')
+
+def require_pyarrow():
+    """pyarrow가 없으면 설치 안내와 함께 ImportError를 발생시킵니다."""
+    if pa is None:
+        raise ImportError("컬럼형 내보내기에는 pyarrow가 필요합니다. (pip install pyarrow)")
+
+def build_schema() -> 'pa.Schema':
+    """변환된 메트릭의 Arrow 스키마"""
+    require_pyarrow()
+    label = pa.dictionary(pa.int32(), pa.string())
+
+    # FinalScraper.extract_section_content 결과 구조
+    section = pa.struct([
+        ('title', pa.string()),
+        ('content', pa.struct([
+            ('paragraphs', pa.list_(pa.string())),
+            ('lists', pa.list_(pa.struct([('type', pa.string()), ('items', pa.list_(pa.string()))]))),
+            ('headings', pa.list_(pa.struct([('tag', pa.string()), ('text', pa.string())]))),
+            ('other_elements', pa.list_(pa.struct([
+                ('tag', pa.string()), ('text', pa.string()), ('class', pa.list_(pa.string()))
+            ]))),
+            ('raw_text', pa.string())
+        ]))
+    ])
+    localized_section = pa.struct([('en', section), ('ko', section)])
+
+    return pa.schema([
+        ('title_en', pa.string()),
+        ('title_ko', pa.string()),
+        ('data_id', pa.string()),
+        ('relative_path', pa.string()),
+        ('detail_url', pa.string()),
+        ('reporting_format', label),
+        ('metric_type', label),
+        ('metric_level', label),
+        ('iris_citation', pa.string()),
+        ('definition', localized_section),
+        ('usage_guidance', localized_section),
+        ('impact_categories', localized_section),
+        ('sdg_goals', localized_section),
+        ('metric_history', section),
+        ('related_metrics', section),
+        ('scraped_at', pa.timestamp('us')),
+        ('translated_at', pa.timestamp('us')),
+        ('success', pa.bool_()),
+        ('version', label),
+        ('content_hash', pa.string())
+    ])
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """ISO 형식 문자열을 datetime으로 바꿉니다. (읽을 수 없으면 None)"""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def to_row(metric: Dict) -> Dict:
+    """변환된 메트릭을 스키마에 맞는 행으로 만듭니다. (스키마에 없는 필드는 무시)"""
+    row = dict(metric)
+    for field in ('scraped_at', 'translated_at'):
+        row[field] = parse_timestamp(row.get(field))
+    return row
+
+class ColumnarWriter:
+    """메트릭을 batch_size개씩 모아 Parquet 또는 Arrow IPC 파일에 기록하는 스트리밍 작성기"""
+
+    def __init__(self, filename: str, batch_size: int = 1000, compression: str = 'zstd'):
+        require_pyarrow()
+        self.path = Path(filename)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.schema = build_schema()
+        self.rows: List[Dict] = []
+        self.count = 0
+        # 딕셔너리 컬럼별 누적 사전 (배치마다 앞부분이 같은 사전을 써야 IPC 파일에 델타로 기록 가능)
+        self.dictionaries: Dict[str, Dict[str, int]] = {
+            field.name: {} for field in self.schema if pa.types.is_dictionary(field.type)
+        }
+
+        if self.path.suffix in ARROW_EXTENSIONS:
+            # Arrow IPC 파일은 메모리 매핑만으로 복사 없이 읽을 수 있음
+            self.writer = ipc.new_file(str(self.path), self.schema,
+                                       options=ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+        else:
+            self.writer = pq.ParquetWriter(str(self.path), self.schema, compression=compression)
+
+    def write(self, metric: Dict):
+        self.rows.append(to_row(metric))
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        arrays = []
+        for field in self.schema:
+            values = [row.get(field.name) for row in self.rows]
+            if field.name in self.dictionaries:
+                arrays.append(self.encode_dictionary(field.name, values))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.count += len(self.rows)
+        self.rows = []
+
+    def encode_dictionary(self, name: str, values: List[Optional[str]]) -> 'pa.DictionaryArray':
+        """누적 사전에 새 값을 추가하며 문자열을 딕셔너리 인덱스로 바꿉니다."""
+        dictionary = self.dictionaries[name]
+        indices = [None if value is None else dictionary.setdefault(value, len(dictionary)) for value in values]
+        return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), pa.array(list(dictionary), pa.string()))
+
+    def close(self) -> int:
+        """남은 행을 기록하고 파일을 닫습니다. 기록한 메트릭 수를 반환합니다."""
+        self.flush()
+        self.writer.close()
+        logger.info(f"컬럼형 파일 저장: {self.path} ({self.count}개)")
+        return self.count
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_columnar(metrics: Iterable[Dict], filename: str, batch_size: int = 1000) -> int:
+    """변환된 메트릭을 컬럼형 파일로 저장합니다. (.parquet 또는 .arrow/.feather)"""
+    with ColumnarWriter(filename, batch_size) as writer:
+        for metric in metrics:
+            writer.write(metric)
+    return writer.count
+
+def build_filter(filters: Dict[str, Any]) -> 'pc.Expression':
+    """{컬럼: 값 또는 값 목록} 조건을 AND로 묶은 필터 식을 만듭니다."""
+    expression = None
+    for column, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            condition = pc.field(column).isin(list(value))
+        else:
+            condition = pc.field(column) == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+def read_metrics_table(filename: str, columns: Optional[List[str]] = None,
+                       filters: Optional[Dict[str, Any]] = None) -> 'pa.Table':
+    """컬럼형 파일을 메모리 매핑해 필요한 컬럼만 읽습니다. (filters: {컬럼: 값 또는 값 목록})"""
+    require_pyarrow()
+    expression = build_filter(filters) if filters else None
+
+    if Path(filename).suffix in ARROW_EXTENSIONS:
+        # 레코드 배치가 매핑된 메모리를 그대로 가리키므로 컬럼 선택은 복사 없이 끝남
+        table = ipc.open_file(pa.memory_map(filename, 'r')).read_all()
+        if columns:
+            # 필터에 쓰는 컬럼까지만 남긴 뒤 거르므로 나머지 컬럼은 복사되지 않음
+            table = table.select(list(dict.fromkeys([*columns, *(filters or {})])))
+        if expression is not None:
+            table = table.filter(expression)
+        return table.select(columns) if columns else table
+
+    return pq.read_table(filename, columns=columns, filters=expression, memory_map=True)
@@ -3,11 +3,21 @@
 수집된 IRIS+ 데이터를 Supabase 테이블 구조에 맞게 변환하는 도구
 """
 
+import argparse
+import hashlib
 import json
 import os
 from datetime import datetime
 import logging
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.columnar_export import ColumnarWriter, write_columnar
+from utils.payload_slimming import payload_bytes, slim_sections
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 # 로깅 설정
 logging.basicConfig(
@@ -20,6 +30,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 변환 시점에 미리 풀어 두는 팩트 테이블: 테이블 이름 → (원본 섹션 필드, 값 컬럼)
+FACT_TABLES = {
+    'iris_metric_impact_categories': ('impact_categories', 'impact_category'),
+    'iris_metric_sdg_goals': ('sdg_goals', 'sdg_goal')
+}
+
+# 내용 비교에서 제외하는 필드 (다시 수집만 해도 바뀌는 값)
+HASH_EXCLUDED_FIELDS = ('scraped_at', 'content_hash')
+
+def row_content_hash(row: Dict) -> str:
+    """업로드 행의 내용 해시 (키 순서와 수집 시각에 영향받지 않는 정규화 JSON의 sha256)"""
+    content = {key: value for key, value in row.items() if key not in HASH_EXCLUDED_FIELDS}
+    canonical = json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def fact_table_filename(filename: str, table: str) -> str:
+    """변환 결과 파일 옆에 저장하는 팩트 테이블 JSONL 경로"""
+    path = Path(filename)
+    return str(path.with_name(f"{path.stem}.{table}.jsonl"))
+
+class FactTableWriter:
+    """팩트 행을 테이블마다 JSONL로 기록 (임시 파일에 쓰고 close에서 이름을 바꿔 교체)"""
+
+    def __init__(self, filename: str):
+        self.paths = {table: Path(fact_table_filename(filename, table)) for table in FACT_TABLES}
+        self.temp_paths = {table: path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                           for table, path in self.paths.items()}
+        self.files = {table: open(path, 'w', encoding='utf-8') for table, path in self.temp_paths.items()}
+        self.counts = dict.fromkeys(FACT_TABLES, 0)
+
+    def write(self, fact_rows: Dict[str, List[Dict]]):
+        for table, rows in fact_rows.items():
+            for row in rows:
+                self.files[table].write(json.dumps(row, ensure_ascii=False) + '\n')
+            self.counts[table] += len(rows)
+
+    def close(self, commit: bool = True) -> Dict[str, int]:
+        """파일을 닫고 commit이면 최종 경로로 교체합니다. 테이블별 행 수를 반환합니다."""
+        for table, f in self.files.items():
+            f.close()
+            if commit:
+                os.replace(self.temp_paths[table], self.paths[table])
+                logger.info(f"팩트 테이블 저장: {self.paths[table]} ({self.counts[table]}행)")
+            else:
+                self.temp_paths[table].unlink(missing_ok=True)
+        return self.counts
+
 def load_env_file(env_file: str = '.env'):
     """환경변수 파일을 로드합니다."""
     if os.path.exists(env_file):
@@ -35,10 +92,13 @@ def load_env_file(env_file: str = '.env'):
         logger.info(f"환경변수 파일 없음: {env_file} (선택사항)")
 
 class SupabaseConverter:
-    def __init__(self):
+    def __init__(self, slim: bool = False):
         """
         Supabase 연결 정보 (환경변수에서 로드)
+        slim: 섹션 내용에서 raw_text와 중복/빈 값을 제거 (절감량은 slim_bytes에 누적)
         """
+        self.slim = slim
+        self.slim_bytes = {'before': 0, 'after': 0}
         self.supabase_url = os.getenv('SUPABASE_URL')
         self.supabase_key = os.getenv('SUPABASE_ANON_KEY')
         
@@ -54,6 +114,29 @@ class SupabaseConverter:
         except Exception as e:
             logger.error(f"데이터 로드 실패: {e}")
             return {}
+
+    def iter_collected_metrics(self, filename: str = "data/iris_metrics_complete.json") -> Iterator[Dict]:
+        """수집된 메트릭을 하나씩 읽어 반환합니다. (.jsonl은 한 줄에 메트릭 하나, .json은 ijson으로 metrics 배열을 스트리밍)"""
+        if filename.endswith('.jsonl'):
+            with open(filename, 'r', encoding='utf-8') as f:
+                for line_num, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"{filename} {line_num}번째 줄을 읽을 수 없어 건너뜁니다.")
+            return
+
+        if ijson is None:
+            # ijson이 없으면 전체를 읽어야 하므로 메모리가 데이터 크기만큼 필요함
+            logger.warning("ijson이 설치되어 있지 않아 JSON 파일 전체를 메모리에 로드합니다. (pip install ijson)")
+            yield from self.load_collected_data(filename).get('metrics', [])
+            return
+
+        with open(filename, 'rb') as f:
+            yield from ijson.items(f, 'metrics.item', use_float=True)
     
     def convert_metric_to_supabase_format(self, metric: Dict) -> Dict:
         """단일 메트릭을 Supabase 형식으로 변환합니다."""
@@ -117,6 +200,15 @@ class SupabaseConverter:
                 'success': details.get('success', True),
                 'version': 'v5.3b'
             })
+
+            if self.slim:
+                slimmed = slim_sections(converted)
+                self.slim_bytes['before'] += payload_bytes(converted)
+                self.slim_bytes['after'] += payload_bytes(slimmed)
+                converted = slimmed
+
+            # 업로더가 서버의 해시와 비교해 바뀐 행만 보냄
+            converted['content_hash'] = row_content_hash(converted)
             
             return converted
             
@@ -141,6 +233,21 @@ class SupabaseConverter:
         
         logger.info(f"변환 완료: {len(converted_metrics)}/{len(metrics)}개 성공")
         return converted_metrics
+
+    def convert_metrics_stream(self, metrics: Iterable[Dict]) -> Iterator[Dict]:
+        """메트릭을 하나씩 변환해 바로 내보냅니다. (변환 실패한 메트릭은 건너뜀)"""
+        total = converted_count = 0
+        for metric in metrics:
+            total += 1
+            converted = self.convert_metric_to_supabase_format(metric)
+            if converted:
+                converted_count += 1
+                yield converted
+
+            if total % 100 == 0:
+                logger.info(f"{total}개 변환 완료")
+
+        logger.info(f"변환 완료: {converted_count}/{total}개 성공")
     
     def save_converted_data(self, converted_metrics: List[Dict], filename: str = "data/iris_metrics_supabase_format.json"):
         """변환된 데이터를 저장합니다."""
@@ -165,67 +272,125 @@ class SupabaseConverter:
         except Exception as e:
             logger.error(f"저장 실패: {e}")
             return None
+
+    def save_converted_stream(self, converted_metrics: Iterable[Dict],
+                              filename: str = "data/iris_metrics_supabase_format.jsonl",
+                              query_stats: Optional[Dict] = None,
+                              fact_writer: Optional[FactTableWriter] = None) -> Tuple[Optional[str], int]:
+        """변환된 메트릭을 한 줄씩 JSONL로 저장합니다. (임시 파일에 쓴 뒤 이름을 바꿔 원자적으로 교체)
+        fact_writer가 있으면 팩트 행도 함께 기록합니다."""
+        path = Path(filename)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        count = 0
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for metric in converted_metrics:
+                    f.write(json.dumps(metric, ensure_ascii=False) + '\n')
+                    count += 1
+                    if query_stats is None and fact_writer is None:
+                        continue
+                    fact_rows = self.extract_fact_rows(metric)
+                    if fact_writer:
+                        fact_writer.write(fact_rows)
+                    if query_stats is not None:
+                        self.update_query_stats(query_stats, metric, fact_rows)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+
+            logger.info(f"변환된 데이터 저장: {filename} ({count}개)")
+            return filename, count
+
+        except Exception as e:
+            logger.error(f"저장 실패: {e}")
+            temp_path.unlink(missing_ok=True)
+            return None, count
+
+    def save_columnar(self, converted_metrics: Iterable[Dict],
+                      filename: str = "data/iris_metrics_supabase_format.parquet") -> Optional[str]:
+        """변환된 데이터를 컬럼형 파일(.parquet 또는 .arrow)로 저장합니다. (pyarrow 필요)"""
+        try:
+            write_columnar(converted_metrics, filename)
+            return filename
+        except Exception as e:
+            logger.error(f"컬럼형 저장 실패: {e}")
+            return None
+
+    def extract_fact_rows(self, metric: Dict) -> Dict[str, List[Dict]]:
+        """변환된 메트릭에서 팩트 테이블별 (data_id, 값) 행을 추출합니다. (en 섹션의 headings[*].text, 중복 제거)"""
+        fact_rows = {}
+        for table, (field, column) in FACT_TABLES.items():
+            values = []
+            value = metric.get(field)
+            if value and isinstance(value, dict):
+                en_data = value.get('en')
+                if en_data and 'content' in en_data and 'headings' in en_data['content']:
+                    for heading in en_data['content']['headings']:
+                        text = heading.get('text')
+                        if text and text not in values:
+                            values.append(text)
+            fact_rows[table] = [{'data_id': metric.get('data_id'), column: text} for text in values]
+        return fact_rows
+
+    def save_fact_tables(self, converted_metrics: Iterable[Dict],
+                         filename: str = "data/iris_metrics_supabase_format.json") -> Optional[Dict[str, int]]:
+        """변환된 데이터 옆에 팩트 테이블 JSONL을 저장합니다. 테이블별 행 수를 반환합니다."""
+        try:
+            writer = FactTableWriter(filename)
+            for metric in converted_metrics:
+                writer.write(self.extract_fact_rows(metric))
+            return writer.close()
+        except Exception as e:
+            logger.error(f"팩트 테이블 저장 실패: {e}")
+            return None
+
+    def update_query_stats(self, stats: Dict, metric: Dict, fact_rows: Optional[Dict[str, List[Dict]]] = None):
+        """샘플 쿼리 통계(Impact Categories, SDG 목표, 메트릭 타입)에 메트릭 하나를 반영합니다."""
+        stats.setdefault('impact_categories', set())
+        stats.setdefault('sdg_goals', set())
+        stats.setdefault('metric_types', set())
+
+        # 메트릭 타입
+        if metric.get('metric_type'):
+            stats['metric_types'].add(metric['metric_type'])
+
+        # Impact Categories / SDG 목표 (팩트 행과 같은 추출 결과 사용)
+        fact_rows = fact_rows if fact_rows is not None else self.extract_fact_rows(metric)
+        for table, (field, column) in FACT_TABLES.items():
+            stats[field].update(row[column] for row in fact_rows[table])
     
-    def generate_sample_queries(self, converted_metrics: List[Dict]):
-        """샘플 쿼리들을 생성합니다."""
+    def generate_sample_queries(self, converted_metrics: Iterable[Dict] = (), query_stats: Optional[Dict] = None):
+        """샘플 쿼리들을 생성합니다. (query_stats가 있으면 메트릭을 다시 순회하지 않고 그 통계를 사용)"""
         
         # Impact Categories 분석
-        impact_categories = set()
-        sdg_goals = set()
-        metric_types = set()
-        
-        for metric in converted_metrics:
-            # 메트릭 타입
-            if metric.get('metric_type'):
-                metric_types.add(metric['metric_type'])
-            
-            # Impact Categories 추출
-            impact_cat = metric.get('impact_categories')
-            if impact_cat and isinstance(impact_cat, dict):
-                en_data = impact_cat.get('en')
-                if en_data and 'content' in en_data and 'headings' in en_data['content']:
-                    for heading in en_data['content']['headings']:
-                        if 'text' in heading:
-                            impact_categories.add(heading['text'])
-            
-            # SDG 목표 추출
-            sdg = metric.get('sdg_goals')
-            if sdg and isinstance(sdg, dict):
-                en_data = sdg.get('en')
-                if en_data and 'content' in en_data and 'headings' in en_data['content']:
-                    for heading in en_data['content']['headings']:
-                        if 'text' in heading:
-                            sdg_goals.add(heading['text'])
+        if query_stats is None:
+            query_stats = {}
+            for metric in converted_metrics:
+                self.update_query_stats(query_stats, metric)
+        impact_categories = query_stats.get('impact_categories', set())
+        sdg_goals = query_stats.get('sdg_goals', set())
+        metric_types = query_stats.get('metric_types', set())
         
         # 샘플 쿼리 파일 생성
         queries = f"""-- IRIS+ 메트릭 데이터 샘플 쿼리들
 -- 생성일: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
--- 1. 모든 Impact Categories 조회
-SELECT 
-    jsonb_array_elements_text(
-        jsonb_path_query_array(impact_categories, '$.en.content.headings[*].text')
-    ) as category_name,
-    COUNT(*) as metric_count
-FROM iris_metrics 
-WHERE impact_categories IS NOT NULL
-GROUP BY category_name
+-- 1. 모든 Impact Categories 조회 (팩트 테이블 인덱스 사용)
+SELECT impact_category as category_name, COUNT(*) as metric_count
+FROM iris_metric_impact_categories
+GROUP BY impact_category
 ORDER BY metric_count DESC;
 
 -- 2. 특정 카테고리 메트릭 조회 (예: Water)
-SELECT title_en, data_id, metric_type
-FROM iris_metrics 
-WHERE impact_categories @> '{{"en": {{"content": {{"headings": [{{"text": "Water"}}]}}}}}}';
+SELECT m.title_en, m.data_id, m.metric_type
+FROM iris_metric_impact_categories c
+JOIN iris_metrics m ON m.data_id = c.data_id
+WHERE c.impact_category = 'Water';
 
 -- 3. SDG 목표별 메트릭 통계
-SELECT 
-    jsonb_array_elements_text(
-        jsonb_path_query_array(sdg_goals, '$.en.content.headings[*].text')
-    ) as sdg_name,
-    COUNT(*) as metric_count
-FROM iris_metrics 
-WHERE sdg_goals IS NOT NULL
-GROUP BY sdg_name
+SELECT sdg_goal as sdg_name, COUNT(*) as metric_count
+FROM iris_metric_sdg_goals
+GROUP BY sdg_goal
 ORDER BY metric_count DESC;
 
 -- 4. 메트릭 타입별 분포
@@ -240,17 +405,19 @@ FROM iris_metrics
 WHERE definition->>'en' ILIKE '%water%'
 LIMIT 10;
 
--- 6. 사용 가이드라인에서 검색
+-- 6. 사용 가이드라인에서 검색 (슬림 모드로 raw_text가 없어도 모든 문자열에서 검색)
 SELECT title_en, data_id
 FROM iris_metrics 
-WHERE usage_guidance->'en'->'content'->>'raw_text' ILIKE '%measurement%'
+WHERE jsonb_path_exists(usage_guidance, '$.en.content.** ? (@.type() == "string" && @ like_regex "measurement" flag "i")')
 LIMIT 10;
 
 -- 7. 복합 조건 검색 (Water 카테고리 + Clean Water SDG)
-SELECT title_en, data_id, metric_type
-FROM iris_metrics 
-WHERE impact_categories @> '{{"en": {{"content": {{"headings": [{{"text": "Water"}}]}}}}}}' 
-  AND sdg_goals @> '{{"en": {{"content": {{"headings": [{{"text": "Clean Water and Sanitation"}}]}}}}}}';
+SELECT m.title_en, m.data_id, m.metric_type
+FROM iris_metric_impact_categories c
+JOIN iris_metric_sdg_goals g ON g.data_id = c.data_id
+JOIN iris_metrics m ON m.data_id = c.data_id
+WHERE c.impact_category = 'Water'
+  AND g.sdg_goal = 'Clean Water and Sanitation';
 
 -- 8. 최근 업데이트된 메트릭들
 SELECT title_en, data_id, updated_at
@@ -272,16 +439,87 @@ LIMIT 20;
         
         logger.info("샘플 쿼리 파일 생성: supabase_sample_queries.sql")
 
+def print_slim_savings(converter: SupabaseConverter):
+    """슬림 모드 변환 단계의 바이트 절감량을 출력합니다."""
+    before, after = converter.slim_bytes['before'], converter.slim_bytes['after']
+    if converter.slim and before:
+        print(f"💾 슬림 모드: {before:,} → {after:,} bytes ({(before - after) / before * 100:.1f}% 절감)")
+
+def print_fact_counts(fact_counts: Optional[Dict[str, int]]):
+    """팩트 테이블별 행 수를 출력합니다."""
+    for table, rows in (fact_counts or {}).items():
+        print(f"🔗 {table}: {rows}행")
+
+def tee_to_columnar(metrics: Iterable[Dict], writer: ColumnarWriter) -> Iterator[Dict]:
+    """메트릭을 그대로 내보내면서 컬럼형 파일에도 기록합니다."""
+    for metric in metrics:
+        writer.write(metric)
+        yield metric
+
+def run_streaming(converter: SupabaseConverter, input_file: str, output_file: str,
+                  columnar_file: Optional[str] = None):
+    """메트릭을 하나씩 읽고 변환해 JSONL(과 컬럼형 파일)로 바로 기록합니다. (메모리 사용량이 데이터 크기와 무관)"""
+    print(f"🚀 스트리밍 변환 시작: {input_file} → {output_file}")
+
+    query_stats = {}
+    converted = converter.convert_metrics_stream(converter.iter_collected_metrics(input_file))
+
+    columnar_writer = None
+    if columnar_file:
+        try:
+            columnar_writer = ColumnarWriter(columnar_file)
+            converted = tee_to_columnar(converted, columnar_writer)
+        except ImportError as e:
+            print(f"⚠️ {e}")
+
+    fact_writer = FactTableWriter(output_file)
+    filename, count = converter.save_converted_stream(converted, output_file, query_stats=query_stats,
+                                                      fact_writer=fact_writer)
+    fact_counts = fact_writer.close(commit=bool(filename))
+    if columnar_writer:
+        columnar_writer.close()
+
+    if not filename or not count:
+        print("❌ 변환 실패")
+        return
+
+    converter.generate_sample_queries(query_stats=query_stats)
+
+    print(f"\n✅ 변환 완료!")
+    print(f"📁 변환된 데이터: {filename}")
+    print(f"📊 성공: {count}개")
+    print_fact_counts(fact_counts)
+    print_slim_savings(converter)
+    print(f"📝 샘플 쿼리: supabase_sample_queries.sql")
+    if columnar_writer:
+        print(f"🗂️ 컬럼형 파일: {columnar_file}")
+
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='수집된 IRIS+ 데이터를 Supabase 형식으로 변환')
+    parser.add_argument('--input', default='data/iris_metrics_complete.json',
+                        help='수집 결과 파일 (.json 또는 한 줄에 메트릭 하나인 .jsonl)')
+    parser.add_argument('--output', help='출력 파일 (기본값: data/iris_metrics_supabase_format.json, 스트리밍은 .jsonl)')
+    parser.add_argument('--stream', action='store_true',
+                        help='메트릭을 하나씩 변환해 JSONL로 바로 기록 (대용량 데이터용, .json 입력은 ijson 필요)')
+    parser.add_argument('--slim', action='store_true',
+                        help='슬림 모드: 섹션 내용에서 raw_text와 중복/빈 값을 빼고 변환 (업로드 JSONB 크기 감소)')
+    parser.add_argument('--columnar', metavar='FILE',
+                        help='컬럼형 파일도 함께 저장 (.parquet 또는 메모리 매핑용 .arrow, pyarrow 필요)')
+    args = parser.parse_args()
+
     # 환경변수 파일 로드 (선택사항)
     load_env_file()
     
-    converter = SupabaseConverter()
+    converter = SupabaseConverter(slim=args.slim)
+
+    if args.stream:
+        run_streaming(converter, args.input, args.output or "data/iris_metrics_supabase_format.jsonl", args.columnar)
+        return
     
     # 데이터 로드
     logger.info("수집된 데이터 로드 중...")
-    data = converter.load_collected_data()
+    data = converter.load_collected_data(args.input)
     
     if not data:
         print("❌ 데이터를 로드할 수 없습니다.")
@@ -294,15 +532,25 @@ def main():
     
     if converted_metrics:
         # 저장
-        filename = converter.save_converted_data(converted_metrics)
+        filename = converter.save_converted_data(converted_metrics, args.output or "data/iris_metrics_supabase_format.json")
         
+        # 팩트 테이블 저장
+        fact_counts = converter.save_fact_tables(converted_metrics, filename) if filename else None
+
+        # 컬럼형 파일 저장 (선택)
+        columnar_file = converter.save_columnar(converted_metrics, args.columnar) if args.columnar else None
+
         # 샘플 쿼리 생성
         converter.generate_sample_queries(converted_metrics)
         
         print(f"\n✅ 변환 완료!")
         print(f"📁 변환된 데이터: {filename}")
         print(f"📊 성공: {len(converted_metrics)}개")
+        print_fact_counts(fact_counts)
+        print_slim_savings(converter)
         print(f"📝 샘플 쿼리: supabase_sample_queries.sql")
+        if columnar_file:
+            print(f"🗂️ 컬럼형 파일: {columnar_file}")
         
         # 통계 출력
         successful = len([m for m in converted_metrics if m.get('success', True)])
@@ -0,0 +1,91 @@
+"""
+HTML 파서 백엔드 선택과 부분 파싱(SoupStrainer) 도구
+lxml이 설치되어 있으면 기본으로 사용하고, 필요한 서브트리만 만들도록 파싱 필터를 제공합니다.
+"""
+import hashlib
+import re
+from typing import Iterable, Optional, Union
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+class TargetStrainer(SoupStrainer):
+    """지정한 class 또는 id를 가진 최상위 요소의 서브트리만 만드는 파싱 필터"""
+
+    def __init__(self, classes: Iterable[str] = (), ids: Iterable[str] = ()):
+        super().__init__()
+        self.classes = set(classes)
+        self.ids = set(ids)
+
+    def is_target(self, attrs) -> bool:
+        """태그 속성이 대상 class/id와 일치하는지 확인합니다."""
+        if not attrs:
+            return False
+
+        classes = attrs.get('class') or []
+        if isinstance(classes, str):
+            classes = classes.split()
+        return bool(self.classes.intersection(classes)) or attrs.get('id') in self.ids
+
+    # beautifulsoup4 4.13 이상
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self.is_target(attrs)
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+    # beautifulsoup4 4.12 이하
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return markup_name if self.is_target(markup_attrs) else None
+
+# 상세 페이지에서 실제로 사용하는 .content-area와 section#metadata만 파싱
+DETAIL_PAGE_STRAINER = TargetStrainer(classes=['content-area'], ids=['metadata'])
+
+def make_soup(content: Union[bytes, str], parser: Optional[str] = None,
+              parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """설정된 파서 백엔드로 BeautifulSoup 객체를 만듭니다."""
+    return BeautifulSoup(content, parser or DEFAULT_PARSER, parse_only=parse_only)
+
+# 공백 정규화 (들여쓰기/줄바꿈 변경은 내용 변경으로 보지 않음)
+WHITESPACE_PATTERN = re.compile(rb'\s+')
+
+def attribute_pattern(attr: str, value: str) -> re.Pattern:
+    """attr 속성에 value 토큰을 가진 여는 태그를 찾는 바이트 정규식"""
+    return re.compile(
+        rb'<([a-zA-Z][a-zA-Z0-9]*)\b[^>]*?\b' + attr.encode() + rb'\s*=\s*["\'][^"\']*?(?<![\w-])'
+        + re.escape(value.encode()) + rb'(?![\w-])[^"\']*["\'][^>]*>'
+    )
+
+CONTENT_AREA_PATTERN = attribute_pattern('class', 'content-area')
+METADATA_PATTERN = attribute_pattern('id', 'metadata')
+
+def find_element_bytes(content: bytes, pattern: re.Pattern) -> Optional[bytes]:
+    """파싱 없이 바이트 스캔으로 요소 하나의 원본 HTML을 잘라냅니다. (못 찾거나 짝이 안 맞으면 None)"""
+    opening = pattern.search(content)
+    if not opening:
+        return None
+
+    tag = re.escape(opening.group(1))
+    tags = re.compile(rb'<(/?)' + tag + rb'\b[^>]*>', re.IGNORECASE)
+    depth = 1
+    for match in tags.finditer(content, opening.end()):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            return content[opening.start():match.end()]
+    return None
+
+def detail_content_hash(content: bytes, salt: bytes = b'') -> Optional[str]:
+    """상세 페이지에서 추출에 쓰이는 .content-area와 #metadata의 정규화된 해시 (.content-area가 없으면 None)"""
+    content_area = find_element_bytes(content, CONTENT_AREA_PATTERN)
+    if content_area is None:
+        return None
+
+    digest = hashlib.sha256(salt)
+    for region in (find_element_bytes(content, METADATA_PATTERN) or b'', content_area):
+        digest.update(WHITESPACE_PATTERN.sub(b' ', region).strip())
+        digest.update(b'\0')
+    return digest.hexdigest()
@@ -0,0 +1,195 @@
+"""
+ETag/Last-Modified 재검증을 지원하는 디스크 HTTP 응답 캐시
+requests.Session에 어댑터로 장착해 조건부 요청을 보내고, 304 응답은 디스크의 본문으로 돌려줍니다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from utils.http_client import PooledAdapter, adapter_options
+from utils.rate_limiter import rate_limiters
+
+# 디코딩된 본문을 저장하므로 다시 돌려줄 때 제외할 헤더
+SKIPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+class HTTPCache:
+    """URL을 키로 하는 디스크 응답 캐시 (용량 기반 LRU 제거)"""
+
+    def __init__(self, cache_dir: str = "data_temp/http_cache", max_bytes: int = 200 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.total_bytes = sum(self._entry_size(meta_file) for meta_file in self.cache_dir.glob("*.json"))
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str):
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def _entry_size(self, meta_file: Path) -> int:
+        body_file = meta_file.with_suffix('.body')
+        try:
+            return meta_file.stat().st_size + body_file.stat().st_size
+        except OSError:
+            return 0
+
+    def _write_atomic(self, path: Path, data: bytes):
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """캐시 항목을 반환합니다. (없으면 None)"""
+        meta_file, body_file = self._paths(self._key(url))
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            entry['body'] = body_file.read_bytes()
+        except (OSError, ValueError):
+            return None
+
+        # 마지막 접근 시각을 LRU 순서로 사용
+        os.utime(meta_file)
+        return entry
+
+    def stored_at(self, url: str) -> Optional[float]:
+        """항목의 저장 시각 (본문은 읽지 않음, 없으면 None)"""
+        meta_file, _ = self._paths(self._key(url))
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                return json.load(f)['stored_at']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        """응답을 캐시에 저장합니다."""
+        key = self._key(url)
+        meta_file, body_file = self._paths(key)
+        entry = {
+            'url': url,
+            'status': status,
+            'headers': {k: v for k, v in headers.items() if k.lower() not in SKIPPED_HEADERS},
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'stored_at': time.time()
+        }
+
+        with self.lock:
+            self.total_bytes -= self._entry_size(meta_file)
+            self._write_atomic(body_file, body)
+            self._write_atomic(meta_file, json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+            self.total_bytes += self._entry_size(meta_file)
+
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def refresh(self, url: str, entry: Dict, headers: Dict[str, str]):
+        """304 응답의 헤더로 기존 항목의 검증자와 저장 시각을 갱신합니다."""
+        merged = {**entry['headers'], **headers}
+        self.put(url, entry['status'], merged, entry['body'])
+
+    def evict(self):
+        """용량 한도 아래로 내려갈 때까지 오래 사용하지 않은 항목부터 제거합니다."""
+        meta_files = sorted(self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for meta_file in meta_files:
+            if self.total_bytes <= self.max_bytes:
+                break
+            size = self._entry_size(meta_file)
+            meta_file.with_suffix('.body').unlink(missing_ok=True)
+            meta_file.unlink(missing_ok=True)
+            self.total_bytes -= size
+
+    def clear(self):
+        """캐시를 모두 비웁니다."""
+        with self.lock:
+            for path in self.cache_dir.glob("*"):
+                path.unlink(missing_ok=True)
+            self.total_bytes = 0
+
+class CachingAdapter(PooledAdapter):
+    """GET 요청에 디스크 캐시와 조건부 재검증을 적용하는 어댑터"""
+
+    def __init__(self, cache: HTTPCache, ttl: Optional[float] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.ttl = ttl
+
+    def is_fresh(self, stored_at: Optional[float]) -> bool:
+        """TTL 안이라 네트워크 없이 바로 쓸 수 있는 항목인지 확인합니다."""
+        return self.ttl is not None and stored_at is not None and time.time() - stored_at < self.ttl
+
+    def build_cached_response(self, request: requests.PreparedRequest, entry: Dict, cache_status: str,
+                              elapsed: timedelta = timedelta(0)) -> requests.Response:
+        """캐시 항목으로 응답 객체를 만듭니다."""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.headers['X-Cache'] = cache_status
+        response._content = entry['body']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.elapsed = elapsed
+        response.from_cache = True
+        return response
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry:
+            # TTL 안의 항목은 네트워크 없이 바로 사용
+            if self.is_fresh(entry['stored_at']):
+                return self.build_cached_response(request, entry, 'HIT')
+
+            if entry.get('etag'):
+                request.headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.refresh(request.url, entry, response.headers)
+            response.close()
+            return self.build_cached_response(request, entry, 'REVALIDATED', response.elapsed)
+
+        if response.status_code == 200 and (response.headers.get('ETag') or response.headers.get('Last-Modified') or self.ttl is not None):
+            self.cache.put(request.url, response.status_code, response.headers, response.content)
+
+        return response
+
+def install_cache(session: requests.Session, cache: Optional[HTTPCache] = None, ttl: Optional[float] = None) -> HTTPCache:
+    """세션의 http/https 요청에 디스크 캐시를 장착합니다. (기존 연결 풀/재시도/타임아웃 설정 유지)"""
+    cache = cache or HTTPCache()
+    adapter = CachingAdapter(cache, ttl=ttl, **adapter_options(session))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return cache
+
+def served_from_cache(session: requests.Session, url: str) -> bool:
+    """세션의 캐시가 네트워크 요청 없이 바로 응답할 URL인지 확인합니다."""
+    adapter = session.get_adapter(url)
+    return isinstance(adapter, CachingAdapter) and adapter.is_fresh(adapter.cache.stored_at(url))
+
+def throttled_get(session: requests.Session, url: str, **kwargs) -> requests.Response:
+    """호스트별 속도 제한을 지켜 GET 요청을 보냅니다. 캐시가 바로 응답할 URL은 기다리지 않습니다."""
+    if not served_from_cache(session, url):
+        rate_limiters.wait(url)
+    response = session.get(url, **kwargs)
+    # 캐시 적중은 서버 응답이 아니므로 속도 조절에 반영하지 않음 (재검증 304는 반영)
+    if response.headers.get('X-Cache') != 'HIT':
+        rate_limiters.record_response(url, response)
+    return response
@@ -0,0 +1,97 @@
+"""
+모든 스크래퍼와 업로더가 공유하는 HTTP 클라이언트
+호스트별 연결 풀, keep-alive, 연결/읽기 타임아웃, 압축 협상, 공통 재시도 정책을 설정에서 가져와 적용합니다.
+"""
+from typing import Dict, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config.settings import SCRAPING_CONFIG
+from config.data_sources_config import get_data_source_config
+from utils.telemetry import TIMED_POOL_CLASSES, install_telemetry
+
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# 일시적인 서버 오류만 재시도 (429/503은 호스트별 속도 제한기가 처리)
+RETRY_STATUS_CODES = (500, 502, 504)
+
+def get_timeouts(source: Optional[str] = None) -> Tuple[float, float]:
+    """데이터 소스의 (연결, 읽기) 타임아웃(초)을 반환합니다."""
+    read_timeout = SCRAPING_CONFIG['timeout']
+    source_config = get_data_source_config(source) if source else None
+    if source_config:
+        read_timeout = source_config.scraping_config.timeout
+    return min(SCRAPING_CONFIG['connect_timeout'], read_timeout), read_timeout
+
+def build_retry(max_retries: Optional[int] = None) -> Retry:
+    """공통 재시도 정책 (연결 오류와 5xx, 멱등 메서드만 지수 백오프로 재시도)"""
+    max_retries = SCRAPING_CONFIG['max_retries'] if max_retries is None else max_retries
+    return Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=SCRAPING_CONFIG['retry_backoff'],
+        status_forcelist=RETRY_STATUS_CODES,
+        raise_on_status=False,
+        respect_retry_after_header=False
+    )
+
+class PooledAdapter(HTTPAdapter):
+    """연결 풀 크기, 재시도, 기본 타임아웃을 적용하는 어댑터"""
+
+    def __init__(self, timeout: Optional[Tuple[float, float]] = None, pool_maxsize: Optional[int] = None,
+                 max_retries: Optional[Retry] = None, **kwargs):
+        self.timeout = timeout or get_timeouts()
+        pool_maxsize = pool_maxsize or SCRAPING_CONFIG['pool_maxsize']
+        max_retries = max_retries if max_retries is not None else build_retry()
+        self.options = {'timeout': self.timeout, 'pool_maxsize': pool_maxsize, 'max_retries': max_retries}
+        super().__init__(pool_connections=SCRAPING_CONFIG['pool_connections'], pool_maxsize=pool_maxsize,
+                         max_retries=max_retries, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        # DNS 조회/연결 시간을 재는 연결 클래스 사용
+        self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+
+    def send(self, request: requests.PreparedRequest, timeout=None, **kwargs) -> requests.Response:
+        # 호출하는 쪽에서 타임아웃을 지정하지 않으면 기본 (연결, 읽기) 타임아웃 사용
+        return super().send(request, timeout=timeout if timeout is not None else self.timeout, **kwargs)
+
+def create_session(source: Optional[str] = None, pool_maxsize: Optional[int] = None,
+                   max_retries: Optional[int] = None, headers: Optional[Dict[str, str]] = None,
+                   name: Optional[str] = None) -> requests.Session:
+    """데이터 소스 설정을 반영한 공유 연결 풀 세션을 만듭니다. (name: 텔레메트리에 기록할 스크래퍼 이름)"""
+    source_config = get_data_source_config(source) if source else None
+    scraping_config = source_config.scraping_config if source_config else None
+    if max_retries is None and scraping_config:
+        max_retries = scraping_config.max_retries
+
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': SCRAPING_CONFIG['user_agent'],
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Connection': 'keep-alive'
+    })
+    if scraping_config:
+        session.headers.update(scraping_config.headers or {})
+        session.cookies.update(scraping_config.cookies or {})
+        if scraping_config.proxy:
+            session.proxies.update({'http': scraping_config.proxy, 'https': scraping_config.proxy})
+    session.headers.update(headers or {})
+
+    adapter = PooledAdapter(timeout=get_timeouts(source), pool_maxsize=pool_maxsize,
+                            max_retries=build_retry(max_retries))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    install_telemetry(session, name or source or 'default')
+    return session
+
+def adapter_options(session: requests.Session) -> Dict:
+    """세션에 장착된 공유 어댑터의 설정 (다른 어댑터로 교체할 때 그대로 이어받기 위해 사용)"""
+    adapter = session.get_adapter('https://')
+    return dict(adapter.options) if isinstance(adapter, PooledAdapter) else {}
@@ -0,0 +1,277 @@
+"""
+WARC 형식을 따르는 압축 원본 HTML 아카이브
+가져온 페이지를 레코드마다 gzip 멤버로 추가 기록하고, URL별 오프셋 인덱스로 임의 접근합니다.
+추출 로직이 바뀌면 네트워크 없이 아카이브에서 다시 파싱할 수 있습니다.
+여러 프로세스(작업 큐 워커, 동시에 실행한 스크래퍼)가 같은 파일에 써도 되도록 기록할 때마다 파일 잠금을 잡습니다.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+from http.client import responses as HTTP_REASONS
+from pathlib import Path
+from typing import Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.compat import urljoin
+from requests.utils import get_encoding_from_headers, requote_uri
+from utils.http_cache import SKIPPED_HEADERS
+
+try:
+    import fcntl
+except ImportError:
+    # Windows에는 flock이 없으므로 한 프로세스만 쓰는 것으로 간주
+    fcntl = None
+
+class PageArchive:
+    """추가 전용 WARC.gz 아카이브와 JSONL 오프셋 인덱스"""
+
+    def __init__(self, filename: str = "data_temp/raw_pages.warc.gz", index_filename: Optional[str] = None):
+        self.path = Path(filename)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.index_path = Path(index_filename) if index_filename else self.path.with_name(f"{self.path.name}.idx")
+        self.lock = threading.Lock()
+        self.file = None
+        self.index_file = None
+        self.index = self.load_index()
+
+    def load_index(self) -> Dict[str, Dict]:
+        """인덱스를 읽어 URL별 마지막 레코드 위치를 반환합니다. (인덱스가 없으면 아카이브에서 재구성)"""
+        if not self.path.exists():
+            return {}
+        if not self.index_path.exists():
+            return self.rebuild_index()
+
+        index = {}
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 비정상 종료로 잘린 마지막 줄은 무시
+                    continue
+                index[entry['url']] = entry
+        return index
+
+    def rebuild_index(self) -> Dict[str, Dict]:
+        """아카이브를 처음부터 읽어 인덱스 파일을 다시 만듭니다."""
+        index = {}
+        offset, consumed, pending = 0, 0, b''
+        decompressor, parts = zlib.decompressobj(wbits=31), []
+        with open(self.path, 'rb') as f:
+            while True:
+                # 앞 멤버 뒤에 남은 데이터부터 이어서 풀고, 없으면 파일에서 더 읽음
+                chunk = pending or f.read(1024 * 1024)
+                pending = b''
+                if not chunk:
+                    # 잘린 마지막 레코드는 버림
+                    break
+                try:
+                    parts.append(decompressor.decompress(chunk))
+                except zlib.error:
+                    break
+                if not decompressor.eof:
+                    consumed += len(chunk)
+                    continue
+
+                pending = decompressor.unused_data
+                length = consumed + len(chunk) - len(pending)
+                entry = self.parse_record(b''.join(parts))
+                for url in self.record_urls(entry):
+                    index[url] = self.index_entry({**entry, 'url': url}, offset, length)
+                offset += length
+                consumed, decompressor, parts = 0, zlib.decompressobj(wbits=31), []
+
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            for entry in index.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return index
+
+    @staticmethod
+    def record_urls(record: Dict) -> List[str]:
+        """레코드를 찾을 수 있는 URL (요청 URL, 리다이렉트되었다면 최종 URL도)"""
+        final_url = record.get('final_url')
+        return [record['url']] + ([final_url] if final_url and final_url != record['url'] else [])
+
+    def index_entry(self, record: Dict, offset: int, length: int) -> Dict:
+        return {
+            'url': record['url'],
+            'offset': offset,
+            'length': length,
+            'status': record['status'],
+            'fetched_at': record['fetched_at'],
+            'digest': record['digest']
+        }
+
+    def build_record(self, url: str, status: int, headers: Dict[str, str], body: bytes,
+                     fetched_at: str, digest: str, final_url: Optional[str] = None) -> bytes:
+        """WARC/1.1 response 레코드를 만듭니다. (리다이렉트된 경우 최종 URL은 WARC-Final-URI에 기록)"""
+        http_block = f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n".encode('utf-8')
+        for name, value in headers.items():
+            if name.lower() not in SKIPPED_HEADERS:
+                http_block += f"{name}: {value}\r\n".encode('utf-8')
+        http_block += f"Content-Length: {len(body)}\r\n\r\n".encode('utf-8') + body
+
+        final_field = f"WARC-Final-URI: {final_url}\r\n" if final_url and final_url != url else ""
+        warc_header = (
+            "WARC/1.1\r\n"
+            "WARC-Type: response\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            f"WARC-Date: {fetched_at}\r\n"
+            f"WARC-Payload-Digest: sha256:{digest}\r\n"
+            f"{final_field}"
+            "Content-Type: application/http; msgtype=response\r\n"
+            f"Content-Length: {len(http_block)}\r\n\r\n"
+        ).encode('utf-8')
+        return warc_header + http_block + b"\r\n\r\n"
+
+    def parse_record(self, record: bytes) -> Dict:
+        """압축을 푼 WARC 레코드를 URL/상태/헤더/본문으로 나눕니다."""
+        warc_header, _, rest = record.partition(b"\r\n\r\n")
+        warc_fields = dict(line.split(': ', 1) for line in warc_header.decode('utf-8').split('\r\n')[1:])
+        http_header, _, body = rest[:int(warc_fields['Content-Length'])].partition(b"\r\n\r\n")
+
+        status_line, *header_lines = http_header.decode('utf-8').split('\r\n')
+        headers = dict(line.split(': ', 1) for line in header_lines)
+        headers.pop('Content-Length', None)
+
+        return {
+            'url': warc_fields['WARC-Target-URI'],
+            'fetched_at': warc_fields['WARC-Date'],
+            'digest': warc_fields.get('WARC-Payload-Digest', '').split(':', 1)[-1],
+            'final_url': warc_fields.get('WARC-Final-URI'),
+            'status': int(status_line.split(' ')[1]),
+            'headers': headers,
+            'body': body
+        }
+
+    def write(self, url: str, status: int, headers: Dict[str, str], body: bytes, final_url: Optional[str] = None):
+        """페이지 하나를 요청 URL로 기록합니다. (직전 기록과 본문이 같으면 건너뜀)
+        리다이렉트되었다면 final_url로도 찾을 수 있게 인덱스에 함께 남깁니다."""
+        digest = hashlib.sha256(body).hexdigest()
+        with self.lock:
+            previous = self.index.get(url)
+            if previous and previous['digest'] == digest and previous['status'] == status:
+                return
+
+            if self.file is None:
+                self.file = open(self.path, 'ab')
+                self.index_file = open(self.index_path, 'a', encoding='utf-8')
+
+            fetched_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+            record = gzip.compress(self.build_record(url, status, dict(headers), body, fetched_at, digest, final_url))
+
+            # 다른 프로세스가 그사이 덧붙였을 수 있으므로 잠금을 잡은 뒤 실제 파일 끝에서 오프셋을 구함
+            self.lock_file()
+            try:
+                offset = self.file.seek(0, os.SEEK_END)
+                self.file.write(record)
+                self.file.flush()
+
+                for record_url in self.record_urls({'url': url, 'final_url': final_url}):
+                    entry = self.index_entry({'url': record_url, 'status': status, 'fetched_at': fetched_at,
+                                              'digest': digest}, offset, len(record))
+                    self.index_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                    self.index[record_url] = entry
+                self.index_file.flush()
+            finally:
+                self.unlock_file()
+
+    def lock_file(self):
+        """아카이브 파일에 배타 잠금을 겁니다. (다른 프로세스의 기록이 끝날 때까지 대기)"""
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+
+    def unlock_file(self):
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+
+    def read(self, url: str) -> Optional[Dict]:
+        """URL의 마지막 레코드를 반환합니다. (없으면 None)"""
+        entry = self.index.get(url)
+        if entry is None:
+            return None
+
+        with open(self.path, 'rb') as f:
+            f.seek(entry['offset'])
+            record = gzip.decompress(f.read(entry['length']))
+        return self.parse_record(record)
+
+    def read_body(self, url: str) -> Optional[bytes]:
+        """URL의 마지막 본문을 반환합니다. (없으면 None)"""
+        record = self.read(url)
+        return record['body'] if record else None
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self):
+        """아카이브를 닫습니다."""
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.index_file.close()
+                self.file = None
+                self.index_file = None
+
+class ArchiveReplayAdapter(HTTPAdapter):
+    """네트워크 대신 아카이브에서 응답을 돌려주는 어댑터"""
+
+    def __init__(self, archive: PageArchive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        record = self.archive.read(request.url) if request.method == 'GET' else None
+
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        if record is None:
+            response.status_code = 404
+            response.reason = 'Not In Archive'
+            response._content = b''
+            return response
+
+        response.status_code = record['status']
+        response.reason = HTTP_REASONS.get(record['status'], '')
+        response.headers = CaseInsensitiveDict(record['headers'])
+        response.headers['X-Archive'] = 'REPLAY'
+        response._content = record['body']
+        response.encoding = get_encoding_from_headers(response.headers)
+        return response
+
+def install_archive(session: requests.Session, archive: Optional[PageArchive] = None) -> PageArchive:
+    """세션이 받은 2xx 응답을 아카이브에 기록하도록 응답 훅을 장착합니다."""
+    archive = archive if archive is not None else PageArchive()
+    # 리다이렉트 대상 URL → 처음 요청한 URL (훅 실행 시점에는 response.history가 아직 비어 있음)
+    origins: Dict[str, str] = {}
+
+    def record_response(response, *args, **kwargs):
+        request_url = origins.pop(response.request.url, response.request.url)
+        if response.is_redirect:
+            target = requote_uri(urljoin(response.url, session.get_redirect_target(response)))
+            origins[target] = request_url
+        elif 200 <= response.status_code < 300 and response.headers.get('X-Archive') != 'REPLAY':
+            # 재생 시에는 요청 URL로 찾으므로 리다이렉트 전 원래 URL을 키로 기록
+            archive.write(request_url, response.status_code, response.headers, response.content, response.url)
+
+    session.hooks['response'].append(record_response)
+    return archive
+
+def install_replay(session: requests.Session, archive: Optional[PageArchive] = None) -> PageArchive:
+    """세션의 http/https 요청을 아카이브에서 읽도록 어댑터를 장착합니다."""
+    archive = archive if archive is not None else PageArchive()
+    adapter = ArchiveReplayAdapter(archive)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return archive
@@ -0,0 +1,127 @@
+"""
+상세 섹션 내용의 중복을 걷어낸 슬림 페이로드
+extract_section_content 결과는 paragraphs/lists/headings에 나눠 담은 텍스트를 raw_text에 한 번 더 담고,
+빈 other_elements 같은 빈 컨테이너도 항상 포함합니다. 슬림 모드는 raw_text를 빼고(필요하면 section_text로 재구성)
+빈 값과 다른 곳에 이미 있는 문자열을 제거해 수집 결과, 변환 결과, 업로드 JSONB 크기를 줄입니다.
+
+단계별 절감량 보고: python -m utils.payload_slimming [data/iris_metrics_complete.json]
+"""
+import argparse
+import json
+from typing import Any, Dict, List, Optional
+
+SECTION_LIST_KEYS = ('headings', 'paragraphs', 'lists', 'other_elements')
+
+def is_empty(value: Any) -> bool:
+    return value is None or value == '' or value == [] or value == {}
+
+def slim_section_content(content: Dict) -> Dict:
+    """섹션 내용에서 raw_text, 중복 문자열, 빈 값을 제거한 사본을 반환합니다."""
+    slim = {}
+
+    headings = content.get('headings') or []
+    if headings:
+        slim['headings'] = headings
+
+    # 같은 단락이 여러 번 나오면 처음 것만 유지
+    paragraphs = list(dict.fromkeys(content.get('paragraphs') or []))
+    if paragraphs:
+        slim['paragraphs'] = paragraphs
+
+    lists = [entry for entry in content.get('lists') or [] if entry.get('items')]
+    if lists:
+        slim['lists'] = lists
+
+    # 제목/단락/리스트 항목에 이미 있는 텍스트를 그대로 반복하는 요소는 제외
+    seen = {heading.get('text') for heading in headings}
+    seen.update(paragraphs)
+    seen.update(item for entry in lists for item in entry['items'])
+    other_elements = []
+    for element in content.get('other_elements') or []:
+        if element.get('text') in seen:
+            continue
+        seen.add(element.get('text'))
+        other_elements.append({key: value for key, value in element.items() if not is_empty(value)})
+    if other_elements:
+        slim['other_elements'] = other_elements
+
+    # 알 수 없는 키는 비어 있지 않으면 그대로 유지
+    for key, value in content.items():
+        if key not in SECTION_LIST_KEYS and key != 'raw_text' and not is_empty(value):
+            slim[key] = value
+
+    return slim
+
+def slim_sections(data: Any) -> Any:
+    """details나 변환된 메트릭 안의 모든 섹션 내용({'title', 'content'})을 슬림하게 만든 사본을 반환합니다."""
+    if isinstance(data, list):
+        return [slim_sections(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+
+    slimmed = {}
+    for key, value in data.items():
+        if key == 'content' and isinstance(value, dict) and any(k in value for k in (*SECTION_LIST_KEYS, 'raw_text')):
+            slimmed[key] = slim_section_content(value)
+        else:
+            slimmed[key] = slim_sections(value)
+    return slimmed
+
+def section_text(content: Dict) -> str:
+    """섹션 전체 텍스트 (raw_text가 없으면 나머지 필드로 재구성, 순서는 원본 문서와 다를 수 있음)"""
+    if content.get('raw_text'):
+        return content['raw_text']
+
+    parts: List[str] = [heading.get('text', '') for heading in content.get('headings') or []]
+    parts.extend(content.get('paragraphs') or [])
+    parts.extend(item for entry in content.get('lists') or [] for item in entry.get('items', []))
+    parts.extend(element.get('text', '') for element in content.get('other_elements') or [])
+    return ' '.join(part for part in parts if part)
+
+def payload_bytes(data: Any, indent: Optional[int] = None, ensure_ascii: bool = False) -> int:
+    """JSON으로 직렬화했을 때의 바이트 수"""
+    return len(json.dumps(data, ensure_ascii=ensure_ascii, indent=indent).encode('utf-8'))
+
+def stage_report(data: Dict) -> Dict[str, Dict]:
+    """전체(비슬림) 수집 결과로 단계별 페이로드 크기를 비교합니다.
+    scraped: 수집 결과 파일, converted: 변환 결과 파일, upload: 업로드 요청 본문(압축 JSON)"""
+    from utils.convert_to_supabase import SupabaseConverter
+
+    slim_data = {**data, 'metrics': [slim_sections(metric) for metric in data.get('metrics', [])]}
+    full_converter, slim_converter = SupabaseConverter(), SupabaseConverter(slim=True)
+    converted = [m for m in map(full_converter.convert_metric_to_supabase_format, data.get('metrics', [])) if m]
+    slim_converted = [m for m in map(slim_converter.convert_metric_to_supabase_format, data.get('metrics', [])) if m]
+
+    stages = {
+        'scraped': (payload_bytes(data, indent=2), payload_bytes(slim_data, indent=2)),
+        'converted': (payload_bytes(converted, indent=2), payload_bytes(slim_converted, indent=2)),
+        # requests의 json= 본문과 같은 형식 (ASCII 이스케이프, 들여쓰기 없음)
+        'upload': (payload_bytes(converted, ensure_ascii=True), payload_bytes(slim_converted, ensure_ascii=True))
+    }
+    return {
+        stage: {
+            'before_bytes': before,
+            'after_bytes': after,
+            'saved_bytes': before - after,
+            'saved_percent': round((before - after) / before * 100, 1) if before else 0.0
+        }
+        for stage, (before, after) in stages.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='슬림 페이로드 단계별 절감량 보고')
+    parser.add_argument('input', nargs='?', default='data/iris_metrics_complete.json',
+                        help='슬림 모드 없이 수집한 결과 파일 (기본값: data/iris_metrics_complete.json)')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    print(f"💾 슬림 페이로드 절감량 ({len(data.get('metrics', []))}개 메트릭)")
+    print(f"{'단계':<12}{'기존':>14}{'슬림':>14}{'절감':>14}{'비율':>9}")
+    for stage, row in stage_report(data).items():
+        print(f"{stage:<12}{row['before_bytes']:>14,}{row['after_bytes']:>14,}"
+              f"{row['saved_bytes']:>14,}{row['saved_percent']:>8}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+DATABASE_URL로 Postgres에 직접 연결해 COPY로 대량 적재하는 로더
+PostgREST JSON POST 대신 행을 COPY ... FROM STDIN으로 임시 스테이징 테이블에 흘려 넣은 뒤
+한 트랜잭션 안에서 대상 테이블에 병합(변경된 행 UPDATE, 새 행 INSERT, 필요하면 사라진 행 DELETE)합니다.
+병합이 끝나 커밋되기 전까지 다른 세션은 이전 데이터를 그대로 봅니다.
+
+예시:
+    loader = PostgresBulkLoader()
+    loader.load_table('iris_metrics', metrics, key_columns=('data_id',), delete_missing=True)
+"""
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import psycopg
+    from psycopg import sql
+    from psycopg.types.json import Jsonb
+except ImportError:
+    psycopg = None
+
+from config.settings import DATABASE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 테이블별 병합 키 (sdg_* 테이블은 serial id 대신 자연 키로 병합)
+TABLE_KEYS = {
+    'iris_metrics': ('data_id',),
+    'iris_metric_impact_categories': ('data_id', 'impact_category'),
+    'iris_metric_sdg_goals': ('data_id', 'sdg_goal'),
+    'sdg_indicators': ('indicator_id',),
+    'sdg_metadata_files': ('indicator_id', 'filename'),
+    'sdg_framework_data': ('framework_version',)
+}
+
+# 행에는 자연 키를 싣고 병합 직전에 참조 테이블의 serial id로 바꾸는 컬럼
+# {테이블: [(행의 자연 키 필드, 대상 컬럼, 참조 테이블, 참조 테이블의 자연 키 컬럼)]} (참조 대상은 참조 테이블의 id)
+NATURAL_KEY_REFERENCES = {
+    'sdg_indicators': [('goal_number', 'goal_id', 'sdg_goals', 'goal_number')]
+}
+
+def require_psycopg():
+    """psycopg가 없으면 설치 안내와 함께 ImportError를 발생시킵니다."""
+    if psycopg is None:
+        raise ImportError("COPY 적재에는 psycopg가 필요합니다. (pip install \"psycopg[binary]\")")
+
+class PostgresBulkLoader:
+    """COPY + 스테이징 테이블 병합으로 여러 테이블을 한 트랜잭션에 적재하는 로더"""
+
+    def __init__(self, database_url: Optional[str] = None):
+        require_psycopg()
+        self.database_url = database_url or DATABASE_CONFIG.get('url') or os.getenv('DATABASE_URL')
+        if not self.database_url:
+            raise ValueError("DATABASE_URL 환경변수가 필요합니다.")
+
+    def table_columns(self, cursor, table: str) -> Dict[str, str]:
+        """대상 테이블의 {컬럼: 타입} (정의 순서)"""
+        cursor.execute(
+            "SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+            "WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped ORDER BY attnum",
+            (table,)
+        )
+        return dict(cursor.fetchall())
+
+    def copy_rows(self, cursor, stage: str, columns: List[str], types: List[str], rows: Iterable[Dict]) -> int:
+        """행을 COPY로 스테이징 테이블에 흘려 넣습니다. (JSON 컬럼의 dict/list는 jsonb로 전송)"""
+        json_columns = [column for column, type_name in zip(columns, types) if type_name in ('json', 'jsonb')]
+        count = 0
+        copy_sql = sql.SQL("COPY {} ({}) FROM STDIN").format(
+            sql.Identifier(stage), sql.SQL(', ').join(map(sql.Identifier, columns)))
+        with cursor.copy(copy_sql) as copy:
+            for row in rows:
+                values = dict(row)
+                for column in json_columns:
+                    if values.get(column) is not None:
+                        values[column] = Jsonb(values[column])
+                copy.write_row([values.get(column) for column in columns])
+                count += 1
+        return count
+
+    def merge(self, cursor, table: str, stage: str, columns: List[str], key_columns: Sequence[str],
+              delete_missing: bool) -> Dict[str, int]:
+        """스테이징 테이블을 대상 테이블에 병합합니다. 내용이 같은 행은 건드리지 않습니다."""
+        target, staged = sql.Identifier(table), sql.Identifier(stage)
+        keys = sql.SQL(' AND ').join(
+            sql.SQL("t.{0} = s.{0}").format(sql.Identifier(column)) for column in key_columns)
+        values = [column for column in columns if column not in key_columns]
+        column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+        counts = {'updated': 0, 'inserted': 0, 'deleted': 0}
+
+        if values:
+            cursor.execute(sql.SQL(
+                "UPDATE {target} t SET ({cols}) = ROW({src}) FROM {stage} s "
+                "WHERE {keys} AND ({dst}) IS DISTINCT FROM ({src})"
+            ).format(
+                target=target, stage=staged, keys=keys,
+                cols=sql.SQL(', ').join(map(sql.Identifier, values)),
+                src=sql.SQL(', ').join(sql.SQL("s.{}").format(sql.Identifier(c)) for c in values),
+                dst=sql.SQL(', ').join(sql.SQL("t.{}").format(sql.Identifier(c)) for c in values)
+            ))
+            counts['updated'] = cursor.rowcount
+
+        cursor.execute(sql.SQL(
+            "INSERT INTO {target} ({cols}) SELECT {cols} FROM {stage} s "
+            "WHERE NOT EXISTS (SELECT 1 FROM {target} t WHERE {keys})"
+        ).format(target=target, stage=staged, cols=column_list, keys=keys))
+        counts['inserted'] = cursor.rowcount
+
+        if delete_missing:
+            cursor.execute(sql.SQL(
+                "DELETE FROM {target} t WHERE NOT EXISTS (SELECT 1 FROM {stage} s WHERE {keys})"
+            ).format(target=target, stage=staged, keys=keys))
+            counts['deleted'] = cursor.rowcount
+        return counts
+
+    def resolve_reference(self, cursor, table: str, stage: str, field: str, column: str, ref_table: str,
+                          ref_key: str) -> int:
+        """스테이징 행의 자연 키(field)를 참조 테이블의 id로 바꿔 column에 채웁니다. (찾지 못한 행은 NULL)"""
+        staged, target, source = sql.Identifier(stage), sql.Identifier(column), sql.Identifier(field)
+        cursor.execute(sql.SQL(
+            "UPDATE {stage} s SET {target} = r.id FROM {ref_table} r WHERE r.{ref_key} = s.{source}"
+        ).format(stage=staged, target=target, source=source,
+                 ref_table=sql.Identifier(ref_table), ref_key=sql.Identifier(ref_key)))
+        resolved = cursor.rowcount
+
+        cursor.execute(sql.SQL("SELECT count(*) FROM {stage} WHERE {source} IS NOT NULL AND {target} IS NULL").format(
+            stage=staged, target=target, source=source))
+        unresolved = cursor.fetchone()[0]
+        if unresolved:
+            logger.warning(f"{table}: {ref_table}.{ref_key}에 없는 {field} 값 {unresolved}행의 {column}은 NULL로 둡니다.")
+        return resolved
+
+    def load_into(self, cursor, table: str, rows: List[Dict], key_columns: Optional[Sequence[str]] = None,
+                  delete_missing: bool = False) -> Dict[str, int]:
+        """열린 트랜잭션 안에서 테이블 하나를 스테이징 후 병합합니다."""
+        key_columns = tuple(key_columns or TABLE_KEYS[table])
+        target_types = self.table_columns(cursor, table)
+        present = {column for row in rows for column in row}
+        references = [reference for reference in NATURAL_KEY_REFERENCES.get(table, []) if reference[0] in present]
+        referenced = {column for _, column, _, _ in references}
+        columns = [column for column in target_types
+                   if column in present or column in key_columns or column in referenced]
+        ignored = present - set(target_types) - {field for field, _, _, _ in references}
+        if ignored:
+            logger.warning(f"{table}: 테이블에 없는 필드는 제외: {', '.join(sorted(ignored))}")
+
+        # 대상과 같은 타입의 컬럼만 가진 임시 테이블 (serial 기본값은 가져오지 않음)
+        stage = f"_stage_{table}"
+        cursor.execute(sql.SQL("CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA").format(
+            sql.Identifier(stage), sql.SQL(', ').join(map(sql.Identifier, columns)), sql.Identifier(table)))
+        # 자연 키 필드는 스테이징에만 두고 병합 대상 컬럼에서는 제외
+        copy_columns, copy_types = list(columns), [target_types[c] for c in columns]
+        for field, _, ref_table, ref_key in references:
+            ref_type = self.table_columns(cursor, ref_table)[ref_key]
+            cursor.execute(sql.SQL("ALTER TABLE {} ADD COLUMN {} {}").format(
+                sql.Identifier(stage), sql.Identifier(field), sql.SQL(ref_type)))
+            copy_columns.append(field)
+            copy_types.append(ref_type)
+
+        started = time.perf_counter()
+        staged = self.copy_rows(cursor, stage, copy_columns, copy_types, rows)
+        # 임시 테이블은 자동 통계 수집 대상이 아니므로 병합 조인 계획을 위해 직접 수집
+        cursor.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(stage)))
+        # 같은 키가 여러 번 나오면 UPDATE 결과가 모호하므로 마지막 행만 남김
+        cursor.execute(sql.SQL(
+            "DELETE FROM {stage} a USING {stage} b WHERE a.ctid < b.ctid AND {keys}"
+        ).format(stage=sql.Identifier(stage), keys=sql.SQL(' AND ').join(
+            sql.SQL("a.{0} = b.{0}").format(sql.Identifier(column)) for column in key_columns)))
+        for reference in references:
+            self.resolve_reference(cursor, table, stage, *reference)
+        counts = self.merge(cursor, table, stage, columns, key_columns, delete_missing)
+        counts['staged'] = staged
+
+        logger.info(f"{table}: COPY {staged}행 ({time.perf_counter() - started:.2f}초) → "
+                    f"UPDATE {counts['updated']} / INSERT {counts['inserted']} / DELETE {counts['deleted']}")
+        return counts
+
+    def load_tables(self, loads: Sequence[Tuple[str, List[Dict]]], delete_missing: bool = False) -> Dict[str, Dict[str, int]]:
+        """(테이블, 행) 목록을 순서대로 한 트랜잭션에 적재합니다. 하나라도 실패하면 모두 롤백됩니다."""
+        results = {}
+        started = time.perf_counter()
+        with psycopg.connect(self.database_url) as connection:
+            with connection.cursor() as cursor:
+                for table, rows in loads:
+                    results[table] = self.load_into(cursor, table, rows, delete_missing=delete_missing)
+        logger.info(f"COPY 적재 커밋 완료: {len(results)}개 테이블, {time.perf_counter() - started:.2f}초")
+        return results
+
+    def load_table(self, table: str, rows: List[Dict], key_columns: Optional[Sequence[str]] = None,
+                   delete_missing: bool = False) -> Dict[str, int]:
+        """테이블 하나를 COPY로 적재합니다. (delete_missing이면 rows에 없는 행은 삭제)"""
+        with psycopg.connect(self.database_url) as connection:
+            with connection.cursor() as cursor:
+                return self.load_into(cursor, table, rows, key_columns, delete_missing)
@@ -0,0 +1,156 @@
+"""
+호스트별 적응형 요청 속도 제한기
+토큰 버킷으로 요청 간격을 맞추고, 서버 응답(2xx/304 응답 속도, 429/503, Retry-After)에 따라 속도를 조절합니다.
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from config.data_sources_config import DATA_SOURCE_CONFIGS, ScrapingConfig
+
+# 서버가 속도를 줄이라고 알려주는 상태 코드
+THROTTLE_STATUS_CODES = (429, 503)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환합니다."""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class HostRateLimiter:
+    """단일 호스트용 적응형 토큰 버킷"""
+
+    def __init__(self, delay: float, burst: int = 1, fast_response: float = 1.0,
+                 increase_after: int = 5, max_speedup: float = 10.0, max_delay: float = 60.0):
+        delay = max(delay, 0.01)
+        self.base_rate = 1.0 / delay
+        self.rate = self.base_rate
+        self.min_rate = 1.0 / max_delay
+        self.max_rate = self.base_rate * max_speedup
+        self.capacity = float(burst)
+        self.fast_response = fast_response
+        self.increase_after = increase_after
+
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.success_streak = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """경과 시간만큼 토큰을 채웁니다. (차단 구간에는 채우지 않음)"""
+        start = max(self.updated_at, self.blocked_until)
+        if now > start:
+            self.tokens = min(self.capacity, self.tokens + (now - start) * self.rate)
+        self.updated_at = max(self.updated_at, now)
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고 기다려야 할 시간(초)을 반환합니다."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+
+            wait = max(0.0, self.blocked_until - now)
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            return wait
+
+    def wait(self):
+        """요청을 보내도 될 때까지 대기합니다."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def wait_async(self):
+        """요청을 보내도 될 때까지 비동기로 대기합니다."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record(self, status: Optional[int], elapsed: float, retry_after: Optional[str] = None):
+        """응답 결과를 반영해 요청 속도를 조절합니다. (status가 None이면 연결 오류)"""
+        with self.lock:
+            retry_seconds = parse_retry_after(retry_after)
+
+            if status in THROTTLE_STATUS_CODES or retry_seconds is not None:
+                # 서버가 제한을 알림: 속도를 절반으로 줄이고 Retry-After 동안 차단
+                self.rate = max(self.min_rate, self.rate * 0.5)
+                self.success_streak = 0
+                self.tokens = min(self.tokens, 0.0)
+                if retry_seconds is not None:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + retry_seconds)
+            elif status is None or status >= 500:
+                self.rate = max(self.min_rate, self.rate * 0.75)
+                self.success_streak = 0
+            elif (200 <= status < 300 or status == 304) and elapsed <= self.fast_response:
+                # 빠른 2xx(와 재검증 304) 응답이 이어지면 조금씩 속도를 올림
+                self.success_streak += 1
+                if self.success_streak >= self.increase_after:
+                    self.rate = min(self.max_rate, self.rate + self.base_rate * 0.1)
+                    self.success_streak = 0
+            else:
+                self.success_streak = 0
+
+    @property
+    def current_delay(self) -> float:
+        """현재 요청 간격(초)"""
+        return 1.0 / self.rate
+
+class RateLimiterRegistry:
+    """호스트별 속도 제한기를 공유하는 레지스트리"""
+
+    def __init__(self, default_delay: Optional[float] = None):
+        self.default_delay = default_delay if default_delay is not None else ScrapingConfig().delay
+        self.limiters: Dict[str, HostRateLimiter] = {}
+        self.lock = threading.Lock()
+
+    def get_host_delay(self, host: str) -> float:
+        """DataSourceConfig에서 호스트의 기본 요청 간격을 찾습니다."""
+        for source_config in DATA_SOURCE_CONFIGS.values():
+            if source_config.base_url and urlparse(source_config.base_url).netloc == host:
+                return source_config.scraping_config.delay
+        return self.default_delay
+
+    def get(self, url: str) -> HostRateLimiter:
+        """URL의 호스트에 해당하는 속도 제한기를 반환합니다."""
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.limiters:
+                self.limiters[host] = HostRateLimiter(self.get_host_delay(host))
+            return self.limiters[host]
+
+    def wait(self, url: str):
+        """URL 호스트의 요청 가능 시점까지 대기합니다."""
+        self.get(url).wait()
+
+    async def wait_async(self, url: str):
+        """URL 호스트의 요청 가능 시점까지 비동기로 대기합니다."""
+        await self.get(url).wait_async()
+
+    def record(self, url: str, status: Optional[int], elapsed: float, retry_after: Optional[str] = None):
+        """URL 호스트의 응답 결과를 기록합니다."""
+        self.get(url).record(status, elapsed, retry_after)
+
+    def record_response(self, url: str, response):
+        """requests 응답 객체의 결과를 기록합니다."""
+        self.record(url, response.status_code, response.elapsed.total_seconds(),
+                    response.headers.get('Retry-After'))
+
+# 모든 스크래퍼가 공유하는 기본 레지스트리
+rate_limiters = RateLimiterRegistry()
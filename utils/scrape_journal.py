@@ -0,0 +1,92 @@
+"""
+메트릭 처리 결과를 위한 추가 전용(JSONL) 체크포인트 저널
+"""
+import json
+import os
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+def metric_key(metric: Dict) -> str:
+    """저널에서 메트릭을 구분하는 키 (data_id, 없으면 detail_url)"""
+    return metric.get('data_id') or metric.get('detail_url', '')
+
+def write_json_atomic(data: Any, filename: str, indent: Optional[int] = 2):
+    """임시 파일에 쓴 뒤 이름을 바꿔 JSON 파일을 원자적으로 저장합니다."""
+    path = Path(filename)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def ends_with_partial_line(path: Path) -> bool:
+    """파일이 줄바꿈 없이 끝나는지 (쓰다 만 마지막 줄이 있는지) 확인합니다."""
+    try:
+        with open(path, 'rb') as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+    except OSError:
+        return False
+
+class ScrapeJournal:
+    """처리된 메트릭을 한 줄씩 추가 기록하는 저널"""
+
+    def __init__(self, filename: str = "data_temp/final_metrics_journal.jsonl"):
+        self.path = Path(filename)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = None
+
+    def load(self) -> Dict[str, Dict]:
+        """저널을 재생해 키별 마지막 처리 결과를 반환합니다."""
+        records = {}
+        if not self.path.exists():
+            return records
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    metric = json.loads(line)
+                except json.JSONDecodeError:
+                    # 비정상 종료로 잘린 마지막 줄은 무시
+                    logger.warning(f"저널 {line_num}번째 줄을 읽을 수 없어 건너뜁니다.")
+                    continue
+                records[metric_key(metric)] = metric
+
+        return records
+
+    def open(self, resume: bool = False):
+        """저널을 엽니다. resume이 아니면 기존 기록을 비웁니다."""
+        self.close()
+        torn = resume and ends_with_partial_line(self.path)
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        if torn:
+            # 비정상 종료로 잘린 마지막 줄 뒤에 이어 쓰면 다음 기록까지 읽을 수 없게 되므로 줄을 끝냄
+            self.file.write('\n')
+
+    def append(self, metric: Dict):
+        """처리된 메트릭 하나를 기록합니다."""
+        if self.file is None:
+            self.open(resume=True)
+        self.file.write(json.dumps(metric, ensure_ascii=False) + '\n')
+
+    def sync(self):
+        """버퍼를 비우고 디스크에 확실히 기록합니다. (배치 경계에서 호출)"""
+        if self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        """저널을 닫습니다."""
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
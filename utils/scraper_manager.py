@@ -2,6 +2,8 @@
 스크래퍼 관리자 - 여러 스크래퍼를 통합 관리
 """
 import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from config.settings import SUPPORTED_SCRAPERS, DATA_DIR
@@ -13,6 +15,7 @@ class ScraperManager:
     def __init__(self):
         self.scrapers: Dict[str, BaseScraper] = {}
         self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
     
     def register_scraper(self, scraper_type: str, scraper_instance: BaseScraper):
         """스크래퍼 등록"""
@@ -47,21 +50,112 @@ class ScraperManager:
         self.results[scraper_type] = result
         return result
     
-    def run_all(self, scraper_types: List[str], **kwargs) -> Dict[str, Any]:
-        """여러 스크래퍼 순차 실행"""
-        print(f"🔄 {len(scraper_types)}개 스크래퍼 실행 시작")
-        all_results = {}
+    def build_dependency_graph(self, scraper_types: List[str]) -> Dict[str, List[str]]:
+        """SUPPORTED_SCRAPERS의 inputs/outputs로 스크래퍼별 선행 스크래퍼 목록을 만듭니다."""
+        producers = {}
+        for scraper_type in scraper_types:
+            for output in SUPPORTED_SCRAPERS.get(scraper_type, {}).get('outputs', []):
+                producers[output] = scraper_type
         
+        # 실행 대상에 생산자가 없는 입력은 기존 파일을 그대로 사용
+        graph = {}
         for scraper_type in scraper_types:
-            result = self.run_scraper(scraper_type, **kwargs)
-            if result:
-                all_results[scraper_type] = result
-                print(f"✅ {scraper_type} 완료")
-            else:
-                print(f"❌ {scraper_type} 실패")
+            inputs = SUPPORTED_SCRAPERS.get(scraper_type, {}).get('inputs', [])
+            graph[scraper_type] = sorted({producers[i] for i in inputs if i in producers and producers[i] != scraper_type})
+        
+        # 순환 의존성 확인 (위상 정렬)
+        remaining = {k: set(v) for k, v in graph.items()}
+        while remaining:
+            ready = [k for k, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"스크래퍼 입력/출력에 순환 의존성이 있습니다: {sorted(remaining)}")
+            for k in ready:
+                del remaining[k]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        
+        return graph
+    
+    def critical_path(self, graph: Dict[str, List[str]]) -> List[str]:
+        """실행 시간 기준 가장 긴 의존성 체인을 반환합니다."""
+        longest: Dict[str, tuple] = {}
+        
+        def visit(scraper_type: str) -> tuple:
+            if scraper_type not in longest:
+                chains = [visit(dep) for dep in graph[scraper_type] if dep in self.timings]
+                elapsed, chain = max(chains, default=(0.0, []))
+                longest[scraper_type] = (elapsed + self.timings.get(scraper_type, 0.0), chain + [scraper_type])
+            return longest[scraper_type]
+        
+        _, chain = max((visit(t) for t in graph if t in self.timings), default=(0.0, []))
+        return chain
+    
+    def run_all(self, scraper_types: List[str], max_workers: int = 4, **kwargs) -> Dict[str, Any]:
+        """여러 스크래퍼를 의존성(DAG) 순서에 맞춰 병렬 실행"""
+        graph = self.build_dependency_graph(scraper_types)
+        print(f"🔄 {len(scraper_types)}개 스크래퍼 실행 시작 (최대 {max_workers}개 동시 실행)")
+        all_results = {}
+        failed = set()
+        waiting = dict(graph)
+        started_at = time.time()
+        
+        def run_timed(scraper_type: str):
+            start = time.time()
+            try:
+                return self.run_scraper(scraper_type, **kwargs)
+            except Exception as e:
+                print(f"❌ {scraper_type} 실행 오류: {e}")
+                return None
+            finally:
+                self.timings[scraper_type] = time.time() - start
         
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+            while waiting or running:
+                # 선행 스크래퍼가 실패한 스크래퍼는 건너뜀
+                for scraper_type, deps in list(waiting.items()):
+                    if failed.intersection(deps):
+                        print(f"⏭️  {scraper_type} 건너뜀 (선행 스크래퍼 실패: {', '.join(sorted(failed.intersection(deps)))})")
+                        failed.add(scraper_type)
+                        del waiting[scraper_type]
+                
+                # 입력이 모두 준비된 스크래퍼를 바로 시작
+                for scraper_type, deps in list(waiting.items()):
+                    if all(dep in all_results for dep in deps):
+                        running[executor.submit(run_timed, scraper_type)] = scraper_type
+                        del waiting[scraper_type]
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    scraper_type = running.pop(future)
+                    result = future.result()
+                    if result:
+                        all_results[scraper_type] = result
+                        print(f"✅ {scraper_type} 완료 ({self.timings[scraper_type]:.2f}초)")
+                    else:
+                        failed.add(scraper_type)
+                        print(f"❌ {scraper_type} 실패")
+        
+        self.print_run_report(graph, time.time() - started_at)
         return all_results
     
+    def print_run_report(self, graph: Dict[str, List[str]], wall_time: float):
+        """스크래퍼별 실행 시간과 임계 경로를 출력합니다."""
+        print("\n⏱️  스크래퍼별 실행 시간:")
+        for scraper_type in graph:
+            if scraper_type in self.timings:
+                deps = f" (선행: {', '.join(graph[scraper_type])})" if graph[scraper_type] else ""
+                print(f"  {scraper_type}: {self.timings[scraper_type]:.2f}초{deps}")
+        
+        chain = self.critical_path(graph)
+        critical_time = sum(self.timings[t] for t in chain)
+        sequential_time = sum(self.timings.get(t, 0.0) for t in graph)
+        print(f"🧭 임계 경로: {' → '.join(chain) or '-'} ({critical_time:.2f}초)")
+        print(f"📊 전체 소요 시간: {wall_time:.2f}초 (순차 실행 시 {sequential_time:.2f}초)")
+    
     def get_available_scrapers(self) -> List[str]:
         """사용 가능한 스크래퍼 목록 반환"""
         return list(SUPPORTED_SCRAPERS.keys())
@@ -1,6 +1,7 @@
 """
 SDGs 데이터 하이브리드 관리 시스템
 """
+import argparse
 import json
 import shutil
 from pathlib import Path
@@ -130,8 +131,8 @@ class SDGsManager:
             )
             self.catalog.register_data_file(framework_file)
     
-    def generate_supabase_import_data(self) -> Dict[str, Any]:
-        """Supabase 임포트용 데이터 생성"""
+    def generate_supabase_import_data(self, bulk_load: bool = False, database_url: Optional[str] = None) -> Dict[str, Any]:
+        """Supabase 임포트용 데이터 생성 (bulk_load이면 DATABASE_URL로 sdg_* 테이블에 COPY 적재까지 수행)"""
         print("🔄 Supabase 임포트용 데이터 생성 중...")
         
         # 분석 데이터 로드
@@ -154,7 +155,8 @@ class SDGsManager:
         for metadata in analysis_data.get("metadata_files", []):
             indicator = {
                 "indicator_id": metadata["indicator_id"],
-                "goal_id": int(metadata["goal"]) if metadata["goal"].isdigit() else None,
+                # sdg_goals의 serial id가 아닌 목표 번호 (적재 시 sdg_goals.goal_number로 goal_id를 찾음)
+                "goal_number": int(metadata["goal"]) if metadata["goal"].isdigit() else None,
                 "title": metadata["title"],
                 "description": f"SDG 지표 {metadata['indicator_id']} 메타데이터"
             }
@@ -190,7 +192,26 @@ class SDGsManager:
             json.dump(supabase_data, f, ensure_ascii=False, indent=2)
         
         print(f"✅ Supabase 형식 데이터 생성됨: {supabase_file}")
+
+        if bulk_load:
+            self._bulk_load(supabase_data, database_url)
         return supabase_data
+
+    def _bulk_load(self, supabase_data: Dict[str, Any], database_url: Optional[str] = None):
+        """생성한 데이터를 COPY로 sdg_* 테이블에 한 트랜잭션으로 적재"""
+        from utils.pg_bulk_loader import PostgresBulkLoader
+
+        print("🚚 sdg_* 테이블에 COPY 적재 중...")
+        # 메타데이터 파일은 지표를 참조하므로 지표 다음에 적재
+        loads = [(table, supabase_data[table]) for table in ("sdg_indicators", "sdg_metadata_files", "sdg_framework_data")
+                 if supabase_data.get(table)]
+        try:
+            results = PostgresBulkLoader(database_url).load_tables(loads)
+        except Exception as e:
+            print(f"❌ COPY 적재 실패 (변경 사항은 모두 롤백됨): {e}")
+            return
+        for table, counts in results.items():
+            print(f"  ✅ {table}: 변경 {counts['updated']} / 추가 {counts['inserted']}")
     
     def get_file_access_info(self) -> Dict[str, Any]:
         """파일 접근 정보 제공"""
@@ -214,6 +235,11 @@ class SDGsManager:
         }
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='SDGs 데이터 하이브리드 관리')
+    parser.add_argument('--copy', action='store_true',
+                        help='생성한 데이터를 DATABASE_URL로 sdg_* 테이블에 바로 COPY 적재 (psycopg 필요)')
+    args = parser.parse_args()
+
     manager = SDGsManager()
     
     print("🚀 SDGs 데이터 관리 시스템 시작...")
@@ -221,8 +247,8 @@ if __name__ == "__main__":
     # 1. 마이그레이션 실행
     manager.migrate_to_structured_storage()
     
-    # 2. Supabase 임포트 데이터 생성
-    supabase_data = manager.generate_supabase_import_data()
+    # 2. Supabase 임포트 데이터 생성 (--copy: DATABASE_URL로 sdg_* 테이블에 바로 적재)
+    supabase_data = manager.generate_supabase_import_data(bulk_load=args.copy)
     
     # 3. 접근 정보 출력
     access_info = manager.get_file_access_info()
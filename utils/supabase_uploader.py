@@ -3,13 +3,22 @@
 변환된 데이터를 Supabase에 업로드하는 도구
 """
 
+import argparse
+import hashlib
 import json
 import os
-import requests
+import time
 from datetime import datetime
 import logging
-from typing import Dict, List, Optional
-from convert_to_supabase import load_env_file
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import requests
+from pathlib import Path
+from utils.convert_to_supabase import FACT_TABLES, fact_table_filename, load_env_file, row_content_hash
+from utils.http_client import create_session
+from utils.pg_bulk_loader import TABLE_KEYS
+from utils.upload_ledger import UploadLedger
+from config.settings import UPLOAD_CONFIG
 
 # 로깅 설정
 logging.basicConfig(
@@ -22,6 +31,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 배치를 나눠 다시 보낼 응답 코드 (본문 초과, 요청 제한, 일시적인 서버 오류)
+RETRYABLE_UPLOAD_STATUS = (413, 429, 500, 502, 503, 504)
+# 일부 행 때문에 배치 전체가 거절되는 응답 코드 (잘못된 값, upsert 중 키 충돌) - 한 행이 될 때까지 나눠 문제 행만 실패 처리
+ISOLATE_UPLOAD_STATUS = (400, 409)
+
+def in_list(values: List[str]) -> str:
+    """PostgREST in./not.in. 필터에 넣을 따옴표로 감싼 값 목록"""
+    return ','.join('"{}"'.format(str(value).replace('"', '\\"')) for value in values)
+
+def bucket_checksum(rows: List[Tuple[str, str]]) -> str:
+    """(data_id, content_hash) 목록의 구간 체크섬 (SQL 함수 iris_metrics_checksums와 같은 방식)"""
+    # COLLATE "C"의 바이트 순서는 UTF-8 문자열의 코드 포인트 순서와 같음
+    joined = ','.join(f"{data_id}:{content_hash}" for data_id, content_hash in sorted(rows))
+    return hashlib.md5(joined.encode('utf-8')).hexdigest()
+
 class SupabaseUploader:
     def __init__(self):
         """Supabase 업로더 초기화"""
@@ -38,11 +62,19 @@ class SupabaseUploader:
             'Content-Type': 'application/json',
             'Prefer': 'return=minimal'
         }
+        # 배치마다 새 TLS 연결을 맺지 않도록 연결을 재사용하는 공유 세션 (동시 요청 수만큼 연결 유지)
+        self.session = create_session(headers=self.headers, name='supabase',
+                                      pool_maxsize=max(UPLOAD_CONFIG['concurrency'], 1))
+        self.batch_latencies: List[float] = []
+        # 마지막 post_rows에서 재시도 후에도 올리지 못한 행
+        self.failed_rows: List[Dict] = []
+        # 설정되면 행마다 업로드 결과를 기록 (--resume, dead-letter)
+        self.ledger: Optional[UploadLedger] = None
     
     def test_connection(self) -> bool:
         """Supabase 연결 테스트"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/iris_metrics?limit=1",
                 headers=self.headers
             )
@@ -60,7 +92,7 @@ class SupabaseUploader:
         """테이블이 없으면 생성 (SQL 파일 실행 안내)"""
         logger.info("테이블 존재 확인 중...")
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/iris_metrics?limit=1",
                 headers=self.headers
             )
@@ -81,7 +113,7 @@ class SupabaseUploader:
     def clear_existing_data(self) -> bool:
         """기존 데이터 삭제 (선택사항)"""
         try:
-            response = requests.delete(
+            response = self.session.delete(
                 f"{self.api_url}/iris_metrics",
                 headers=self.headers
             )
@@ -95,75 +127,445 @@ class SupabaseUploader:
             logger.error(f"데이터 삭제 오류: {e}")
             return False
     
-    def upload_batch(self, metrics: List[Dict], batch_size: int = 50) -> int:
-        """배치 단위로 데이터 업로드"""
-        total_uploaded = 0
-        total_batches = (len(metrics) + batch_size - 1) // batch_size
-        
-        for i in range(0, len(metrics), batch_size):
-            batch = metrics[i:i + batch_size]
-            batch_num = i // batch_size + 1
-            
-            logger.info(f"배치 {batch_num}/{total_batches} 업로드 중 ({len(batch)}개)")
-            
-            try:
-                response = requests.post(
-                    f"{self.api_url}/iris_metrics",
-                    headers=self.headers,
-                    json=batch
-                )
-                
-                if response.status_code in [200, 201]:
-                    total_uploaded += len(batch)
-                    logger.info(f"배치 {batch_num} 업로드 성공")
-                else:
-                    logger.error(f"배치 {batch_num} 업로드 실패: {response.status_code}")
-                    logger.error(f"응답: {response.text}")
-                    
-            except Exception as e:
-                logger.error(f"배치 {batch_num} 업로드 오류: {e}")
-        
-        return total_uploaded
+    def build_batches(self, rows: List[Dict], target_bytes: int, max_rows: int) -> List[List[Tuple[Dict, bytes]]]:
+        """행을 한 번만 JSON으로 직렬화해 요청 본문이 목표 바이트 크기를 넘지 않도록 (행, 직렬화 결과) 배치로 묶습니다."""
+        batches, current, current_bytes = [], [], 2
+        for row in rows:
+            # requests의 json=과 같은 형식 (ASCII 이스케이프)
+            encoded = json.dumps(row).encode('utf-8')
+            if current and (current_bytes + len(encoded) + 1 > target_bytes or len(current) >= max_rows):
+                batches.append(current)
+                current, current_bytes = [], 2
+            current.append((row, encoded))
+            current_bytes += len(encoded) + 1
+        if current:
+            batches.append(current)
+        return batches
+
+    def send_batch(self, table: str, batch: List[Tuple[Dict, bytes]], label: str, params: Optional[Dict] = None,
+                   headers: Optional[Dict] = None, attempt: int = 0) -> int:
+        """배치 하나를 보냅니다. 413/429/5xx는 백오프 후 반으로 나눠 다시 보내고,
+        400/409는 문제 행만 골라내도록 나눠서 보냅니다. 성공한 행 수를 반환합니다."""
+        body = b'[' + b','.join(encoded for _, encoded in batch) + b']'
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self.session.post(f"{self.api_url}/{table}", headers=headers or self.headers,
+                                         params=params, data=body)
+            status = response.status_code
+        except requests.RequestException as e:
+            logger.warning(f"배치 {label} 요청 오류: {e}")
+            status = None
+        elapsed = time.perf_counter() - started
+        self.batch_latencies.append(elapsed)
+
+        if status in (200, 201):
+            logger.info(f"배치 {label} 업로드 성공 ({len(batch)}행, {len(body) / 1024:.0f}KB, {elapsed * 1000:.0f}ms)")
+            if self.ledger:
+                self.ledger.record(table, [row for row, _ in batch], status, label)
+            return len(batch)
+
+        # 일반 삽입의 409는 이미 있는 행과 겹친다는 뜻이라 나눠 봐야 거의 모든 행이 다시 409가 되므로 배치 실패로 처리
+        isolate = status in ISOLATE_UPLOAD_STATUS and (status != 409 or bool(params and params.get('on_conflict')))
+        if isolate and len(batch) > 1:
+            # 잘못된 행 하나 때문에 배치 전체가 거절되므로 나눠서 문제 행만 남김
+            middle = len(batch) // 2
+            logger.warning(f"배치 {label} 응답 {status} - 문제 행을 찾기 위해 나눠서 재전송")
+            return (self.send_batch(table, batch[:middle], f"{label}a", params, headers, attempt) +
+                    self.send_batch(table, batch[middle:], f"{label}b", params, headers, attempt))
+
+        retryable = status is None or status in RETRYABLE_UPLOAD_STATUS
+        # 한 행짜리 413은 더 나눌 수 없으므로 재시도하지 않음
+        exhausted = attempt >= UPLOAD_CONFIG['max_retries'] if status != 413 else len(batch) == 1
+        if not retryable or exhausted:
+            logger.error(f"배치 {label} 업로드 실패: {status} ({len(batch)}행, {len(body) / 1024:.0f}KB)")
+            error = response.text[:2000] if response is not None else 'connection error'
+            logger.error(f"응답: {error[:500]}")
+            self.failed_rows.extend(row for row, _ in batch)
+            if self.ledger:
+                self.ledger.record(table, [row for row, _ in batch], status, label, error)
+            return 0
+
+        # 413은 크기 문제이므로 기다리지 않고 바로 나눔, 429는 Retry-After를 따름
+        delay = 0.0 if status == 413 else UPLOAD_CONFIG['retry_backoff'] * (2 ** attempt)
+        if status == 429 and response.headers.get('Retry-After', '').isdigit():
+            delay = float(response.headers['Retry-After'])
+        logger.warning(f"배치 {label} 응답 {status} - {delay:.1f}초 후 나눠서 재시도")
+        time.sleep(delay)
+
+        # 413으로 나누는 횟수는 배치 크기로 제한되므로 재시도 횟수에 포함하지 않음
+        next_attempt = attempt if status == 413 else attempt + 1
+        if len(batch) == 1:
+            return self.send_batch(table, batch, label, params, headers, next_attempt)
+        middle = len(batch) // 2
+        return (self.send_batch(table, batch[:middle], f"{label}a", params, headers, next_attempt) +
+                self.send_batch(table, batch[middle:], f"{label}b", params, headers, next_attempt))
+
+    def post_rows(self, table: str, rows: List[Dict], max_rows: Optional[int] = None,
+                  on_conflict: Optional[str] = None, target_bytes: Optional[int] = None,
+                  concurrency: Optional[int] = None) -> int:
+        """행을 바이트 크기 기준 배치로 나눠 동시에 보냅니다. (on_conflict가 있으면 해당 키 기준 upsert)"""
+        target_bytes = target_bytes or UPLOAD_CONFIG['batch_target_bytes']
+        max_rows = max_rows or UPLOAD_CONFIG['max_batch_rows']
+        concurrency = concurrency or UPLOAD_CONFIG['concurrency']
+        params = {'on_conflict': on_conflict} if on_conflict else None
+        headers = {**self.headers, 'Prefer': 'resolution=merge-duplicates,return=minimal'} if on_conflict else self.headers
+
+        batches = self.build_batches(rows, target_bytes, max_rows)
+        total_bytes = sum(len(encoded) + 1 for batch in batches for _, encoded in batch)
+        logger.info(f"{table}: {len(rows)}행을 {len(batches)}개 배치로 업로드 "
+                    f"(목표 {target_bytes / 1024:.0f}KB, 동시 요청 {concurrency}개)")
+
+        self.batch_latencies = []
+        self.failed_rows = []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(self.send_batch, table, batch, f"{i}/{len(batches)}", params, headers)
+                for i, batch in enumerate(batches, 1)
+            ]
+            uploaded = sum(future.result() for future in futures)
+        elapsed = time.perf_counter() - started
+        if self.ledger:
+            self.ledger.sync()
+
+        if self.batch_latencies:
+            latencies = sorted(self.batch_latencies)
+            logger.info(f"{table}: {uploaded}/{len(rows)}행 업로드, {elapsed:.1f}초 "
+                        f"({uploaded / elapsed if elapsed else 0:.0f}행/초, {total_bytes / 1024 / 1024 / elapsed if elapsed else 0:.2f}MB/초), "
+                        f"배치 지연 p50 {latencies[len(latencies) // 2] * 1000:.0f}ms / 최대 {latencies[-1] * 1000:.0f}ms")
+        return uploaded
+
+    def upload_batch(self, metrics: List[Dict], batch_size: Optional[int] = None, upsert: bool = False) -> int:
+        """배치 단위로 데이터 업로드 (batch_size: 배치당 최대 행 수, upsert이면 data_id가 같은 행을 덮어씀)"""
+        return self.post_rows('iris_metrics', metrics, max_rows=batch_size, on_conflict='data_id' if upsert else None)
     
     def load_converted_data(self, filename: str = "data/iris_metrics_supabase_format.json") -> List[Dict]:
-        """변환된 데이터 로드"""
+        """변환된 데이터 로드 (.jsonl은 스트리밍 변환 결과, 한 줄에 메트릭 하나)"""
         try:
             with open(filename, 'r', encoding='utf-8') as f:
+                if filename.endswith('.jsonl'):
+                    return [json.loads(line) for line in f if line.strip()]
                 data = json.load(f)
                 return data.get('metrics', [])
         except Exception as e:
             logger.error(f"데이터 로드 실패: {e}")
             return []
     
-    def verify_upload(self, expected_count: int) -> bool:
-        """업로드 검증"""
+    def load_fact_tables(self, filename: str = "data/iris_metrics_supabase_format.json") -> Dict[str, List[Dict]]:
+        """변환 결과 옆에 저장된 팩트 테이블 JSONL을 로드합니다. (파일이 없는 테이블은 제외)"""
+        fact_tables = {}
+        for table in FACT_TABLES:
+            path = Path(fact_table_filename(filename, table))
+            if not path.exists():
+                logger.warning(f"팩트 테이블 파일 없음: {path}")
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                fact_tables[table] = [json.loads(line) for line in f if line.strip()]
+        return fact_tables
+
+    def delete_by_data_ids(self, table: str, data_ids: List[str], chunk_size: int = 100,
+                           filters: Optional[Dict[str, str]] = None) -> int:
+        """data_id 목록에 해당하는 행을 나눠서 삭제합니다. (filters는 함께 적용할 PostgREST 조건)
+        삭제 요청이 성공한 data_id 수를 반환합니다."""
+        deleted = 0
+        for i in range(0, len(data_ids), chunk_size):
+            chunk = data_ids[i:i + chunk_size]
+            try:
+                response = self.session.delete(
+                    f"{self.api_url}/{table}",
+                    headers=self.headers,
+                    params={**(filters or {}), 'data_id': f'in.({in_list(chunk)})'}
+                )
+            except requests.RequestException as e:
+                logger.error(f"{table} 행 삭제 오류: {e}")
+                break
+            if response.status_code not in [200, 204]:
+                logger.error(f"{table} 행 삭제 실패: {response.status_code} - {response.text}")
+                break
+            deleted += len(chunk)
+        return deleted
+
+    def fetch_remote_hashes(self, page_size: int = 1000) -> Optional[Dict[str, Optional[str]]]:
+        """서버의 (data_id, content_hash)를 data_id 순 키셋 페이지로 가져옵니다. (실패하면 None)"""
+        remote = {}
+        last_id = None
         try:
-            response = requests.get(
-                f"{self.api_url}/iris_metrics?select=count",
-                headers=self.headers
+            while True:
+                params = {'select': 'data_id,content_hash', 'order': 'data_id.asc', 'limit': page_size}
+                if last_id is not None:
+                    params['data_id'] = f'gt.{last_id}'
+                response = self.session.get(f"{self.api_url}/iris_metrics", headers=self.headers, params=params)
+                if response.status_code != 200:
+                    logger.error(f"서버 해시 조회 실패: {response.status_code} - {response.text}")
+                    return None
+
+                page = response.json()
+                for row in page:
+                    remote[row['data_id']] = row.get('content_hash')
+                if len(page) < page_size:
+                    break
+                last_id = page[-1]['data_id']
+        except Exception as e:
+            logger.error(f"서버 해시 조회 오류: {e}")
+            return None
+
+        logger.info(f"서버 해시 {len(remote)}개 조회")
+        return remote
+
+    def plan_sync(self, metrics: List[Dict], remote: Dict[str, Optional[str]]) -> Dict[str, List]:
+        """로컬 행과 서버 해시를 비교해 새 행, 바뀐 행, 그대로인 행, 사라진 행을 나눕니다."""
+        plan = {'new': [], 'changed': [], 'unchanged': [], 'removed': []}
+        local_ids = set()
+        for metric in metrics:
+            # 해시가 없는 예전 변환 결과도 비교할 수 있도록 여기서 계산
+            metric.setdefault('content_hash', row_content_hash(metric))
+            data_id = metric['data_id']
+            local_ids.add(data_id)
+            if data_id not in remote:
+                plan['new'].append(metric)
+            elif remote[data_id] != metric['content_hash']:
+                plan['changed'].append(metric)
+            else:
+                plan['unchanged'].append(metric)
+        plan['removed'] = [data_id for data_id in remote if data_id not in local_ids]
+        return plan
+
+    def sync_metrics(self, metrics: List[Dict], fact_tables: Optional[Dict[str, List[Dict]]] = None,
+                     delete_missing: bool = True, batch_size: Optional[int] = None) -> Optional[Dict[str, int]]:
+        """서버와의 차이만 반영합니다. 새로 생기거나 바뀐 행은 data_id 기준 upsert, 사라진 행만 삭제합니다."""
+        remote = self.fetch_remote_hashes()
+        if remote is None:
+            return None
+
+        plan = self.plan_sync(metrics, remote)
+        upserts = plan['new'] + plan['changed']
+        logger.info(f"동기화 계획: 신규 {len(plan['new'])} / 변경 {len(plan['changed'])} / "
+                    f"유지 {len(plan['unchanged'])} / 삭제 {len(plan['removed'])}")
+
+        upserted = self.upload_batch(upserts, batch_size=batch_size, upsert=True) if upserts else 0
+        # 팩트 행은 iris_metrics 삭제 시 CASCADE로 함께 지워짐
+        deleted = self.delete_by_data_ids('iris_metrics', plan['removed']) if delete_missing and plan['removed'] else 0
+
+        fact_result = {}
+        if fact_tables and upserts:
+            changed_ids = {metric['data_id'] for metric in upserts}
+            fact_result = self.upload_fact_tables(
+                {table: [row for row in rows if row['data_id'] in changed_ids] for table, rows in fact_tables.items()},
+                sorted(changed_ids)
             )
-            
-            if response.status_code == 200:
-                # Supabase count 방식
-                response = requests.get(
-                    f"{self.api_url}/iris_metrics?select=id&limit=1",
-                    headers={**self.headers, 'Prefer': 'count=exact'}
-                )
-                
-                if 'content-range' in response.headers:
-                    count_str = response.headers['content-range']
-                    actual_count = int(count_str.split('/')[-1])
-                    
-                    logger.info(f"업로드 검증: {actual_count}/{expected_count}")
-                    return actual_count == expected_count
-                    
+
+        if self.ledger:
+            # 서버와 같아 올리지 않은 행(과 그 팩트 행)도 원장에 성공으로 남겨 --resume이 다시 올리지 않게 함
+            records = self.ledger.load()
+            unchanged_ids = {metric['data_id'] for metric in plan['unchanged']}
+            self.ledger.acknowledge('iris_metrics', plan['unchanged'], records)
+            for table, rows in (fact_tables or {}).items():
+                self.ledger.acknowledge(table, [row for row in rows if row['data_id'] in unchanged_ids], records)
+            self.ledger.sync()
+
+        return {
+            'new': len(plan['new']),
+            'changed': len(plan['changed']),
+            'unchanged': len(plan['unchanged']),
+            'removed': len(plan['removed']),
+            'upserted': upserted,
+            'deleted': deleted,
+            'fact_tables': fact_result
+        }
+
+    def upload_fact_tables(self, fact_tables: Dict[str, List[Dict]], data_ids: List[str],
+                           batch_size: Optional[int] = None, delete_chunk: int = 100) -> Dict[str, Dict[str, int]]:
+        """업로드한 메트릭의 팩트 행을 교체합니다. 새 행을 전체 키 기준으로 먼저 upsert한 뒤
+        data_ids에서 새 행에 없는 키의 예전 행만 지우므로, 중간에 실패해도 메트릭의 팩트 행이 통째로 사라지지 않습니다.
+        테이블별 {'uploaded': 올린 행, 'failed': 못 올린 행, 'stale_failed': 예전 행을 정리하지 못한 data_id} 수를 반환합니다.
+        실패한 행은 원장에도 실패로 남아 --resume으로 다시 올릴 수 있습니다."""
+        result = {}
+        for table, rows in fact_tables.items():
+            uploaded = self.post_rows(table, rows, max_rows=batch_size, on_conflict=','.join(TABLE_KEYS[table]))
+            # 새 행을 못 올린 메트릭은 예전 행을 남겨 둠 (실패한 행은 원장에 남아 --resume이 upsert와 삭제를 다시 함)
+            upload_failed = {row['data_id'] for row in self.failed_rows}
+            stale_failed = sorted(upload_failed & set(data_ids)) + self.delete_stale_rows(
+                table, rows, [data_id for data_id in data_ids if data_id not in upload_failed], delete_chunk)
+            result[table] = {'uploaded': uploaded, 'failed': len(rows) - uploaded, 'stale_failed': len(stale_failed)}
+
+            if uploaded < len(rows) or stale_failed:
+                logger.error(f"{table} 업로드 실패: {len(rows) - uploaded}행 업로드 실패, "
+                             f"{len(stale_failed)}개 메트릭의 예전 행 삭제 실패")
+            logger.info(f"{table} 업로드: {uploaded}/{len(rows)}행")
+        return result
+
+    def delete_stale_rows(self, table: str, rows: List[Dict], data_ids: List[str], chunk_size: int = 100) -> List[str]:
+        """data_ids의 행 중 rows에 없는 키의 행만 삭제합니다. 삭제에 실패한 data_id 목록을 반환합니다.
+        실패한 data_id의 새 행은 원장에 실패로 기록해 --resume이 다시 올리고 예전 행을 지우게 합니다."""
+        value_column = TABLE_KEYS[table][-1]
+        kept = {data_id: set() for data_id in data_ids}
+        for row in rows:
+            kept.setdefault(row['data_id'], set()).add(str(row[value_column]))
+
+        # 남길 값 조합이 같은 data_id끼리 묶어 요청 수를 줄임 (조합 수는 메트릭 수보다 훨씬 적음)
+        groups = {}
+        for data_id in data_ids:
+            groups.setdefault(frozenset(kept[data_id]), []).append(data_id)
+
+        failed = []
+        for values, group in groups.items():
+            filters = {value_column: f'not.in.({in_list(sorted(values))})'} if values else None
+            deleted = self.delete_by_data_ids(table, group, chunk_size, filters)
+            failed.extend(group[deleted:])
+
+        if failed and self.ledger:
+            failed_ids = set(failed)
+            self.ledger.record(table, [row for row in rows if row['data_id'] in failed_ids], None, 'stale',
+                               f"예전 행 삭제 실패 (data_id {len(failed_ids)}개)")
+            self.ledger.sync()
+        return failed
+
+    def resume_upload(self, metrics: List[Dict], fact_tables: Optional[Dict[str, List[Dict]]] = None) -> Dict[str, int]:
+        """원장에 같은 내용으로 성공 기록이 없는 행만 upsert합니다. (중단되거나 일부 배치가 실패한 업로드 이어가기)"""
+        records = self.ledger.load()
+        pending = self.ledger.pending('iris_metrics', metrics, records)
+        result = {'pending': len(pending), 'skipped': len(metrics) - len(pending)}
+        result['upserted'] = self.upload_batch(pending, upsert=True) if pending else 0
+
+        # 팩트 행은 메트릭 행을 참조하므로 메트릭 다음에 올림
+        # 미완료 행이 있는 메트릭은 팩트 행 전체를 다시 upsert하고 예전 행 삭제도 다시 시도
+        for table, rows in (fact_tables or {}).items():
+            pending_ids = sorted({row['data_id'] for row in self.ledger.pending(table, rows, records)})
+            result[table] = 0
+            if pending_ids:
+                pending_set = set(pending_ids)
+                uploaded = self.upload_fact_tables({table: [row for row in rows if row['data_id'] in pending_set]},
+                                                   pending_ids)[table]
+                result[table] = uploaded['uploaded']
+            logger.info(f"{table}: 미완료 메트릭 {len(pending_ids)}개의 행 {result[table]}개 업로드")
+        return result
+
+    def copy_load(self, metrics: List[Dict], fact_tables: Optional[Dict[str, List[Dict]]] = None,
+                  delete_missing: bool = True, database_url: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """PostgREST 대신 DATABASE_URL로 직접 연결해 메트릭과 팩트 테이블을 COPY로 한 번에 적재합니다.
+        모든 테이블이 한 트랜잭션으로 병합되므로 중간에 실패하면 기존 데이터가 그대로 남습니다."""
+        from utils.pg_bulk_loader import PostgresBulkLoader
+
+        # 팩트 행은 메트릭 행을 참조하므로 메트릭 다음에 적재
+        loads = [('iris_metrics', metrics), *(fact_tables or {}).items()]
+        return PostgresBulkLoader(database_url).load_tables(loads, delete_missing=delete_missing)
+
+    def fetch_checksums(self, prefix: str, prefix_length: int) -> Optional[Dict[str, Tuple[int, str]]]:
+        """서버의 구간 체크섬 {구간: (행 수, 체크섬)} (iris_metrics_checksums 함수 호출)"""
+        response = self.session.post(f"{self.api_url}/rpc/iris_metrics_checksums", headers=self.headers,
+                                     json={'bucket_prefix': prefix, 'prefix_length': prefix_length})
+        if response.status_code != 200:
+            logger.warning(f"구간 체크섬 조회 실패: {response.status_code} - {response.text[:200]}")
+            return None
+        return {row['bucket']: (row['row_count'], row['checksum']) for row in response.json()}
+
+    def fetch_bucket_rows(self, prefix: str) -> Optional[Dict[str, Optional[str]]]:
+        """서버 구간 하나의 {data_id: content_hash} (iris_metrics_bucket_rows 함수 호출)"""
+        response = self.session.post(f"{self.api_url}/rpc/iris_metrics_bucket_rows", headers=self.headers,
+                                     json={'bucket_prefix': prefix})
+        if response.status_code != 200:
+            logger.warning(f"구간 행 조회 실패: {response.status_code} - {response.text[:200]}")
+            return None
+        return {row['data_id']: row['content_hash'] for row in response.json()}
+
+    def verify_checksums(self, metrics: List[Dict], leaf_rows: int = 64) -> Optional[Dict[str, List[str]]]:
+        """서버와 로컬의 구간 체크섬을 비교해 다른 구간만 더 잘게 나눠 내려가며 다른 행을 찾습니다.
+        일치하면 요청 한 번으로 끝나고, 구간 행 수가 leaf_rows 이하가 되면 그 구간의 (data_id, content_hash)만 받아 비교합니다."""
+        local = sorted(
+            (hashlib.md5(metric['data_id'].encode('utf-8')).hexdigest(), metric['data_id'], metric.get('content_hash') or '')
+            for metric in metrics
+        )
+        result = {'missing': [], 'extra': [], 'mismatched': [], 'requests': 0}
+        pending = [('', 1)]
+
+        while pending:
+            prefix, prefix_length = pending.pop()
+            remote = self.fetch_checksums(prefix, prefix_length)
+            result['requests'] += 1
+            if remote is None:
+                return None
+
+            buckets: Dict[str, List[Tuple[str, str]]] = {}
+            for digest, data_id, content_hash in local:
+                if digest.startswith(prefix):
+                    buckets.setdefault(digest[:prefix_length], []).append((data_id, content_hash))
+
+            for bucket in sorted(set(buckets) | set(remote)):
+                rows = buckets.get(bucket, [])
+                remote_count, remote_checksum = remote.get(bucket, (0, None))
+                if remote_count == len(rows) and remote_checksum == bucket_checksum(rows):
+                    continue
+                if max(remote_count, len(rows)) > leaf_rows and prefix_length < 32:
+                    pending.append((bucket, prefix_length + 1))
+                    continue
+
+                remote_rows = self.fetch_bucket_rows(bucket)
+                result['requests'] += 1
+                if remote_rows is None:
+                    return None
+                local_rows = dict(rows)
+                result['missing'].extend(sorted(set(local_rows) - set(remote_rows)))
+                result['extra'].extend(sorted(set(remote_rows) - set(local_rows)))
+                result['mismatched'].extend(sorted(
+                    data_id for data_id in set(local_rows) & set(remote_rows)
+                    if (remote_rows[data_id] or '') != local_rows[data_id]
+                ))
+
+        return result
+
+    def verify_upload(self, expected_count: int, metrics: Optional[List[Dict]] = None,
+                      allow_extra: bool = False) -> bool:
+        """업로드 검증. metrics가 있으면 구간 체크섬으로 빠지거나 내용이 다른 행까지 확인하고,
+        체크섬 함수가 없으면 행 수만 비교합니다. (allow_extra: 서버에만 있는 행 허용)"""
+        try:
+            if metrics is not None:
+                result = self.verify_checksums(metrics)
+                if result is not None:
+                    problems = {key: result[key] for key in ('missing', 'extra', 'mismatched')
+                                if result[key] and not (key == 'extra' and allow_extra)}
+                    logger.info(f"체크섬 검증: 요청 {result['requests']}회, 누락 {len(result['missing'])} / "
+                                f"서버에만 있음 {len(result['extra'])} / 내용 다름 {len(result['mismatched'])}")
+                    for key, data_ids in problems.items():
+                        logger.warning(f"{key}: {', '.join(data_ids[:20])}{' ...' if len(data_ids) > 20 else ''}")
+                    return not problems
+                logger.warning("체크섬 함수를 호출할 수 없어 행 수만 비교합니다. "
+                               "(config/migrations/003_metric_checksums.sql 실행 필요)")
+
+            # 첫 행 하나와 함께 전체 행 수를 content-range로 받음
+            response = self.session.get(
+                f"{self.api_url}/iris_metrics?select=data_id&limit=1",
+                headers={**self.headers, 'Prefer': 'count=exact'}
+            )
+            if 'content-range' in response.headers:
+                actual_count = int(response.headers['content-range'].split('/')[-1])
+                logger.info(f"업로드 검증: {actual_count}/{expected_count}")
+                return actual_count >= expected_count if allow_extra else actual_count == expected_count
+
         except Exception as e:
             logger.error(f"업로드 검증 오류: {e}")
-        
+
         return False
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='변환된 IRIS+ 데이터를 Supabase에 업로드')
+    parser.add_argument('--input', default='data/iris_metrics_supabase_format.json',
+                        help='변환된 데이터 파일 (.json 또는 .jsonl)')
+    parser.add_argument('--full-reload', action='store_true',
+                        help='차이 비교 없이 전체 행을 다시 올림 (기존 데이터 삭제 여부를 물어봄)')
+    parser.add_argument('--keep-missing', action='store_true',
+                        help='변환 결과에 없는 서버 행을 삭제하지 않음')
+    parser.add_argument('--copy', action='store_true',
+                        help='REST API 대신 DATABASE_URL로 직접 연결해 COPY로 전체 적재 (psycopg 필요)')
+    parser.add_argument('--resume', action='store_true',
+                        help='업로드 원장에서 성공 기록이 없는 행만 다시 upsert (중단된 업로드 이어가기)')
+    parser.add_argument('--ledger', default='data_temp/supabase_upload_ledger.jsonl',
+                        help='행별 업로드 결과 원장 (기본값: data_temp/supabase_upload_ledger.jsonl)')
+    parser.add_argument('--dead-letter', default='data_temp/supabase_upload_dead_letter.jsonl',
+                        help='재시도 후에도 실패한 행과 서버 오류 (기본값: data_temp/supabase_upload_dead_letter.jsonl)')
+    args = parser.parse_args()
+
     # 환경변수 로드
     load_env_file()
     
@@ -174,6 +576,26 @@ def main():
         print("📝 env.example 파일을 참고하여 .env 파일을 생성하세요.")
         return
     
+    if args.copy:
+        # 스테이징 테이블에 COPY한 뒤 한 트랜잭션으로 병합하므로 확인 없이 전체를 교체
+        metrics = uploader.load_converted_data(args.input)
+        if not metrics:
+            print("❌ 업로드할 데이터가 없습니다.")
+            return
+        print(f"🚀 {len(metrics)}개 메트릭을 COPY로 적재 시작")
+        try:
+            results = uploader.copy_load(metrics, uploader.load_fact_tables(args.input),
+                                         delete_missing=not args.keep_missing)
+        except (ImportError, ValueError) as e:
+            print(f"❌ 설정 오류: {e}")
+            return
+        except Exception as e:
+            print(f"❌ COPY 적재 실패 (변경 사항은 모두 롤백됨): {e}")
+            return
+        for table, counts in results.items():
+            print(f"✅ {table}: 변경 {counts['updated']} / 추가 {counts['inserted']} / 삭제 {counts['deleted']}")
+        return
+
     # 연결 테스트
     if not uploader.test_connection():
         print("❌ Supabase 연결 실패")
@@ -187,12 +609,53 @@ def main():
     
     # 데이터 로드
     logger.info("변환된 데이터 로드 중...")
-    metrics = uploader.load_converted_data()
+    metrics = uploader.load_converted_data(args.input)
     
     if not metrics:
         print("❌ 업로드할 데이터가 없습니다.")
         return
     
+    fact_tables = uploader.load_fact_tables(args.input)
+
+    # 행별 결과 기록 (--resume이면 이전 기록에 이어서 씀)
+    uploader.ledger = UploadLedger(args.ledger, args.dead_letter)
+    uploader.ledger.open(resume=args.resume)
+    try:
+        upload_with_ledger(uploader, args, metrics, fact_tables)
+    finally:
+        uploader.ledger.close()
+
+    failed = uploader.ledger.counts['failed']
+    if failed:
+        print(f"⚠️ {failed}행 업로드 실패 - 서버 오류와 원본 행: {args.dead_letter}")
+        print("   원인을 해결한 뒤 --resume으로 실패한 행만 다시 올릴 수 있습니다.")
+
+def upload_with_ledger(uploader: SupabaseUploader, args: argparse.Namespace, metrics: List[Dict],
+                       fact_tables: Dict[str, List[Dict]]):
+    """원장을 연 상태에서 선택한 방식(이어가기/동기화/전체 업로드)으로 업로드합니다."""
+    if args.resume:
+        print(f"⏯️ 업로드 원장({args.ledger})에서 미완료 행만 이어서 업로드")
+        result = uploader.resume_upload(metrics, fact_tables)
+        print(f"📊 완료 {result['skipped']} / 미완료 {result['pending']} → upsert {result['upserted']}개")
+        if not uploader.verify_upload(len(metrics), metrics):
+            print("⚠️ 이어가기 후 검증 실패")
+        return
+
+    if not args.full_reload:
+        # 서버 해시와 비교해 새로 생기거나 바뀐 행만 upsert, 사라진 행만 삭제
+        print(f"🔄 {len(metrics)}개 메트릭을 서버와 비교해 동기화 시작")
+        result = uploader.sync_metrics(metrics, fact_tables, delete_missing=not args.keep_missing)
+        if result is None:
+            print("❌ 서버 해시 조회 실패 (content_hash 컬럼이 없다면 config/migrations/002_metric_content_hash.sql 실행)")
+            return
+        print(f"📊 신규 {result['new']} / 변경 {result['changed']} / 유지 {result['unchanged']} / 삭제 {result['removed']}")
+        print(f"✅ upsert {result['upserted']}개, 삭제 {result['deleted']}개")
+        print_fact_result(result['fact_tables'])
+        expected = len(metrics) + (result['removed'] if args.keep_missing else 0)
+        if not uploader.verify_upload(expected, metrics, allow_extra=args.keep_missing):
+            print("⚠️ 동기화 후 검증 실패")
+        return
+
     print(f"🚀 {len(metrics)}개 메트릭을 Supabase에 업로드 시작")
     
     # 기존 데이터 삭제 여부 확인
@@ -200,14 +663,25 @@ def main():
     if clear_existing == 'y':
         uploader.clear_existing_data()
     
-    # 업로드 실행
-    uploaded_count = uploader.upload_batch(metrics)
+    # 업로드 실행 (기존 데이터를 지우지 않았을 수 있으므로 data_id 기준 upsert)
+    uploaded_count = uploader.upload_batch(metrics, upsert=True)
+
+    # 팩트 테이블 업로드 (메트릭 행을 참조하므로 메트릭 다음에 올림)
+    if fact_tables:
+        print_fact_result(uploader.upload_fact_tables(fact_tables, [metric['data_id'] for metric in metrics]))
     
     # 검증
-    if uploader.verify_upload(len(metrics)):
+    if uploader.verify_upload(len(metrics), metrics):
         print(f"✅ 업로드 완료: {uploaded_count}/{len(metrics)}개")
     else:
         print(f"⚠️ 업로드 완료되었지만 검증 실패: {uploaded_count}개 업로드됨")
 
+def print_fact_result(fact_result: Dict[str, Dict[str, int]]):
+    """팩트 테이블 업로드 결과를 출력합니다. (실패가 있으면 경고)"""
+    for table, counts in fact_result.items():
+        print(f"🔗 {table}: {counts['uploaded']}/{counts['uploaded'] + counts['failed']}행")
+        if counts['failed'] or counts['stale_failed']:
+            print(f"⚠️ {table}: {counts['failed']}행 업로드 실패, {counts['stale_failed']}개 메트릭의 예전 행 삭제 실패")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,357 @@
+"""
+스크래퍼 요청 단위 텔레메트리
+DNS/연결/TTFB/전체 지연 시간 히스토그램, 응답 크기, 상태 코드, 재시도 횟수, 페이지 파싱 시간을
+스크래퍼와 호스트별로 집계하고 JSON 요약, Prometheus textfile, 터미널 표로 내보냅니다.
+"""
+import json
+import socket
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# 지연 시간 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 응답 크기 버킷 (바이트)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+LATENCY_PHASES = ('dns', 'connect', 'ttfb', 'total', 'parse')
+
+class Histogram:
+    """고정 버킷 누적 히스토그램"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """버킷 상한으로 분위수를 추정합니다."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts))
+        }
+
+class RequestStats:
+    """스크래퍼 x 호스트 한 쌍의 집계"""
+
+    def __init__(self):
+        self.latency = {phase: Histogram() for phase in LATENCY_PHASES}
+        self.size = Histogram(SIZE_BUCKETS)
+        self.status_codes: Dict[str, int] = {}
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.cached = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'cached': self.cached,
+            'bytes': int(self.size.sum),
+            'status_codes': dict(sorted(self.status_codes.items())),
+            'latency': {phase: hist.to_dict() for phase, hist in self.latency.items() if hist.count},
+            'size': self.size.to_dict()
+        }
+
+class Telemetry:
+    """스크래퍼/호스트별 요청 지표 수집기"""
+
+    def __init__(self):
+        self.stats: Dict[Tuple[str, str], RequestStats] = {}
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        # 같은 스레드에서 방금 맺은 연결의 DNS/연결 시간 (응답 훅에서 요청에 귀속)
+        self.local = threading.local()
+
+    def get(self, scraper: str, host: str) -> RequestStats:
+        key = (scraper, host)
+        if key not in self.stats:
+            self.stats[key] = RequestStats()
+        return self.stats[key]
+
+    def record_connection(self, dns: float, connect: float):
+        """새 연결의 DNS 조회/연결 시간을 현재 스레드에 남깁니다."""
+        self.local.connection = (dns, connect)
+
+    def pop_connection(self) -> Optional[Tuple[float, float]]:
+        connection = getattr(self.local, 'connection', None)
+        self.local.connection = None
+        return connection
+
+    def record_request(self, scraper: str, url: str, status: Optional[int], ttfb: Optional[float] = None,
+                       total: Optional[float] = None, size: int = 0, retries: int = 0, cached: bool = False,
+                       connection: Optional[Tuple[float, float]] = None):
+        """요청 하나의 결과를 기록합니다. (status가 None이면 연결 오류)"""
+        host = urlparse(url).netloc
+        with self.lock:
+            stats = self.get(scraper, host)
+            stats.requests += 1
+            stats.retries += retries
+            status_key = str(status) if status is not None else 'error'
+            stats.status_codes[status_key] = stats.status_codes.get(status_key, 0) + 1
+            if status is None or status >= 400:
+                stats.errors += 1
+            if size:
+                stats.size.observe(size)
+
+            # 캐시/아카이브 응답은 네트워크 지연 분포를 왜곡하므로 횟수만 집계
+            if cached:
+                stats.cached += 1
+                return
+            if connection:
+                stats.latency['dns'].observe(connection[0])
+                stats.latency['connect'].observe(connection[1])
+            if ttfb is not None:
+                stats.latency['ttfb'].observe(ttfb)
+            if total is not None:
+                stats.latency['total'].observe(total)
+
+    def record_parse(self, scraper: str, url: str, seconds: float):
+        """페이지 하나의 파싱 시간을 기록합니다."""
+        with self.lock:
+            self.get(scraper, urlparse(url).netloc).latency['parse'].observe(seconds)
+
+    def summary(self) -> Dict:
+        """스크래퍼/호스트별 집계를 딕셔너리로 반환합니다."""
+        with self.lock:
+            return {
+                'started_at': self.started_at,
+                'duration': round(time.time() - self.started_at, 3),
+                'series': [
+                    {'scraper': scraper, 'host': host, **stats.to_dict()}
+                    for (scraper, host), stats in sorted(self.stats.items())
+                ]
+            }
+
+    def write_summary(self, filename: str = "data_temp/telemetry_summary.json") -> str:
+        """JSON 실행 요약을 저장합니다."""
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        return filename
+
+    def write_prometheus(self, filename: str = "data_temp/scraper_telemetry.prom") -> str:
+        """node_exporter textfile collector 형식으로 저장합니다. (임시 파일 후 이름 변경)"""
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, series: List[Tuple[Dict[str, str], Histogram]]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                cumulative = 0
+                for bound, count in zip(list(hist.buckets) + ['+Inf'], hist.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{format_labels({**labels, "le": str(bound)})}}} {cumulative}')
+                lines.append(f"{name}_sum{{{format_labels(labels)}}} {hist.sum:.6f}")
+                lines.append(f"{name}_count{{{format_labels(labels)}}} {hist.count}")
+
+        def counter(name: str, help_text: str, series: List[Tuple[Dict[str, str], int]]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in series:
+                lines.append(f"{name}{{{format_labels(labels)}}} {value}")
+
+        with self.lock:
+            items = sorted(self.stats.items())
+            histogram('scraper_request_duration_seconds', 'Request latency by phase',
+                      [({'scraper': s, 'host': h, 'phase': phase}, stats.latency[phase])
+                       for (s, h), stats in items for phase in LATENCY_PHASES if stats.latency[phase].count])
+            histogram('scraper_response_size_bytes', 'Response body size',
+                      [({'scraper': s, 'host': h}, stats.size) for (s, h), stats in items])
+            counter('scraper_responses_total', 'Responses by status code',
+                    [({'scraper': s, 'host': h, 'status': code}, count)
+                     for (s, h), stats in items for code, count in sorted(stats.status_codes.items())])
+            counter('scraper_retries_total', 'Retries performed by the HTTP client',
+                    [({'scraper': s, 'host': h}, stats.retries) for (s, h), stats in items])
+            counter('scraper_cached_responses_total', 'Responses served from cache or archive',
+                    [({'scraper': s, 'host': h}, stats.cached) for (s, h), stats in items])
+
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        Path(temp_filename).replace(filename)
+        return filename
+
+    def format_table(self) -> str:
+        """실행 요약 표를 만듭니다."""
+        header = (f"{'스크래퍼':<12}{'호스트':<26}{'요청':>6}{'오류':>6}{'재시도':>6}{'캐시':>6}"
+                  f"{'KB':>9}{'DNS p50':>9}{'연결 p50':>9}{'TTFB p50':>10}{'TTFB p95':>10}{'파싱 p50':>9}")
+        rows = [header]
+        with self.lock:
+            for (scraper, host), stats in sorted(self.stats.items()):
+                latency = stats.latency
+                rows.append(
+                    f"{scraper[:11]:<12}{host[:25]:<26}{stats.requests:>6}{stats.errors:>6}{stats.retries:>6}"
+                    f"{stats.cached:>6}{stats.size.sum / 1024:>9.1f}"
+                    f"{format_ms(latency['dns']):>9}{format_ms(latency['connect']):>9}"
+                    f"{format_ms(latency['ttfb']):>10}{format_ms(latency['ttfb'], 0.95):>10}"
+                    f"{format_ms(latency['parse']):>9}"
+                )
+        return '\n'.join(rows)
+
+    def export(self, summary_file: str = "data_temp/telemetry_summary.json",
+               prometheus_file: str = "data_temp/scraper_telemetry.prom"):
+        """JSON 요약과 Prometheus textfile을 저장하고 표를 출력합니다."""
+        if not self.stats:
+            return
+        print("\n📈 요청 텔레메트리:")
+        print(self.format_table())
+        print(f"📁 {self.write_summary(summary_file)}, {self.write_prometheus(prometheus_file)}")
+
+def format_labels(labels: Dict[str, str]) -> str:
+    return ','.join(f'{k}="{str(v)}"' for k, v in labels.items())
+
+def format_ms(hist: Histogram, q: float = 0.5) -> str:
+    """히스토그램 분위수를 ms 문자열로 표시합니다. (버킷 상한 기준)"""
+    if not hist.count:
+        return '-'
+    value = hist.quantile(q)
+    return '>30s' if value == float('inf') else f"{value * 1000:.0f}ms"
+
+# 모든 스크래퍼가 공유하는 기본 수집기
+telemetry = Telemetry()
+
+class TimedConnectionMixin:
+    """DNS 조회와 TCP 연결 시간을 따로 재는 urllib3 연결"""
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            # 조회 오류 처리는 urllib3에 맡김
+            return super()._new_conn()
+        dns = time.perf_counter() - started
+
+        dns_host = self._dns_host
+        last_error = None
+        try:
+            for *_, sockaddr in addresses:
+                # 조회한 주소로 바로 연결해 DNS를 다시 조회하지 않음 (TLS SNI/검증은 원래 호스트명 사용)
+                self._dns_host = sockaddr[0]
+                connect_started = time.perf_counter()
+                try:
+                    sock = super()._new_conn()
+                except Exception as e:
+                    last_error = e
+                    continue
+                telemetry.record_connection(dns, time.perf_counter() - connect_started)
+                return sock
+        finally:
+            self._dns_host = dns_host
+        raise last_error
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+TIMED_POOL_CLASSES = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+
+def is_local_response(response) -> bool:
+    """네트워크 요청 없이 캐시나 아카이브에서 바로 만든 응답인지 확인합니다.
+    (304 재검증 응답은 서버를 다녀왔으므로 네트워크 요청으로 집계)"""
+    return response.headers.get('X-Cache') == 'HIT' or response.headers.get('X-Archive') == 'REPLAY'
+
+def install_telemetry(session, scraper: str):
+    """세션의 모든 응답을 scraper 이름으로 기록하는 응답 훅을 장착합니다."""
+
+    def record_response(response, *args, **kwargs):
+        # 훅은 본문을 읽기 전에 호출되므로 여기서 본문 읽는 시간까지 포함해 전체 시간을 잼
+        started = time.perf_counter()
+        size = len(response.content or b'')
+        ttfb = response.elapsed.total_seconds()
+        retries = response.raw.retries.history if getattr(response.raw, 'retries', None) else ()
+        telemetry.record_request(
+            scraper, response.url, response.status_code, ttfb=ttfb,
+            total=ttfb + time.perf_counter() - started, size=size, retries=len(retries),
+            cached=is_local_response(response),
+            connection=telemetry.pop_connection()
+        )
+
+    session.hooks['response'].append(record_response)
+
+def aiohttp_trace_config(scraper: str):
+    """aiohttp 요청의 DNS/연결/TTFB/전체 시간을 기록하는 TraceConfig를 만듭니다."""
+    import aiohttp
+
+    async def on_request_start(session, context, params):
+        context.started = time.perf_counter()
+        context.dns = None
+        context.connect = None
+
+    async def on_dns_start(session, context, params):
+        context.dns_started = time.perf_counter()
+
+    async def on_dns_end(session, context, params):
+        context.dns = time.perf_counter() - context.dns_started
+
+    async def on_connection_start(session, context, params):
+        context.connect_started = time.perf_counter()
+
+    async def on_connection_end(session, context, params):
+        context.connect = time.perf_counter() - context.connect_started - (context.dns or 0.0)
+
+    async def on_request_end(session, context, params):
+        context.ttfb = time.perf_counter() - context.started
+        context.status = params.response.status
+        context.url = str(params.url)
+        params.response.trace_context = context
+
+    async def on_request_exception(session, context, params):
+        telemetry.record_request(scraper, str(params.url), None)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_dns_resolvehost_start.append(on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_end)
+    trace_config.on_connection_create_start.append(on_connection_start)
+    trace_config.on_connection_create_end.append(on_connection_end)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+def record_aiohttp_response(scraper: str, response, size: int):
+    """본문까지 읽은 aiohttp 응답을 기록합니다."""
+    context = getattr(response, 'trace_context', None)
+    if context is None:
+        return
+    connection = (context.dns or 0.0, context.connect) if context.connect is not None else None
+    telemetry.record_request(scraper, context.url, context.status, ttfb=context.ttfb,
+                             total=time.perf_counter() - context.started, size=size, connection=connection)
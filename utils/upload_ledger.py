@@ -0,0 +1,155 @@
+"""
+Supabase 업로드 결과를 행 단위로 기록하는 추가 전용(JSONL) 원장과 실패 행 보관(dead-letter) 파일
+배치가 끝날 때마다 행마다 (테이블, 키, content_hash, 결과)를 한 줄씩 남기고,
+재시도 후에도 실패한 행은 서버 오류와 함께 dead-letter 파일에 원본 그대로 보관합니다.
+--resume 실행은 원장에서 같은 내용으로 성공한 행을 빼고 나머지만 다시 올립니다.
+동기화 때 서버와 내용이 같아 건너뛴 행도 성공으로 기록하므로 동기화 뒤의 --resume은 올릴 행이 없습니다.
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.convert_to_supabase import row_content_hash
+from utils.pg_bulk_loader import TABLE_KEYS
+from utils.scrape_journal import ends_with_partial_line
+
+logger = logging.getLogger(__name__)
+
+def ledger_key(table: str, row: Dict) -> str:
+    """원장에서 행을 구분하는 키 (테이블 병합 키 값을 |로 연결)"""
+    return '|'.join(str(row.get(column, '')) for column in TABLE_KEYS.get(table, ('data_id',)))
+
+def ledger_hash(row: Dict) -> str:
+    """행 내용 해시 (변환 결과의 content_hash가 있으면 그대로 사용)"""
+    return row.get('content_hash') or row_content_hash(row)
+
+class UploadLedger:
+    """업로드한 행의 결과를 기록하는 원장 (여러 배치 스레드에서 동시에 기록 가능)"""
+
+    def __init__(self, filename: str = "data_temp/supabase_upload_ledger.jsonl",
+                 dead_letter_filename: str = "data_temp/supabase_upload_dead_letter.jsonl"):
+        self.path = Path(filename)
+        self.dead_letter_path = Path(dead_letter_filename)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.RLock()
+        self.file = None
+        self.dead_letter_file = None
+        self.counts = {'ok': 0, 'failed': 0}
+
+    def load(self) -> Dict[Tuple[str, str], Dict]:
+        """원장을 재생해 (테이블, 키)별 마지막 결과를 반환합니다."""
+        records = {}
+        if not self.path.exists():
+            return records
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 비정상 종료로 잘린 마지막 줄은 무시
+                    logger.warning(f"원장 {line_num}번째 줄을 읽을 수 없어 건너뜁니다.")
+                    continue
+                records[(record['table'], record['key'])] = record
+
+        return records
+
+    def pending(self, table: str, rows: List[Dict], records: Optional[Dict[Tuple[str, str], Dict]] = None) -> List[Dict]:
+        """같은 내용으로 성공 기록이 없는 행만 반환합니다. (내용이 바뀐 행은 다시 올림)"""
+        records = self.load() if records is None else records
+        result = []
+        for row in rows:
+            record = records.get((table, ledger_key(table, row)))
+            if not record or record['status'] != 'ok' or record.get('content_hash') != ledger_hash(row):
+                result.append(row)
+        return result
+
+    def open(self, resume: bool = False):
+        """원장과 dead-letter 파일을 엽니다. 원장은 항상 이어서 쓰고, resume이 아니면 dead-letter 파일만 비웁니다.
+        (이전 실행의 성공 기록을 지우면 다음 --resume이 이미 올라간 행까지 다시 올리게 됨)"""
+        self.close()
+        torn = ends_with_partial_line(self.path)
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if torn:
+            # 비정상 종료로 잘린 마지막 줄 뒤에 이어 쓰면 다음 기록까지 읽을 수 없게 되므로 줄을 끝냄
+            self.file.write('\n')
+        self.dead_letter_file = open(self.dead_letter_path, 'a' if resume else 'w', encoding='utf-8')
+
+    def record(self, table: str, rows: List[Dict], status: Optional[int], batch: str,
+               error: Optional[str] = None):
+        """배치 결과를 행마다 기록합니다. 실패한 행은 오류와 함께 dead-letter 파일에도 남깁니다."""
+        ok = status in (200, 201)
+        now = datetime.now().isoformat()
+        with self.lock:
+            if self.file is None:
+                self.open(resume=True)
+            for row in rows:
+                entry = {
+                    'table': table,
+                    'key': ledger_key(table, row),
+                    'content_hash': ledger_hash(row),
+                    'status': 'ok' if ok else 'failed',
+                    'http_status': status,
+                    'batch': batch,
+                    'recorded_at': now
+                }
+                self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                if not ok:
+                    self.dead_letter_file.write(json.dumps(
+                        {**entry, 'error': error, 'row': row}, ensure_ascii=False) + '\n')
+            self.file.flush()
+            self.dead_letter_file.flush()
+            self.counts['ok' if ok else 'failed'] += len(rows)
+
+    def acknowledge(self, table: str, rows: List[Dict], records: Optional[Dict[Tuple[str, str], Dict]] = None) -> int:
+        """서버에 같은 내용이 이미 있어 올리지 않은 행을 성공으로 기록합니다.
+        원장에 같은 내용의 성공 기록이 있는 행은 다시 쓰지 않습니다. 새로 기록한 행 수를 반환합니다."""
+        rows = self.pending(table, rows, records)
+        now = datetime.now().isoformat()
+        with self.lock:
+            if self.file is None:
+                self.open(resume=True)
+            for row in rows:
+                entry = {
+                    'table': table,
+                    'key': ledger_key(table, row),
+                    'content_hash': ledger_hash(row),
+                    'status': 'ok',
+                    'http_status': None,
+                    'batch': 'unchanged',
+                    'recorded_at': now
+                }
+                self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.file.flush()
+        return len(rows)
+
+    def sync(self):
+        """버퍼를 비우고 디스크에 확실히 기록합니다."""
+        with self.lock:
+            for f in (self.file, self.dead_letter_file):
+                if f is not None:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def close(self):
+        """원장을 닫습니다."""
+        self.sync()
+        for f in (self.file, self.dead_letter_file):
+            if f is not None:
+                f.close()
+        self.file = None
+        self.dead_letter_file = None
+
+    def __enter__(self) -> 'UploadLedger':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,179 @@
+"""
+SQLite 기반 상세 페이지 수집 작업 큐
+코디네이터가 목록 수집 결과를 작업 테이블에 넣으면, 여러 워커 프로세스가 임대(lease)를 잡아 처리하고 결과를 기록합니다.
+임대 시간이 지난 작업은 자동으로 다시 대기 상태가 되어 워커가 죽어도 끝난 작업은 잃지 않습니다.
+"""
+import json
+import os
+import socket
+import sqlite3
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from utils.scrape_journal import metric_key
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    idx INTEGER PRIMARY KEY,
+    job_key TEXT NOT NULL UNIQUE,
+    metric TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, idx);
+CREATE TABLE IF NOT EXISTS queue_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def default_worker_id() -> str:
+    """호스트 이름과 PID로 워커 ID를 만듭니다."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class WorkQueue:
+    """임대와 시도 횟수를 관리하는 SQLite 작업 큐"""
+
+    def __init__(self, filename: str = "data_temp/scrape_queue.db", lease_seconds: float = 300,
+                 max_attempts: int = 3):
+        self.path = Path(filename)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        # 트랜잭션은 직접 관리 (BEGIN IMMEDIATE로 작업 할당을 직렬화)
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def transaction(self):
+        """쓰기 잠금을 먼저 잡는 트랜잭션을 시작합니다."""
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def enqueue(self, base_data: Dict, reset: bool = False) -> int:
+        """목록 수집 결과를 작업으로 등록합니다. (이미 등록된 메트릭은 reset이 아니면 그대로 유지)"""
+        metadata = {k: v for k, v in base_data.items() if k != 'metrics'}
+        now = time.time()
+
+        self.transaction()
+        try:
+            if reset:
+                self.conn.execute("DELETE FROM jobs")
+            self.conn.execute("INSERT OR REPLACE INTO queue_meta (key, value) VALUES ('metadata', ?)",
+                              (json.dumps(metadata, ensure_ascii=False),))
+
+            added = 0
+            for i, metric in enumerate(base_data['metrics']):
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO jobs (idx, job_key, metric, updated_at) VALUES (?, ?, ?, ?)",
+                    (i, metric_key(metric), json.dumps(metric, ensure_ascii=False), now)
+                )
+                added += cursor.rowcount
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        logger.info(f"작업 큐에 {added}개 메트릭 등록 (전체 {len(base_data['metrics'])}개)")
+        return added
+
+    def requeue_expired(self) -> int:
+        """임대 시간이 지난 작업을 대기 상태로 되돌립니다. 시도 횟수를 다 쓴 작업은 실패로 둡니다. (트랜잭션 안에서 호출)"""
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires < ?",
+            (self.max_attempts, time.time(), time.time())
+        )
+        if cursor.rowcount:
+            logger.warning(f"임대가 만료된 작업 {cursor.rowcount}개를 다시 대기열에 넣었습니다.")
+        return cursor.rowcount
+
+    def claim(self, worker_id: str, limit: int = 10) -> List[Tuple[int, Dict]]:
+        """대기 중인 작업을 최대 limit개 임대합니다."""
+        now = time.time()
+        self.transaction()
+        try:
+            self.requeue_expired()
+            rows = self.conn.execute(
+                "SELECT idx, metric FROM jobs WHERE status = 'pending' AND attempts < ? ORDER BY idx LIMIT ?",
+                (self.max_attempts, limit)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE idx = ?",
+                [(worker_id, now + self.lease_seconds, now, idx) for idx, _ in rows]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        return [(idx, json.loads(metric)) for idx, metric in rows]
+
+    def complete(self, idx: int, result: Dict, worker_id: str) -> bool:
+        """작업 결과를 기록합니다. 실패했고 시도 횟수가 남았으면 다시 대기 상태로 둡니다.
+        임대가 만료되어 다른 워커에게 넘어간 작업이면 기록하지 않고 False를 반환합니다."""
+        success = result.get('details', {}).get('success', False)
+        self.transaction()
+        try:
+            row = self.conn.execute("SELECT status, attempts, lease_owner FROM jobs WHERE idx = ?", (idx,)).fetchone()
+            # 임대가 만료된 뒤 다른 워커가 이미 끝냈거나 다시 임대한 작업은 덮어쓰지 않음
+            if row is None or row[0] == 'done' or (row[0] == 'leased' and row[2] != worker_id):
+                self.conn.execute("COMMIT")
+                if row is not None and row[0] == 'leased':
+                    logger.warning(f"작업 {idx}의 임대가 다른 워커({row[2]})에게 넘어가 {worker_id}의 결과를 버립니다.")
+                return False
+
+            if success:
+                status = 'done'
+            else:
+                status = 'failed' if row[1] >= self.max_attempts else 'pending'
+            # 확인과 갱신 사이에 임대가 바뀌지 않았는지 갱신 조건으로도 확인
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE idx = ? AND (status != 'leased' OR lease_owner = ?)",
+                (status, json.dumps(result, ensure_ascii=False), time.time(), idx, worker_id)
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount == 1
+
+    def stats(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        for status, count in self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def has_open_jobs(self) -> bool:
+        """아직 처리될 수 있는 작업(대기 또는 임대 중)이 남았는지 확인합니다."""
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'leased' OR (status = 'pending' AND attempts < ?)",
+            (self.max_attempts,)
+        ).fetchone()
+        return row[0] > 0
+
+    def merge(self) -> Dict:
+        """작업 결과를 원래 순서대로 모아 최종 데이터로 만듭니다. (결과가 없는 메트릭은 원본 그대로)"""
+        row = self.conn.execute("SELECT value FROM queue_meta WHERE key = 'metadata'").fetchone()
+        merged = json.loads(row[0]) if row else {}
+        merged['metrics'] = [
+            json.loads(result or metric)
+            for metric, result in self.conn.execute("SELECT metric, result FROM jobs ORDER BY idx")
+        ]
+        return merged
+
+    def close(self):
+        """큐 연결을 닫습니다."""
+        self.conn.close()